@@ -1,25 +1,70 @@
-from translator_by_speech.cli import parse_args, TranslationCLI
+import os
+import sys
+
+from translator_by_speech.client import run_client
 
 
 def main() -> None:
     """Main entry point for the application."""
+    # File runs go to a running model server without loading the models here
+    if run_client(sys.argv[1:]):
+        return
+
+    # Import here to avoid loading the models' dependencies for runs the server handles
+    from translator_by_speech.cli import (
+        parse_args,
+        model_settings_from_args,
+        TranslationCLI,
+    )
+
     args = parse_args()
-    cli = TranslationCLI()
+    settings = model_settings_from_args(args)
+
+    if args.serve:
+        from translator_by_speech.server import ModelServer
+
+        server = ModelServer(socket_path=args.socket, **settings)
+        server.preload(args.source, args.target)
+        server.serve_forever()
+        return
+
+    cli = TranslationCLI(
+        **settings,
+        results_db=args.results_db,
+        write_txt=args.txt,
+        socket_path=args.socket,
+        use_daemon=not args.no_daemon,
+        early_asr=args.early_asr,
+    )
 
     # Set languages if specified
     cli.set_languages(args.source, args.target)
 
     # Handle non-interactive commands
-    if args.record is not None:
+    if args.export_txt:
+        count = cli.store.export_txt(args.export_txt)
+        print(f"Exported {count} results to: {args.export_txt}")
+    elif args.autotune:
+        cli.autotune(args.runtime_config, try_compile=args.compile)
+    elif args.record is not None:
         file_path = cli.record_audio(duration=args.record)
         if args.process is None:  # Process the recording if no file is specified
             cli.process_audio_file(file_path)
+    elif args.process and args.subtitles:
+        for file_path in cli.collect_audio_files(args.process):
+            cli.export_subtitles(file_path, args.subtitles)
     elif args.process:
-        cli.process_audio_file(args.process)
+        if len(args.process) > 1 or os.path.isdir(args.process[0]):
+            cli.process_audio_files(args.process)
+        else:
+            cli.process_audio_file(args.process[0])
     elif args.interactive or (not args.record and not args.process):
         # Interactive mode is default if no other actions specified
         cli.run()
 
+    # Wait for output files written in the background
+    cli.close()
+
 
 if __name__ == "__main__":
     main()
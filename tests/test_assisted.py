@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+from transformers import MBartConfig, MBartForConditionalGeneration
+
+from translator_by_speech.assisted import AssistedDecoding, format_assisted_stats
+from translator_by_speech.decoding import DecodingPolicy
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.translator import TranslationModel
+
+
+def make_mbart(layers):
+    config = MBartConfig(
+        vocab_size=64,
+        d_model=16,
+        encoder_layers=layers,
+        decoder_layers=layers,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=16,
+        decoder_ffn_dim=16,
+        max_position_embeddings=64,
+        pad_token_id=1,
+        bos_token_id=0,
+        eos_token_id=2,
+        decoder_start_token_id=2,
+    )
+    return MBartForConditionalGeneration(config).eval()
+
+
+@pytest.fixture(scope="module")
+def models():
+    """Tiny main model and a one-layer draft sharing its first layers."""
+    torch.manual_seed(0)
+    main = make_mbart(2)
+    draft = make_mbart(1)
+    draft.load_state_dict(main.state_dict(), strict=False)
+    return main, draft
+
+
+GENERATE_KWARGS = {"max_new_tokens": 16, "min_new_tokens": 16, "num_beams": 1}
+
+
+def test_output_is_identical_to_the_main_model(models):
+    main, draft = models
+    input_ids = torch.randint(3, 64, (1, 7))
+    assisted = AssistedDecoding(draft)
+
+    with torch.no_grad():
+        expected = main.generate(input_ids=input_ids, **GENERATE_KWARGS)
+        outputs = assisted.generate(main, input_ids=input_ids, **GENERATE_KWARGS)
+
+    assert torch.equal(outputs, expected)
+
+    # Every main-model pass yields its own token plus the accepted drafts
+    stats = assisted.stats
+    new_tokens = outputs.shape[1] - 1
+    assert stats["calls"] == 1
+    assert 0 < stats["verify_passes"] < new_tokens
+    assert stats["accepted_tokens"] + stats["verify_passes"] >= new_tokens - 1
+    assert 0.0 < assisted.acceptance_rate <= 1.0
+    assert assisted.tokens_per_pass > 1.0
+    assert assisted.speedup is None
+
+
+def test_compare_every_measures_speedup(models):
+    main, draft = models
+    assisted = AssistedDecoding(draft, compare_every=2)
+
+    with torch.no_grad():
+        for _ in range(4):
+            input_ids = torch.randint(3, 64, (1, 7))
+            assisted.generate(main, input_ids=input_ids, **GENERATE_KWARGS)
+
+    assert assisted.stats["compared"] == 2
+    assert assisted.stats["mismatches"] == 0
+    assert assisted.speedup > 0
+    assert "speedup" in format_assisted_stats(assisted)
+
+
+def test_negative_compare_every():
+    with pytest.raises(ValueError):
+        AssistedDecoding(MagicMock(), compare_every=-1)
+
+
+def make_translator(models):
+    main, draft = models
+    model = TranslationModel.__new__(TranslationModel)
+    model.device = torch.device("cpu")
+    model.tgt_lang = "en_XX"
+    model.decoding = DecodingPolicy("fast")
+    model.latency_budget = None
+    model.glossary = None
+    model.runtime = RuntimeConfig()
+    model.model = main
+    model.assisted = AssistedDecoding(draft)
+    model.tokenizer = MagicMock()
+    model.tokenizer.lang_code_to_id = {"en_XX": 2}
+    model.tokenizer.batch_decode.side_effect = lambda outputs, **kwargs: [
+        output.tolist() for output in outputs
+    ]
+    return model
+
+
+def test_translator_uses_the_draft_for_single_greedy_texts(models):
+    model = make_translator(models)
+    model.tokenizer.return_value.to.return_value = {
+        "input_ids": torch.randint(3, 64, (1, 6))
+    }
+
+    model.translate("xin chào")
+    assert model.assisted.stats["calls"] == 1
+
+    model.tokenizer.return_value.to.return_value = {
+        "input_ids": torch.randint(3, 64, (2, 6))
+    }
+    model.translate(["xin chào", "tạm biệt"])
+    assert model.assisted.stats["calls"] == 1
+
+    # Beam search runs without the draft model
+    model.tokenizer.return_value.to.return_value = {
+        "input_ids": torch.randint(3, 64, (1, 6))
+    }
+    model.translate("xin chào", num_beams=2)
+    assert model.assisted.stats["calls"] == 1
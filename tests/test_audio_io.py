@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from translator_by_speech.audio_io import iter_audio_blocks, prefetch
+
+
+@pytest.fixture
+def stereo_file(tmp_path):
+    rate = 8000
+    t = np.arange(rate * 5) / rate
+    left = 0.5 * np.sin(2 * np.pi * 220 * t)
+    stereo = np.stack([left, -left / 2], axis=1)
+    path = tmp_path / "stereo.wav"
+    sf.write(path, stereo, rate)
+    return str(path), (left - left / 2) / 2
+
+
+def test_iter_audio_blocks_downmixes(stereo_file):
+    path, mono = stereo_file
+
+    blocks = list(iter_audio_blocks(path, block_seconds=1.0))
+
+    assert len(blocks) == 5
+    assert all(block.dtype == np.float32 for block in blocks)
+    np.testing.assert_allclose(np.concatenate(blocks), mono, atol=1e-4)
+
+
+def test_iter_audio_blocks_resamples(stereo_file):
+    path, mono = stereo_file
+
+    audio = np.concatenate(list(iter_audio_blocks(path, 16000, block_seconds=0.7)))
+
+    assert abs(len(audio) - 2 * len(mono)) <= 2
+    # Away from the edges the stream resampler matches the original signal
+    np.testing.assert_allclose(audio[1000:-1000:2], mono[500:-500], atol=2e-2)
+
+
+def test_prefetch_preserves_order_and_errors():
+    assert list(prefetch(range(10), depth=2)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise RuntimeError("decode failed")
+
+    items = prefetch(failing())
+    assert next(items) == 1
+    with pytest.raises(RuntimeError, match="decode failed"):
+        next(items)
+
+
+def test_prefetch_stops_producer_when_consumer_stops():
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = prefetch(source(), depth=1)
+    assert next(items) == 0
+    items.close()
+
+    assert len(produced) < 100
@@ -0,0 +1,138 @@
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from translator_by_speech.record import PA_INPUT_OVERFLOWED, AudioRecorder
+
+
+class FakeStream:
+    """PyAudio input stream stand-in that plays back scripted chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def read(self, num_frames, exception_on_overflow=True):
+        return self.chunks.pop(0).tobytes()
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class OverflowingStream(FakeStream):
+    """Stream whose input buffer overflows when reads fall behind, like PortAudio."""
+
+    def __init__(self, chunks, buffer_seconds=0.05):
+        super().__init__(chunks)
+        self.buffer_seconds = buffer_seconds
+        self.last_read = time.monotonic()
+
+    def read(self, num_frames, exception_on_overflow=True):
+        overflowed = time.monotonic() - self.last_read > self.buffer_seconds
+        self.last_read = time.monotonic()
+        if overflowed and exception_on_overflow:
+            raise OSError(PA_INPUT_OVERFLOWED, "Input overflowed")
+        return super().read(num_frames)
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    with patch("translator_by_speech.record.pyaudio.PyAudio"):
+        recorder = AudioRecorder(output_directory=str(tmp_path))
+    recorder.rate = 1000
+    recorder.chunk = 100
+    return recorder
+
+
+def make_chunk(value):
+    return np.full(100, value, dtype=np.int16)
+
+
+def test_listen_yields_utterances_with_pre_roll(recorder):
+    chunks = (
+        [make_chunk(i) for i in range(1, 6)]  # silence
+        + [make_chunk(5000)] * 3  # speech
+        + [make_chunk(0)] * 2  # silence ends the utterance
+        + [make_chunk(7000)]
+        + [make_chunk(0)] * 2
+    )
+    stream = FakeStream(chunks)
+    recorder.audio.open.return_value = stream
+
+    utterances = recorder.listen(
+        silence_threshold=1000, silence_duration=0.2, pre_roll=0.2
+    )
+    first = np.array(next(utterances))
+    second = np.array(next(utterances))
+    utterances.close()
+
+    # Two chunks of pre-roll, three of speech and two of trailing silence
+    np.testing.assert_array_equal(first[:100], make_chunk(4))
+    assert len(first) == 700
+    assert (first[200:500] == 5000).all()
+
+    # The pre-roll never reaches back into the previous utterance
+    assert len(second) == 300
+    assert stream.closed
+
+
+def test_listen_survives_overflow_while_the_consumer_is_busy(recorder):
+    chunks = ([make_chunk(5000)] * 2 + [make_chunk(0)] * 2) * 2
+    recorder.audio.open.return_value = OverflowingStream(chunks)
+
+    utterances = recorder.listen(silence_threshold=1000, silence_duration=0.2)
+    next(utterances)
+    time.sleep(0.1)  # transcribing and translating the utterance
+    second = next(utterances)
+    utterances.close()
+
+    # Two chunks of speech and two of trailing silence
+    assert len(second) == 400
+    assert recorder.overflows == 1
+
+
+def test_listen_respects_max_duration(recorder):
+    recorder.audio.open.return_value = FakeStream([make_chunk(5000)] * 10)
+
+    utterances = recorder.listen(silence_threshold=1000, max_duration=0.3)
+    utterance = next(utterances)
+    utterances.close()
+
+    assert len(utterance) == 300
+
+
+def test_save_samples(recorder, tmp_path):
+    recorder.audio.get_sample_size.return_value = 2
+
+    path = recorder.save_samples(make_chunk(3), filename="utterance.wav")
+
+    assert path == str(tmp_path / "utterance.wav")
+    assert (tmp_path / "utterance.wav").stat().st_size > 200
+
+
+def test_record_until_silence_reports_pauses_and_resumed_speech(recorder):
+    chunks = (
+        [make_chunk(0)] * 3  # silence before speaking is not a pause
+        + [make_chunk(5000)] * 2
+        + [make_chunk(0)] * 2  # pause
+        + [make_chunk(6000)]  # speech resumes
+        + [make_chunk(0)] * 5  # pause, then the silence ends the recording
+    )
+    recorder.audio.open.return_value = FakeStream(chunks)
+    recorder.audio.get_sample_size.return_value = 2
+    events = []
+
+    recorder.record_until_silence(
+        silence_threshold=1000,
+        silence_duration=0.5,
+        pause_duration=0.2,
+        on_pause=lambda samples: events.append(("pause", len(samples))),
+        on_resume=lambda: events.append(("resume",)),
+    )
+
+    assert events == [("pause", 700), ("resume",), ("pause", 1000)]
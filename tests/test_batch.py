@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from translator_by_speech.batch import AudioPrefetcher, OutputWriter, batched
+
+
+def test_prefetcher_yields_files_in_order_with_errors():
+    def load(path):
+        if path == "bad":
+            raise IOError("cannot decode")
+        return path.upper()
+
+    prefetcher = AudioPrefetcher(["a", "bad", "c"], load, workers=2, depth=2)
+    items = list(prefetcher)
+
+    assert [(path, audio) for path, audio, _ in items] == [
+        ("a", "A"),
+        ("bad", None),
+        ("c", "C"),
+    ]
+    assert isinstance(items[1][2], IOError)
+    assert prefetcher.stats["files"] == 3
+    assert prefetcher.stats["errors"] == 1
+
+
+def test_prefetcher_decodes_ahead_of_the_consumer():
+    loaded = []
+
+    def load(path):
+        loaded.append(path)
+        return path
+
+    prefetcher = AudioPrefetcher(range(10), load, workers=1, depth=3)
+    iterator = iter(prefetcher)
+    next(iterator)
+    time.sleep(0.05)
+
+    # The first file was consumed and three more were queued behind it
+    assert sorted(loaded) == [0, 1, 2, 3]
+    iterator.close()
+
+
+def test_prefetcher_records_stall_time():
+    def load(path):
+        time.sleep(0.02)
+        return path
+
+    prefetcher = AudioPrefetcher(range(3), load, workers=1, depth=1)
+    list(prefetcher)
+
+    assert prefetcher.stats["stall_seconds"] > 0.03
+    assert prefetcher.stats["max_queue_depth"] <= 1
+
+
+def test_prefetcher_rejects_invalid_depth():
+    with pytest.raises(ValueError):
+        AudioPrefetcher([], lambda path: path, depth=0)
+
+
+def test_output_writer_writes_in_background(tmp_path):
+    release = threading.Event()
+    writer = OutputWriter()
+    writer.write_text(str(tmp_path / "block.txt"), "x")
+    writer._executor.submit(release.wait)
+    writer.write_text(str(tmp_path / "sub" / "out.txt"), "xin chào")
+
+    # The second write is queued behind the blocked one
+    assert not (tmp_path / "sub" / "out.txt").exists()
+
+    release.set()
+    assert writer.close() == []
+    assert (tmp_path / "sub" / "out.txt").read_text(encoding="utf-8") == "xin chào"
+    assert writer.stats == {"written": 2, "errors": 0}
+
+
+def test_output_writer_reports_errors(tmp_path):
+    (tmp_path / "file").write_text("")
+    writer = OutputWriter()
+    writer.write_text(str(tmp_path / "file" / "out.txt"), "text")
+
+    errors = writer.close()
+
+    assert len(errors) == 1
+    assert writer.stats["errors"] == 1
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from translator_by_speech.capture import PA_INPUT_OVERFLOW, CallbackCapture
+
+
+class FakeStream:
+    def __init__(self, callback):
+        self.callback = callback
+        self.started = False
+        self.closed = False
+
+    def start_stream(self):
+        self.started = True
+
+    def stop_stream(self):
+        self.started = False
+
+    def close(self):
+        self.closed = True
+
+    def emit(self, value, status=0, frames=4):
+        data = np.full(frames, value, dtype=np.int16).tobytes()
+        return self.callback(data, frames, {}, status)
+
+
+class FakeAudio:
+    """Stand-in for pyaudio.PyAudio that hands out FakeStreams."""
+
+    def __init__(self):
+        self.stream = None
+
+    def open(self, **kwargs):
+        assert kwargs["input"] is True
+        self.stream = FakeStream(kwargs["stream_callback"])
+        return self.stream
+
+
+def test_frames_generator_yields_until_stopped():
+    audio = FakeAudio()
+    capture = CallbackCapture(audio, chunk=4)
+
+    with capture:
+        assert audio.stream.started
+        assert audio.stream.emit(1) == (None, 0)
+        audio.stream.emit(2)
+
+    frames = list(capture.frames(timeout=1))
+
+    assert [int(frame[0]) for frame in frames] == [1, 2]
+    assert audio.stream.closed
+    assert not capture.is_active
+
+
+def test_overflow_and_dropped_frames_are_counted():
+    audio = FakeAudio()
+    capture = CallbackCapture(audio, chunk=4, max_queue=2)
+
+    with capture:
+        audio.stream.emit(1, status=PA_INPUT_OVERFLOW)
+        for value in range(2, 6):
+            audio.stream.emit(value)
+
+    frames = list(capture.frames(timeout=1))
+
+    assert capture.overflows == 1
+    # The end marker took the place of the oldest buffer in the full queue,
+    # which counts as dropped too
+    assert capture.dropped == 4
+    assert [int(frame[0]) for frame in frames] == [2]
+
+
+def test_async_iterator_receives_frames_from_audio_thread():
+    audio = FakeAudio()
+    capture = CallbackCapture(audio, chunk=4).start()
+
+    async def consume():
+        received = []
+        async for frame in capture:
+            received.append(int(frame[0]))
+            if len(received) == 1:
+                threading.Thread(target=produce).start()
+        return received
+
+    def produce():
+        for value in (2, 3):
+            audio.stream.emit(value)
+        capture.stop()
+
+    audio.stream.emit(1)  # captured before iteration starts
+    received = asyncio.run(asyncio.wait_for(consume(), timeout=5))
+
+    assert received == [1, 2, 3]
+
+
+def test_no_frame_is_lost_while_the_async_iterator_takes_over():
+    audio = FakeAudio()
+    capture = CallbackCapture(audio, chunk=4, max_queue=4096).start()
+    count = 2000
+
+    def produce():
+        for value in range(count):
+            audio.stream.emit(value)
+        capture.stop()
+
+    async def consume():
+        # Buffers keep arriving while iteration switches to the asyncio queue
+        producer.start()
+        return [int(frame[0]) async for frame in capture]
+
+    producer = threading.Thread(target=produce)
+    received = asyncio.run(asyncio.wait_for(consume(), timeout=10))
+    producer.join()
+
+    assert received == list(range(count))
+    assert capture.dropped == 0
+
+
+def test_stereo_frames_are_reshaped():
+    audio = FakeAudio()
+    capture = CallbackCapture(audio, channels=2, chunk=2).start()
+
+    audio.stream.emit(7, frames=4)
+    capture.stop()
+
+    (frame,) = list(capture.frames(timeout=1))
+    assert frame.shape == (2, 2)
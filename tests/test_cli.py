@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from translator_by_speech.cli import (
+    TranslationCLI,
+    model_settings_from_args,
+    parse_args,
+)
+from translator_by_speech.runtime import RuntimeConfig
+
+
+def test_model_settings_follow_the_selected_direction(monkeypatch):
+    monkeypatch.setattr(
+        "sys.argv",
+        ["main.py", "-s", "en", "-t", "vi", "--glossary", "g.tsv"]
+        + ["--translation-draft", "draft", "--asr-draft", "distil"],
+    )
+
+    settings = model_settings_from_args(parse_args())
+
+    assert settings["glossaries"] == {"en2vi": "g.tsv"}
+    assert settings["draft_models"] == {"asr": "distil", "en2vi": "draft"}
+
+
+@pytest.mark.parametrize("flag", ["--glossary", "--translation-draft"])
+def test_auto_source_rejects_direction_specific_options(monkeypatch, capsys, flag):
+    monkeypatch.setattr("sys.argv", ["main.py", "--source", "auto", flag, "x"])
+
+    with pytest.raises(SystemExit):
+        parse_args()
+    assert "use --source vi or --source en" in capsys.readouterr().err
+
+
+def test_autotune_benchmarks_compiled_models_on_request(monkeypatch, tmp_path):
+    cli = TranslationCLI.__new__(TranslationCLI)
+    cli.source_lang = "vi"
+    cli.runtime = RuntimeConfig()
+    cli._asr_model = MagicMock(runtime=cli.runtime)
+    cli._vi2en_translator = MagicMock(runtime=cli.runtime, src_lang="vi_VN")
+    cli._en2vi_translator = None
+    compiled = []
+    monkeypatch.setattr(
+        RuntimeConfig,
+        "prepare_model",
+        lambda self, model: compiled.append(self.compile),
+    )
+
+    best = cli.autotune(str(tmp_path / "runtime.json"), try_compile=True)
+
+    # Every model is switched to each benchmarked config's compile setting
+    assert True in compiled and False in compiled
+    assert cli._asr_model.runtime is best
+    assert (tmp_path / "runtime.json").exists()
+
+
+def test_close_can_be_called_again():
+    cli = TranslationCLI.__new__(TranslationCLI)
+    cli.early_asr = None
+    cli.writer = MagicMock()
+    cli.writer.close.return_value = []
+    cli.store = MagicMock()
+    cli._closed = False
+
+    # run() closes in its finally and main() closes again on exit
+    cli.close()
+    cli.close()
+
+    cli.writer.close.assert_called_once()
+    cli.store.close.assert_called_once()
@@ -0,0 +1,65 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from translator_by_speech.coalescing import CoalescingTranslator
+
+
+@pytest.fixture
+def mock_translator():
+    translator = MagicMock()
+    translator.src_lang = "vi_VN"
+    translator.translate.side_effect = lambda texts, **kwargs: [
+        f"translated {t}" for t in texts
+    ]
+    return translator
+
+
+def test_translate_single_and_list(mock_translator):
+    with CoalescingTranslator(mock_translator, max_latency=0.001) as coalescer:
+        assert coalescer.translate("xin chào") == "translated xin chào"
+        assert coalescer.translate(["a", "b"]) == ["translated a", "translated b"]
+
+    # Attributes of the wrapped model remain accessible
+    assert coalescer.src_lang == "vi_VN"
+
+
+def test_concurrent_requests_are_batched_and_deduplicated(mock_translator):
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = coalescer.translate(f"text {i % 4}")
+
+    with CoalescingTranslator(
+        mock_translator, max_batch_size=16, max_latency=0.2
+    ) as coalescer:
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert results == {i: f"translated text {i % 4}" for i in range(8)}
+    assert coalescer.stats["requests"] == 8
+    assert coalescer.stats["deduplicated"] + coalescer.stats["texts"] == 8
+    assert coalescer.stats["batches"] < 8
+
+
+def test_errors_propagate_to_futures(mock_translator):
+    mock_translator.translate.side_effect = RuntimeError("generate failed")
+
+    with CoalescingTranslator(mock_translator, max_latency=0.001) as coalescer:
+        future = coalescer.submit("hello")
+        with pytest.raises(RuntimeError, match="generate failed"):
+            future.result(timeout=5)
+
+
+def test_submit_after_close_raises(mock_translator):
+    coalescer = CoalescingTranslator(mock_translator)
+    coalescer.close()
+
+    with pytest.raises(RuntimeError):
+        coalescer.submit("hello")
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+
+from translator_by_speech.decoding import ASR_MAX_NEW_TOKENS, DecodingPolicy
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.translator import TranslationModel
+
+
+def test_asr_budget_scales_with_duration():
+    policy = DecodingPolicy("fast")
+
+    short = policy.asr_max_new_tokens(2.0)
+    long = policy.asr_max_new_tokens(20.0)
+
+    assert short < long <= ASR_MAX_NEW_TOKENS
+    assert policy.asr_max_new_tokens(None) == ASR_MAX_NEW_TOKENS
+    assert policy.asr_max_new_tokens(600.0) == ASR_MAX_NEW_TOKENS
+
+
+@pytest.mark.parametrize("profile", ["fast", "balanced", "quality"])
+def test_asr_budget_fits_dense_speech(profile):
+    policy = DecodingPolicy(profile)
+
+    # A dense 30 s Vietnamese window: ~12 syllables a second, and Whisper
+    # spends about one token per syllable
+    dense_transcript_tokens = 12 * 30
+
+    assert policy.asr_max_new_tokens(30.0) >= dense_transcript_tokens
+    assert policy.asr_max_new_tokens(2.0) >= 12 * 2
+
+
+def test_short_inputs_are_decoded_greedily():
+    policy = DecodingPolicy("balanced")
+
+    assert policy.num_beams(source_tokens=5) == 1
+    assert policy.num_beams(source_tokens=30) == 3
+
+
+def test_profiles_order_beam_widths_and_budgets():
+    fast, quality = DecodingPolicy("fast"), DecodingPolicy("quality")
+
+    assert fast.num_beams(30) < quality.num_beams(30)
+    assert fast.translation_max_new_tokens(30) < quality.translation_max_new_tokens(30)
+
+
+def test_latency_budget_narrows_the_beam():
+    policy = DecodingPolicy("quality", seconds_per_token=0.001)
+    max_new_tokens = policy.translation_max_new_tokens(20)
+
+    # Room for exactly two sequences of the full token budget
+    budget = policy.estimate_seconds(max_new_tokens, 2)
+
+    assert policy.num_beams(20, latency_budget=budget) == 2
+    assert policy.num_beams(20, batch_size=4, latency_budget=budget) == 1
+    assert policy.num_beams(20, latency_budget=None) == 5
+
+
+def test_record_updates_time_per_token():
+    policy = DecodingPolicy("balanced", seconds_per_token=0.01, smoothing=0.5)
+
+    policy.record(generated_tokens=10, num_sequences=2, seconds=0.6)
+
+    assert policy.seconds_per_token == pytest.approx(0.02)
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        DecodingPolicy("turbo")
+
+
+def test_translate_uses_greedy_decoding_for_short_text():
+    model = TranslationModel.__new__(TranslationModel)
+    model.device = torch.device("cpu")
+    model.tgt_lang = "en_XX"
+    model.decoding = DecodingPolicy("balanced")
+    model.latency_budget = None
+    model.glossary = None
+    model.assisted = None
+    model.runtime = RuntimeConfig()
+    model.tokenizer = MagicMock()
+    model.tokenizer.return_value.to.return_value = {
+        "input_ids": torch.ones((1, 4), dtype=torch.long)
+    }
+    model.tokenizer.batch_decode.return_value = ["hello"]
+    model.model = MagicMock()
+    model.model.generate.return_value = torch.ones((1, 3), dtype=torch.long)
+
+    assert model.translate("xin chào") == "hello"
+
+    kwargs = model.model.generate.call_args.kwargs
+    assert kwargs["num_beams"] == 1
+    assert "early_stopping" not in kwargs
+    assert kwargs["max_new_tokens"] == model.decoding.translation_max_new_tokens(4)
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from translator_by_speech.executors import AsyncExecutor
+
+
+def test_run_returns_result():
+    executor = AsyncExecutor(max_workers=2)
+
+    result = asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2))
+
+    assert result == 3
+    executor.shutdown()
+
+
+def test_run_respects_concurrency_limit():
+    executor = AsyncExecutor(max_workers=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(executor.run(work) for _ in range(6)))
+
+    asyncio.run(main())
+
+    assert peak == 2
+    executor.shutdown()
+
+
+def test_run_timeout():
+    executor = AsyncExecutor(max_workers=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(executor.run(time.sleep, 0.5, timeout=0.01))
+
+    executor.shutdown()
+
+
+def test_cancel_drops_queued_call():
+    executor = AsyncExecutor(max_workers=1)
+    calls = []
+
+    async def main():
+        blocker = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        queued = asyncio.ensure_future(executor.run(calls.append, "queued"))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await blocker
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    asyncio.run(main())
+    executor.shutdown()
+
+    assert calls == []
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from transformers import WhisperFeatureExtractor
+
+from translator_by_speech.features import LogMelCache, LogMelExtractor
+
+
+@pytest.fixture
+def feature_extractor():
+    return WhisperFeatureExtractor(feature_size=128)
+
+
+@pytest.fixture
+def stream():
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(16000 * 40) * 0.1).astype(np.float32)
+
+
+def reference(feature_extractor, audio):
+    return feature_extractor(
+        audio, sampling_rate=16000, return_tensors="np"
+    ).input_features[0]
+
+
+@pytest.mark.parametrize("length", [100, 16000, 16000 * 7 + 123, 16000 * 30])
+def test_window_features_match_feature_extractor(feature_extractor, stream, length):
+    cache = LogMelCache(feature_extractor.mel_filters)
+
+    features = cache.window_features(stream[:length])
+
+    np.testing.assert_allclose(
+        features, reference(feature_extractor, stream[:length]), atol=1e-4
+    )
+
+
+def test_sliding_windows_reuse_cached_frames(feature_extractor, stream):
+    cache = LogMelCache(feature_extractor.mel_filters)
+    windows = [(0, 16000 * 5), (0, 16000 * 8), (16000, 16000 * 10), (3200, 16000 * 12)]
+
+    for start, end in windows:
+        features = cache.window_features(stream[start:end], start)
+        np.testing.assert_allclose(
+            features, reference(feature_extractor, stream[start:end]), atol=1e-4
+        )
+
+    # Only new frames and window edges were computed after the first window
+    assert cache.stats["cached_frames"] > 0
+    assert cache.stats["computed_frames"] < sum(
+        (end - start) // 160 for start, end in windows
+    )
+
+
+def test_window_longer_than_chunk_raises(feature_extractor, stream):
+    cache = LogMelCache(feature_extractor.mel_filters)
+
+    with pytest.raises(ValueError):
+        cache.window_features(stream[: 16000 * 31])
+
+
+def test_batched_features_match_feature_extractor(feature_extractor, stream):
+    extractor = LogMelExtractor.from_feature_extractor(feature_extractor)
+    clips = [stream[:length] for length in (0, 100, 16000, 16000 * 7 + 123)]
+    clips.append(np.zeros(8000, dtype=np.float32))
+
+    features = extractor(clips)
+
+    assert features.shape == (5, 128, 3000)
+    for clip, clip_features in zip(clips, features.numpy()):
+        np.testing.assert_allclose(
+            clip_features, reference(feature_extractor, clip), atol=1e-4
+        )
+
+
+def test_padding_up_to_30_seconds_is_not_computed(feature_extractor, stream):
+    extractor = LogMelExtractor.from_feature_extractor(feature_extractor)
+
+    extractor([stream[:16000], stream[:8000]])
+    assert extractor.stats["computed_frames"] == 2 * 102
+    assert extractor.stats["padded_frames"] == 2 * (3000 - 102)
+
+    # Long clips are truncated to 30 s like the feature extractor does
+    features = extractor([stream])
+    np.testing.assert_allclose(
+        features[0].numpy(), reference(feature_extractor, stream), atol=1e-4
+    )
+    assert extractor.stats["batches"] == 2
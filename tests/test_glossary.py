@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from translator_by_speech.glossary import Glossary
+from translator_by_speech.translator import TranslationModel
+
+
+@pytest.fixture
+def glossary():
+    return Glossary(
+        {
+            "Xin chào": "Hello",
+            "trí tuệ nhân tạo": "artificial intelligence",
+            "nhân tạo": "artificial",
+            "he": "X",
+            "she": "Y",
+            "hers": "Z",
+        }
+    )
+
+
+def test_lookup_full_sentences(glossary):
+    assert glossary.lookup("xin  CHÀO") == "Hello"
+    assert glossary.lookup("Xin chào!") == "Hello!"
+    assert glossary.lookup("Xin chào bạn") is None
+
+
+def test_find_terms_leftmost_longest_whole_words(glossary):
+    text = "Trí tuệ nhân tạo và nhân tạo"
+
+    assert glossary.find_terms(text) == [
+        (0, 16, "artificial intelligence"),
+        (20, 28, "artificial"),
+    ]
+    # Overlapping terms found through failure links; "ushers" is not a match
+    assert glossary.find_terms("ushers she hers he") == [
+        (7, 10, "Y"),
+        (11, 15, "Z"),
+        (16, 18, "X"),
+    ]
+
+
+def test_protect_and_restore(glossary):
+    protected, targets = glossary.protect("Tôi yêu trí tuệ nhân tạo và nhân tạo.")
+
+    assert protected == "Tôi yêu __T0__ và __T1__."
+    assert targets == ["artificial intelligence", "artificial"]
+    assert (
+        glossary.restore("I love __T0__ and __ T1__.", targets)
+        == "I love artificial intelligence and artificial."
+    )
+    assert glossary.restore("I love __T0__.", targets) is None
+
+
+def test_from_tsv(tmp_path):
+    path = tmp_path / "glossary.tsv"
+    path.write_text("# product terms\nmáy chủ\tserver\n\nđám mây\tcloud\n", "utf-8")
+
+    glossary = Glossary.from_tsv(str(path))
+
+    assert len(glossary) == 2
+    assert glossary.lookup("Máy chủ") == "server"
+
+    path.write_text("no tab here\n", "utf-8")
+    with pytest.raises(ValueError):
+        Glossary.from_tsv(str(path))
+
+
+def make_model(glossary, outputs):
+    model = TranslationModel.__new__(TranslationModel)
+    model.glossary = glossary
+    model.glossary_stats = {
+        "texts": 0,
+        "exact_matches": 0,
+        "protected_terms": 0,
+        "fallbacks": 0,
+        "model_calls_saved": 0,
+    }
+    model._generate = MagicMock(side_effect=outputs)
+    return model
+
+
+def test_translate_skips_the_model_for_glossary_sentences(glossary):
+    model = make_model(glossary, [])
+
+    assert model.translate(["Xin chào.", "xin chào"]) == ["Hello.", "Hello"]
+    model._generate.assert_not_called()
+    assert model.glossary_stats["model_calls_saved"] == 1
+
+    # Empty input never needed the model
+    assert model.translate([]) == []
+    assert model.glossary_stats["model_calls_saved"] == 1
+    assert model.glossary_stats["exact_matches"] == 2
+
+
+def test_translate_protects_terms_and_falls_back(glossary):
+    model = make_model(
+        glossary,
+        [["AI __T0__ rocks", "broken"], ["plain translation"]],
+    )
+
+    result = model.translate(["Xin chào", "yêu nhân tạo", "thích nhân tạo"])
+
+    assert result == ["Hello", "AI artificial rocks", "plain translation"]
+    first_batch = model._generate.call_args_list[0].args[0]
+    assert first_batch == ["yêu __T0__", "thích __T0__"]
+    assert model._generate.call_args_list[1].args[0] == ["thích nhân tạo"]
+    assert model.glossary_stats["fallbacks"] == 1
+    assert model.glossary_stats["protected_terms"] == 2
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from translator_by_speech.loadtest import (
+    LoadGenerator,
+    format_report,
+    summarize,
+    synthetic_audio,
+)
+
+
+def make_target(service_time=0.01, fail_every=None):
+    calls = []
+    in_flight = [0, 0]
+
+    async def target(audio, sampling_rate):
+        calls.append(len(audio))
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        try:
+            await asyncio.sleep(service_time)
+            if fail_every and len(calls) % fail_every == 0:
+                raise RuntimeError("model failed")
+            return {"translated_text": "ok"}
+        finally:
+            in_flight[0] -= 1
+
+    return target, calls, in_flight
+
+
+def test_synthetic_audio_is_repeatable():
+    first = synthetic_audio(count=2, seconds=0.5, sampling_rate=8000)
+    second = synthetic_audio(count=2, seconds=0.5, sampling_rate=8000)
+
+    assert [len(audio) for _, audio, _ in first] == [4000, 4000]
+    assert (first[1][1] == second[1][1]).all()
+    assert abs(first[0][1]).max() <= 1.0
+
+
+def test_closed_loop_respects_concurrency():
+    target, calls, in_flight = make_target()
+    generator = LoadGenerator(
+        target, synthetic_audio(count=3, seconds=0.1), concurrency=2, requests=6
+    )
+
+    summary = asyncio.run(generator.run())
+
+    assert len(calls) == 6
+    assert in_flight[1] == 2
+    assert summary["requests"] == 6
+    assert summary["errors"] == 0
+    assert summary["throughput"] > 0
+    assert summary["latency"]["p50"] >= 0.01
+
+
+def test_open_loop_reports_queueing_delay():
+    target, calls, in_flight = make_target(service_time=0.05)
+    generator = LoadGenerator(
+        target,
+        synthetic_audio(count=1, seconds=0.1),
+        concurrency=1,
+        rate=200.0,
+        requests=5,
+    )
+
+    summary = asyncio.run(generator.run())
+
+    # Arrivals are much faster than the service, so requests wait for the slot
+    assert len(calls) == 5
+    assert in_flight[1] == 1
+    assert summary["queueing_delay"]["max"] > 0.1
+    assert summary["latency"]["max"] >= summary["queueing_delay"]["max"]
+
+
+def test_errors_and_timeouts_are_counted():
+    target, _, _ = make_target(fail_every=2)
+    generator = LoadGenerator(
+        target, synthetic_audio(count=1, seconds=0.1), concurrency=1, requests=4
+    )
+
+    summary = asyncio.run(generator.run())
+
+    assert summary["errors"] == 2
+    assert summary["error_rate"] == pytest.approx(0.5)
+    assert "error rate" in format_report(summary)
+
+    slow, _, _ = make_target(service_time=1.0)
+    generator = LoadGenerator(
+        slow, synthetic_audio(count=1, seconds=0.1), requests=1, timeout=0.01
+    )
+    assert asyncio.run(generator.run())["errors"] == 1
+
+
+def test_summarize_buckets_requests_over_time():
+    records = [
+        {"end": 1.0, "latency": 0.5, "queueing_delay": 0.0, "error": None},
+        {"end": 12.0, "latency": 1.5, "queueing_delay": 1.0, "error": None},
+        {"end": 13.0, "latency": 2.0, "queueing_delay": 1.0, "error": "boom"},
+    ]
+
+    summary = summarize(records, elapsed=20.0, interval=10.0)
+
+    assert [w["requests"] for w in summary["timeline"]] == [1, 2]
+    assert summary["timeline"][1]["error_rate"] == pytest.approx(0.5)
+    assert summary["throughput"] == pytest.approx(0.1)
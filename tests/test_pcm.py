@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+import pytest
+
+from translator_by_speech.pcm import PCMConverter, as_int16, peak_amplitude
+
+
+def test_as_int16_is_zero_copy():
+    data = bytearray(np.array([1, -2, 3], dtype=np.int16).tobytes())
+
+    samples = as_int16(memoryview(data))
+
+    np.testing.assert_array_equal(samples, [1, -2, 3])
+    data[0] = 5
+    assert samples[0] == 5
+
+
+def test_as_int16_rejects_other_dtypes():
+    with pytest.raises(ValueError):
+        as_int16(np.zeros(3, dtype=np.float32))
+
+
+def test_peak_amplitude():
+    assert peak_amplitude(np.array([0.5, -2.0, 1.0])) == 2.0
+    assert peak_amplitude(np.zeros(0)) == 0.0
+
+
+def test_convert_scales_and_reuses_buffer():
+    converter = PCMConverter()
+    pcm = np.array([0, 16384, -32768, 32767], dtype=np.int16)
+
+    first = converter.convert(pcm.tobytes())
+    np.testing.assert_allclose(first, [0.0, 0.5, -1.0, 32767 / 32768])
+    assert first.dtype == np.float32
+
+    second = converter.convert(pcm[:2])
+    assert np.shares_memory(first, second)
+
+
+def test_convert_downmixes_interleaved_stereo():
+    converter = PCMConverter()
+    pcm = np.array([16384, 0, -16384, -16384], dtype=np.int16)
+
+    mono = converter.convert(pcm, channels=2)
+
+    np.testing.assert_allclose(mono, [0.25, -0.5])
+
+
+def test_buffers_are_per_thread():
+    converter = PCMConverter()
+    main = converter.convert(np.ones(4, dtype=np.int16))
+    other = []
+
+    thread = threading.Thread(
+        target=lambda: other.append(converter.convert(np.ones(4, dtype=np.int16)))
+    )
+    thread.start()
+    thread.join()
+
+    assert not np.shares_memory(main, other[0])
@@ -0,0 +1,171 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from translator_by_speech.pipeline import SpeechTranslationPipeline
+
+
+def make_pipeline():
+    asr_model = MagicMock()
+    asr_model.is_long_audio_file.side_effect = lambda path: path.startswith("long")
+    asr_model.load_audio_file.side_effect = lambda path: (
+        np.zeros(16000, dtype=np.float32),
+        16000,
+    )
+    asr_model.transcribe_audio_batch.side_effect = lambda arrays, rates, language: [
+        {"text": f"Câu {i}."} for i in range(len(arrays))
+    ]
+    asr_model.transcribe_audio_file.return_value = {"text": "Dài."}
+
+    translator_model = MagicMock()
+    translator_model.translate.side_effect = lambda texts: [t.upper() for t in texts]
+
+    return SpeechTranslationPipeline(
+        asr_model=asr_model, translator_model=translator_model
+    )
+
+
+def test_translate_speech_from_files_batches_short_files():
+    pipeline = make_pipeline()
+
+    results = list(
+        pipeline.translate_speech_from_files(
+            ["a.wav", "long.wav", "b.wav", "c.wav"], batch_size=3
+        )
+    )
+
+    assert [r["file_path"] for r in results] == ["a.wav", "long.wav", "b.wav", "c.wav"]
+    assert [r["translated_text"] for r in results] == [
+        "CÂU 0.",
+        "DÀI.",
+        "CÂU 1.",
+        "CÂU 0.",
+    ]
+    # Two short files in the first batch, one in the second
+    batch_sizes = [
+        len(call.args[0])
+        for call in pipeline.asr_model.transcribe_audio_batch.mock_calls
+    ]
+    assert batch_sizes == [2, 1]
+    pipeline.asr_model.load_audio_file.assert_any_call("c.wav")
+    assert pipeline.prefetch_stats["files"] == 4
+
+
+def test_translate_speech_from_files_reports_decode_errors():
+    pipeline = make_pipeline()
+    pipeline.asr_model.load_audio_file.side_effect = IOError("broken file")
+
+    results = list(pipeline.translate_speech_from_files(["a.wav"]))
+
+    assert results == [{"file_path": "a.wav", "error": "broken file"}]
+    pipeline.asr_model.transcribe_audio_batch.assert_not_called()
+
+
+def test_auto_mode_routes_each_file_to_its_translator():
+    pipeline = make_pipeline()
+    languages = iter([("vi", 0.9), ("en", 0.8)])
+
+    def transcribe_audio_batch(arrays, rates, language):
+        assert language == "auto"
+        results = []
+        for _ in arrays:
+            detected, probability = next(languages)
+            results.append(
+                {
+                    "text": f"{detected} text.",
+                    "language": detected,
+                    "language_probability": probability,
+                }
+            )
+        return results
+
+    pipeline.asr_model.transcribe_audio_batch.side_effect = transcribe_audio_batch
+    vi2en, en2vi = MagicMock(), MagicMock()
+    vi2en.translate.side_effect = lambda texts: ["to english"] * len(texts)
+    en2vi.translate.side_effect = lambda texts: ["sang tiếng việt"] * len(texts)
+
+    auto = SpeechTranslationPipeline(
+        asr_model=pipeline.asr_model,
+        source_lang="auto",
+        translators={"vi": vi2en, "en": en2vi},
+    )
+    results = list(auto.translate_speech_from_files(["a.wav", "b.wav"]))
+
+    assert [(r["source_lang"], r["target_lang"]) for r in results] == [
+        ("vi", "en_XX"),
+        ("en", "vi_VN"),
+    ]
+    assert [r["translated_text"] for r in results] == [
+        "to english",
+        "sang tiếng việt",
+    ]
+    assert [r["language_probability"] for r in results] == [0.9, 0.8]
+
+
+def test_auto_mode_rejects_unsupported_languages():
+    asr_model = MagicMock()
+    asr_model.transcribe_audio.return_value = {
+        "text": "bonjour",
+        "language": "fr",
+        "language_probability": 0.7,
+    }
+    auto = SpeechTranslationPipeline(
+        asr_model=asr_model, source_lang="auto", translators={"vi": MagicMock()}
+    )
+
+    with pytest.raises(ValueError):
+        auto.translate_speech(np.zeros(16000, dtype=np.float32), 16000)
+
+
+def test_results_carry_timings_and_model_versions():
+    pipeline = make_pipeline()
+    pipeline.asr_model.model_id = "asr-model"
+    pipeline.translator_model.model_name = "mt-model"
+
+    result = pipeline.translate_speech_from_file("long.wav")
+
+    assert result["timings"]["asr_seconds"] >= 0
+    assert result["timings"]["translation_seconds"] >= 0
+    assert result["models"]["asr"].startswith("asr-model")
+    assert result["models"]["translation"].startswith("mt-model")
+
+
+def test_translate_transcription_translates_an_existing_transcript():
+    pipeline = make_pipeline()
+
+    result = pipeline.translate_transcription({"text": "Xin chào. Tạm biệt."}, 0.25)
+
+    assert result["translated_text"] == "XIN CHÀO. TẠM BIỆT."
+    assert result["target_lang"] == "en_XX"
+    assert result["timings"]["asr_seconds"] == 0.25
+    pipeline.asr_model.transcribe_audio.assert_not_called()
+
+
+def test_segments_are_translated_in_one_batched_call():
+    pipeline = make_pipeline()
+    pipeline.asr_model.transcribe_audio_file.return_value = {
+        "text": "Một. Hai. Ba.",
+        "segments": [
+            {"text": "Một.", "start": 0.0, "end": 1.0},
+            {"text": "Hai.", "start": 1.0, "end": 2.0},
+            {"text": "Ba.", "start": 31.0, "end": 32.5},
+        ],
+    }
+
+    result = pipeline.translate_speech_segments_from_file("long.wav")
+
+    translate = pipeline.translator_model.translate
+    assert translate.call_count == 1
+    assert sorted(translate.call_args.args[0]) == ["Ba.", "Hai.", "Một."]
+    assert pipeline.asr_model.transcribe_audio_file.call_args.kwargs == {
+        "language": "vi",
+        "return_timestamps": True,
+    }
+    assert result["translated_text"] == "MỘT. HAI. BA."
+    assert result["segments"][2] == {
+        "start": 31.0,
+        "end": 32.5,
+        "source_text": "Ba.",
+        "translated_text": "BA.",
+    }
@@ -0,0 +1,116 @@
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from translator_by_speech.results import (
+    ResultStore,
+    file_hash,
+    legacy_txt_files,
+    model_version,
+)
+
+
+@pytest.fixture
+def audio_files(tmp_path):
+    paths = []
+    for name, content in [("a.wav", b"first"), ("b.wav", b"second")]:
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths.append(str(path))
+    return paths
+
+
+def make_result(text):
+    return {
+        "source_text": text,
+        "source_lang": "vi",
+        "translated_text": text.upper(),
+        "target_lang": "en_XX",
+        "timings": {"asr_seconds": 0.5, "translation_seconds": 0.1},
+        "models": {"asr": "asr@abc", "translation": "mt@def"},
+    }
+
+
+def test_store_writes_in_bulk_and_finds_results(tmp_path, audio_files):
+    store = ResultStore(str(tmp_path / "results.db"), batch_size=2)
+    store.add(audio_files[0], make_result("một"))
+    assert store._pending
+
+    store.add(audio_files[1], make_result("hai"))
+    assert not store._pending
+
+    record = store.lookup_hash(file_hash(audio_files[1]))
+    assert record["transcript"] == "hai"
+    assert record["translation"] == "HAI"
+    assert record["timings"]["asr_seconds"] == 0.5
+    assert record["models"] == {"asr": "asr@abc", "translation": "mt@def"}
+    assert store.lookup_path(audio_files[0])["transcript"] == "một"
+    assert store.lookup_hash("missing") is None
+    store.close()
+
+
+def test_each_file_is_hashed_once_until_it_changes(tmp_path, audio_files, monkeypatch):
+    hashed = []
+    monkeypatch.setattr(
+        "translator_by_speech.results.file_hash",
+        lambda path: hashed.append(path) or f"hash{len(hashed)}",
+    )
+    store = ResultStore(str(tmp_path / "results.db"))
+
+    store.add(audio_files[0], make_result("một"))
+    assert store.file_hash(audio_files[0]) == "hash1"
+    assert len(hashed) == 1
+
+    with open(audio_files[0], "ab") as f:
+        f.write(b" more")
+    assert store.file_hash(audio_files[0]) == "hash2"
+    store.close()
+
+
+def test_store_is_append_only(tmp_path, audio_files):
+    db_path = str(tmp_path / "results.db")
+    store = ResultStore(db_path)
+    store.add(audio_files[0], make_result("cũ"))
+    store.add(audio_files[0], make_result("mới"))
+    store.close()
+
+    # Records survive reopening; lookups return the latest one
+    store = ResultStore(db_path)
+    assert len(store) == 2
+    assert store.lookup_path(audio_files[0])["transcript"] == "mới"
+    assert [r["transcript"] for r in store.iter_latest()] == ["mới"]
+    store.close()
+
+
+def test_export_txt_writes_the_legacy_layout(tmp_path, audio_files):
+    store = ResultStore(str(tmp_path / "results.db"))
+    store.add(audio_files[0], make_result("một"))
+    store.add(audio_files[1], {"text": "chỉ phiên âm", "language": "vi"})
+
+    export_dir = tmp_path / "export"
+    assert store.export_txt(str(export_dir)) == 2
+    store.close()
+
+    assert sorted(os.listdir(export_dir)) == [
+        "a_transcript.txt",
+        "a_translation.txt",
+        "b.txt",
+    ]
+    assert (export_dir / "a_translation.txt").read_text("utf-8") == "MỘT"
+    assert (export_dir / "b.txt").read_text("utf-8") == "chỉ phiên âm"
+
+
+def test_legacy_txt_files_strips_any_extension():
+    assert legacy_txt_files("/x/talk.flac", "t", "u") == [
+        ("talk_transcript.txt", "t"),
+        ("talk_translation.txt", "u"),
+    ]
+
+
+def test_model_version_includes_the_revision():
+    model = MagicMock(spec=["model_name", "model"])
+    model.model_name = "vinai/vinai-translate-vi2en-v2"
+    model.model.config._commit_hash = "0123456789abcdef"
+
+    assert model_version(model) == "vinai/vinai-translate-vi2en-v2@0123456789ab"
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from translator_by_speech.ring_buffer import AudioRingBuffer
+
+
+def test_view_returns_recent_samples_without_copy():
+    ring = AudioRingBuffer(capacity=8)
+    written = np.arange(20, dtype=np.int16)
+
+    for chunk in np.array_split(written, 7):
+        ring.write(chunk)
+
+    assert ring.total_written == 20
+    assert ring.oldest == 12
+
+    view = ring.view(13, 20)
+    np.testing.assert_array_equal(view, written[13:20])
+    assert np.shares_memory(view, ring._data)
+    assert not view.flags.writeable
+
+
+def test_write_longer_than_capacity_keeps_tail():
+    ring = AudioRingBuffer(capacity=4)
+
+    ring.write(np.arange(10, dtype=np.int16))
+
+    assert ring.total_written == 10
+    np.testing.assert_array_equal(ring.view(6, 10), [6, 7, 8, 9])
+
+
+def test_view_of_overwritten_samples_raises():
+    ring = AudioRingBuffer(capacity=4)
+    ring.write(np.arange(6, dtype=np.int16))
+
+    with pytest.raises(ValueError):
+        ring.view(1, 5)
+    with pytest.raises(ValueError):
+        ring.view(4, 7)
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+import torch
+from torch._dynamo.exc import Unsupported
+
+from translator_by_speech.runtime import RuntimeConfig, autotune, candidate_configs
+
+
+def test_save_and_load_round_trip(tmp_path):
+    config = RuntimeConfig(intra_op_threads=2, inference_mode=False, bf16_autocast=True)
+    path = str(tmp_path / "runtime.json")
+
+    config.save(path)
+
+    assert RuntimeConfig.load(path) == config
+
+
+def test_inference_context_disables_autograd():
+    weight = torch.ones(2, requires_grad=True)
+
+    with RuntimeConfig(inference_mode=True).inference_context(torch.device("cpu")):
+        assert torch.is_inference_mode_enabled()
+        assert not (weight * 2).requires_grad
+
+    with RuntimeConfig(inference_mode=False).inference_context(torch.device("cpu")):
+        assert not torch.is_inference_mode_enabled()
+        assert not (weight * 2).requires_grad
+
+
+def test_apply_threads_sets_intra_op_threads():
+    previous = torch.get_num_threads()
+    try:
+        RuntimeConfig(intra_op_threads=1).apply_threads()
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_candidate_configs_vary_threads_and_modes():
+    base = RuntimeConfig(inter_op_threads=2)
+
+    configs = candidate_configs(base, thread_counts=[1, 2], try_bf16=True)
+
+    assert len(configs) == 2 * 2 * 2
+    assert {c.intra_op_threads for c in configs} == {1, 2}
+    assert all(c.inter_op_threads == 2 for c in configs)
+
+
+def test_autotune_picks_the_fastest_config():
+    previous = torch.get_num_threads()
+    configs = candidate_configs(RuntimeConfig(), thread_counts=[1], try_bf16=False)
+    calls = []
+
+    def run(config):
+        calls.append(config)
+        # The no_grad variant is made artificially slow
+        if not config.inference_mode:
+            time.sleep(0.01)
+
+    try:
+        best, results = autotune(run, configs, warmup=1, repeats=2)
+    finally:
+        torch.set_num_threads(previous)
+
+    assert best.inference_mode
+    assert len(results) == 2
+    assert len(calls) == 2 * 3
+
+
+def fake_compile(error):
+    calls = []
+
+    def compile(forward, **kwargs):
+        def compiled(*args, **kw):
+            calls.append("compiled")
+            raise error
+
+        return compiled
+
+    return compile, calls
+
+
+def test_compiled_forward_falls_back_to_eager_on_compiler_errors(monkeypatch):
+    compile, calls = fake_compile(Unsupported("inductor backend failed"))
+    monkeypatch.setattr(torch, "compile", compile)
+    model = RuntimeConfig(compile=True).prepare_model(torch.nn.Linear(2, 1).eval())
+
+    inputs = torch.ones(1, 2)
+    expected = inputs @ model.weight.T + model.bias
+    torch.testing.assert_close(model(inputs), expected)
+    torch.testing.assert_close(model(inputs), expected)
+
+    # Compilation is not retried after the first failure
+    assert calls == ["compiled"]
+
+
+def test_other_errors_of_a_compiled_forward_are_raised(monkeypatch):
+    compile, calls = fake_compile(RuntimeError("out of memory"))
+    monkeypatch.setattr(torch, "compile", compile)
+    model = RuntimeConfig(compile=True).prepare_model(torch.nn.Linear(2, 1).eval())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="out of memory"):
+            model(torch.ones(1, 2))
+    assert calls == ["compiled", "compiled"]
+
+
+def test_prepare_model_again_undoes_compilation(monkeypatch):
+    compile, _ = fake_compile(RuntimeError("compiled"))
+    monkeypatch.setattr(torch, "compile", compile)
+    model = torch.nn.Linear(2, 1).eval()
+
+    RuntimeConfig(compile=True).prepare_model(model)
+    RuntimeConfig(compile=False).prepare_model(model)
+
+    assert model(torch.ones(1, 2)).shape == (1, 1)
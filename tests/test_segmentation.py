@@ -0,0 +1,80 @@
+import pytest
+
+from translator_by_speech.segmentation import (
+    ends_sentence,
+    join_translations,
+    split_sentences,
+    translate_segmented,
+    translate_segmented_batch,
+)
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        ("nay.", True),
+        ("done?!", True),
+        ('"Hello."', True),
+        ("Mr.", False),
+        ("TP.", False),
+        ("J.", False),
+        ("3.5", False),
+        ("hello,", False),
+    ],
+)
+def test_ends_sentence(word, expected):
+    assert ends_sentence(word) == expected
+
+
+def test_split_sentences_preserves_spacing():
+    text = "  Xin chào các bạn. Hôm nay TP. Hồ Chí Minh nắng!  Mr. Smith said hi?\nOk  "
+
+    pieces, separators = split_sentences(text)
+
+    assert pieces == [
+        "Xin chào các bạn.",
+        "Hôm nay TP. Hồ Chí Minh nắng!",
+        "Mr. Smith said hi?",
+        "Ok",
+    ]
+    assert separators == ["  ", " ", "  ", "\n", "  "]
+    assert join_translations(pieces, separators) == text
+
+
+def test_split_sentences_splits_long_sentences_at_clauses():
+    pieces, _ = split_sentences("a, b c d, e f g h i", max_words=3)
+
+    assert pieces == ["a,", "b c d,", "e f g", "h i"]
+
+
+def test_split_sentences_empty_text():
+    assert split_sentences("   ") == ([], ["   "])
+
+
+def test_translate_segmented_batches_in_order():
+    calls = []
+
+    def translate(texts):
+        calls.append(texts)
+        return [t.upper() for t in texts]
+
+    text = "One. Two two. Three three three.\nFour."
+    result = translate_segmented(translate, text, batch_size=2)
+
+    assert result == "ONE. TWO TWO. THREE THREE THREE.\nFOUR."
+    assert len(calls) == 2
+    assert all(len(batch) <= 2 for batch in calls)
+
+
+def test_translate_segmented_batch_pools_sentences_across_texts():
+    calls = []
+
+    def translate(texts):
+        calls.append(texts)
+        return [t.upper() for t in texts]
+
+    texts = ["One. Two.", "", "Three.  Four four."]
+    result = translate_segmented_batch(translate, texts, batch_size=4)
+
+    assert result == ["ONE. TWO.", "", "THREE.  FOUR FOUR."]
+    assert len(calls) == 1
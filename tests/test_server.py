@@ -0,0 +1,333 @@
+import os
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from translator_by_speech.client import ModelClient, model_settings, run_client
+from translator_by_speech.coalescing import CoalescingTranslator
+from translator_by_speech.results import ResultStore
+from translator_by_speech.server import ModelServer
+
+
+class FakePipeline:
+    def __init__(self):
+        self.audio = []
+        self.batches = []
+
+    def translate_speech(self, audio_array, sampling_rate):
+        # Keep a copy: the shared block is released after the request
+        self.audio.append(np.array(audio_array))
+        return {
+            "source_text": "xin chào",
+            "translated_text": "hello",
+            "source_lang": "vi",
+            "target_lang": "en_XX",
+            "sampling_rate": sampling_rate,
+            "peak": np.float32(np.abs(audio_array).max()),
+        }
+
+    def translate_speech_from_file(self, file_path):
+        return {
+            "source_text": f"nội dung {os.path.basename(file_path)}",
+            "translated_text": f"content {os.path.basename(file_path)}",
+            "source_lang": "vi",
+            "target_lang": "en_XX",
+            "timings": {"asr_seconds": 0.1, "translation_seconds": 0.1},
+            "models": {"asr": "asr", "translation": "mt"},
+        }
+
+    def translate_speech_from_files(self, file_paths, batch_size=8):
+        self.batches.append(list(file_paths))
+        if file_paths[0].endswith(".crash"):
+            raise RuntimeError("decoder crashed")
+        self.prefetch_stats = {"files": len(file_paths), "errors": 0}
+        for file_path in file_paths:
+            if file_path.endswith(".bad"):
+                yield {"file_path": file_path, "error": "cannot decode"}
+            else:
+                yield {
+                    "file_path": file_path,
+                    **self.translate_speech_from_file(file_path),
+                }
+
+    def translate_speech_segments_from_file(self, file_path):
+        return {
+            **self.translate_speech_from_file(file_path),
+            "segments": [
+                {
+                    "start": 0.0,
+                    "end": 1.5,
+                    "source_text": "xin chào",
+                    "translated_text": "hello",
+                }
+            ],
+        }
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters, so keep it short
+    directory = tempfile.mkdtemp(prefix="tbs")
+    yield os.path.join(directory, "s.sock")
+    os.rmdir(directory)
+
+
+@pytest.fixture
+def server(socket_path):
+    server = ModelServer(socket_path=socket_path)
+    server.pipeline_stub = FakePipeline()
+    server._pipelines[("vi", "en")] = server.pipeline_stub
+    translator = MagicMock()
+    translator.translate.side_effect = lambda texts: [text.upper() for text in texts]
+    server._translators["vi2en"] = translator
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if ModelClient.connect(socket_path) is not None:
+            break
+        threading.Event().wait(0.01)
+
+    yield server
+
+    server.stop()
+    thread.join(timeout=5)
+
+
+def test_connect_returns_none_without_server(socket_path):
+    assert ModelClient.connect(socket_path) is None
+
+    # A socket file left behind by a stopped server
+    open(socket_path, "w").close()
+    assert ModelClient.connect(socket_path) is None
+    os.unlink(socket_path)
+
+
+def test_audio_is_handed_over_in_shared_memory(server, socket_path):
+    client = ModelClient.connect(socket_path)
+    assert client.ping()["pid"] == os.getpid()
+
+    audio = np.sin(np.linspace(0, 100, 16000)).astype(np.float32) * 0.5
+    result = client.translate_audio(audio, 16000)
+
+    assert result["translated_text"] == "hello"
+    assert result["sampling_rate"] == 16000
+    assert result["peak"] == pytest.approx(float(np.abs(audio).max()))
+    np.testing.assert_array_equal(server.pipeline_stub.audio[0], audio)
+
+
+def test_integer_audio_is_converted_to_float(server, socket_path):
+    client = ModelClient.connect(socket_path)
+    client.translate_audio(np.array([0, 16384, -32767], dtype=np.int16), 16000)
+
+    np.testing.assert_allclose(
+        server.pipeline_stub.audio[0], [0.0, 0.5, -32767 / 32768], rtol=1e-6
+    )
+
+
+def test_text_and_file_requests(server, socket_path, tmp_path):
+    client = ModelClient.connect(socket_path)
+    audio_file = tmp_path / "talk.wav"
+    audio_file.write_bytes(b"audio")
+
+    assert client.translate_text("xin chào. tạm biệt.") == "XIN CHÀO. TẠM BIỆT."
+    result = client.process_file(str(audio_file), subtitles=True)
+    assert result["translated_text"] == "content talk.wav"
+    assert result["segments"][0]["end"] == 1.5
+
+
+def test_errors_are_reported_to_the_client(server, socket_path):
+    client = ModelClient.connect(socket_path)
+
+    with pytest.raises(RuntimeError, match="Unsupported language pair"):
+        client.process_file("talk.wav", source_lang="en", target_lang="en")
+    with pytest.raises(RuntimeError, match="Unknown request"):
+        client.request({"op": "reload"})
+
+    assert server.stats["errors"] == 2
+    assert client.ping()["translators"] == ["vi2en"]
+
+
+def test_shutdown_request_stops_the_server(socket_path):
+    server = ModelServer(socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        client = ModelClient.connect(socket_path)
+        if client is not None:
+            break
+        threading.Event().wait(0.01)
+
+    client.shutdown()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+
+def test_run_client_processes_files_through_the_server(
+    server, socket_path, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.wav").write_bytes(b"first")
+    (tmp_path / "b.wav").write_bytes(b"second")
+    db_path = str(tmp_path / "results.db")
+
+    handled = run_client(
+        ["--process", "a.wav", "b.wav", "--socket", socket_path]
+        + ["--results-db", db_path, "--subtitles", "srt"]
+    )
+
+    assert handled
+    store = ResultStore(db_path)
+    assert store.lookup_path("b.wav")["translation"] == "content b.wav"
+    store.close()
+    srt = (tmp_path / "transcripts" / "a.srt").read_text(encoding="utf-8")
+    assert "00:00:00,000 --> 00:00:01,500\nxin chào\nhello" in srt
+
+
+def test_files_are_processed_in_batched_requests(server, socket_path, tmp_path):
+    client = ModelClient.connect(socket_path)
+    paths = [str(tmp_path / name) for name in ("a.wav", "b.bad", "c.wav")]
+    prefetch_stats = {}
+
+    results = list(
+        client.process_files(paths, batch_size=2, prefetch_stats=prefetch_stats)
+    )
+
+    assert server.pipeline_stub.batches == [paths[:2], paths[2:]]
+    assert [result["file_path"] for result in results] == paths
+    assert results[0]["translated_text"] == "content a.wav"
+    assert results[1]["error"] == "cannot decode"
+    assert prefetch_stats == {"files": 3, "errors": 0}
+
+
+def test_a_failed_request_only_fails_its_own_files(server, socket_path):
+    client = ModelClient.connect(socket_path)
+
+    results = list(client.process_files(["a.crash", "b.wav"], batch_size=1))
+
+    assert "decoder crashed" in results[0]["error"]
+    assert results[1]["translated_text"] == "content b.wav"
+
+
+def test_run_client_sends_batched_requests(server, socket_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.wav").write_bytes(b"first")
+    (tmp_path / "b.wav").write_bytes(b"second")
+    db_path = str(tmp_path / "results.db")
+
+    handled = run_client(
+        ["--process", "a.wav", "b.wav", "--socket", socket_path]
+        + ["--results-db", db_path, "--txt"]
+    )
+
+    assert handled
+    assert len(server.pipeline_stub.batches) == 1
+    store = ResultStore(db_path)
+    assert store.lookup_path("a.wav")["translation"] == "content a.wav"
+    store.close()
+    assert os.listdir(tmp_path / "transcripts")
+
+
+def test_model_requests_beyond_the_limits_are_rejected(server, socket_path):
+    server._slots = threading.BoundedSemaphore(1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(file_path):
+        started.set()
+        release.wait(5)
+        return {"translated_text": "done"}
+
+    server.pipeline_stub.translate_speech_from_file = slow
+    client = ModelClient.connect(socket_path)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(client.process_file("a.wav"))
+    )
+    thread.start()
+    assert started.wait(5)
+
+    with pytest.raises(RuntimeError, match="busy"):
+        client.process_file("b.wav")
+    # Control requests do not wait for the models
+    assert client.ping()["pid"] == os.getpid()
+
+    release.set()
+    thread.join(timeout=5)
+    assert results == [{"translated_text": "done"}]
+    assert server.stats["busy"] == 1
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--interactive"],
+        ["--process", "a.wav", "--record", "5"],
+        ["--process", "a.wav", "--no-daemon"],
+        ["--process", "a.wav", "--source", "fr"],
+    ],
+)
+def test_run_client_leaves_other_commands_to_the_cli(server, socket_path, argv):
+    assert not run_client(argv + ["--socket", socket_path])
+
+
+def test_run_client_needs_a_running_server(socket_path):
+    assert not run_client(["--process", "a.wav", "--socket", socket_path])
+
+
+def test_settings_that_differ_from_the_server_are_reported(server, socket_path):
+    client = ModelClient.connect(socket_path)
+
+    assert client.mismatched_settings(model_settings()) == []
+    assert (
+        client.mismatched_settings(model_settings(runtime={"inference_mode": True}))
+        == []
+    )
+
+    mismatches = client.mismatched_settings(
+        model_settings(
+            decoding_profile="fast",
+            glossaries={"vi2en": "glossary.tsv"},
+            runtime={"intra_op_threads": 2},
+        )
+    )
+    assert [m.split(":")[0] for m in mismatches] == [
+        "decoding_profile",
+        "glossaries",
+        "runtime",
+    ]
+
+
+def test_run_client_falls_back_when_the_server_settings_differ(
+    server, socket_path, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.wav").write_bytes(b"first")
+    server.decoding_profile = "quality"
+
+    assert not run_client(["--process", "a.wav", "--socket", socket_path])
+
+    # A runtime settings file the server was not started with
+    server.decoding_profile = "balanced"
+    (tmp_path / "runtime_config.json").write_text('{"compile": true}')
+    assert not run_client(["--process", "a.wav", "--socket", socket_path])
+
+
+def test_translators_are_shared_through_a_coalescing_queue(socket_path, monkeypatch):
+    model = MagicMock()
+    model.translate.side_effect = lambda texts, **kwargs: [t.upper() for t in texts]
+    monkeypatch.setattr(
+        "translator_by_speech.server.create_vi2en_translator",
+        lambda **kwargs: model,
+    )
+    server = ModelServer(socket_path=socket_path)
+
+    translator = server.translator("vi2en")
+
+    assert isinstance(translator, CoalescingTranslator)
+    assert translator.translate("xin chào") == "XIN CHÀO"
+    translator.close()
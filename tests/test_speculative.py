@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+
+from translator_by_speech.speculative import (
+    SpeculativeTranscriber,
+    format_speculative_stats,
+)
+
+
+def make_transcriber(gate=None):
+    calls = []
+
+    def transcribe(samples):
+        calls.append(len(samples))
+        if gate is not None:
+            gate.wait(5)
+        return {"text": f"{len(samples)} samples", "language": "vi"}
+
+    return SpeculativeTranscriber(transcribe), calls
+
+
+def test_result_of_the_final_pause_is_reused():
+    transcriber, calls = make_transcriber()
+    samples = np.zeros(300, dtype=np.int16)
+
+    transcriber.start(samples)
+    samples[:] = 1  # the recorder's buffer may change; the job has its own copy
+    asr_result, asr_seconds = transcriber.result()
+
+    assert asr_result["text"] == "300 samples"
+    assert asr_seconds >= 0
+    assert calls == [300]
+    assert transcriber.stats["used"] == 1
+    assert transcriber.result() is None
+    transcriber.close()
+
+
+def test_resumed_speech_cancels_and_the_next_pause_extends_the_job():
+    gate = threading.Event()
+    transcriber, calls = make_transcriber(gate)
+
+    transcriber.start(np.zeros(100, dtype=np.int16))
+    transcriber.cancel()  # speech resumed
+    transcriber.start(np.zeros(250, dtype=np.int16))
+    gate.set()
+
+    asr_result, _ = transcriber.result()
+    assert asr_result["text"] == "250 samples"
+    # The first job was dropped from the queue or ran to a discarded result
+    assert calls in ([250], [100, 250])
+    assert transcriber.stats["started"] == 2
+    assert transcriber.stats["cancelled"] == 1
+    assert "1 utterances transcribed early" in format_speculative_stats(transcriber)
+    transcriber.close()
+
+
+def test_no_result_when_recording_ended_while_speaking():
+    transcriber, _ = make_transcriber()
+
+    transcriber.start(np.zeros(100, dtype=np.int16))
+    transcriber.cancel()
+
+    assert transcriber.result() is None
+    assert transcriber.stats["used"] == 0
+    transcriber.close()
+
+
+def test_failed_job_falls_back(capsys):
+    def transcribe(samples):
+        raise RuntimeError("model failed")
+
+    transcriber = SpeculativeTranscriber(transcribe)
+    transcriber.start(np.zeros(100, dtype=np.int16))
+
+    assert transcriber.result() is None
+    assert "Early transcription failed: model failed" in capsys.readouterr().out
+    transcriber.close()
@@ -0,0 +1,140 @@
+import copy
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+from transformers import (
+    GenerationConfig,
+    WhisperConfig,
+    WhisperFeatureExtractor,
+    WhisperForCausalLM,
+    WhisperForConditionalGeneration,
+)
+
+from translator_by_speech.assisted import AssistedDecoding
+from translator_by_speech.decoding import DecodingPolicy
+from translator_by_speech.features import LogMelExtractor
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.speech_recognition import ASRModel
+
+LANG_TO_ID = {"<|en|>": 50259, "<|vi|>": 50278}
+
+
+@pytest.fixture(scope="module")
+def asr_model():
+    """ASRModel around a tiny randomly initialized Whisper model."""
+    torch.manual_seed(0)
+    config = WhisperConfig(
+        d_model=16,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=16,
+        decoder_ffn_dim=16,
+        num_mel_bins=80,
+    )
+    model = WhisperForConditionalGeneration(config).eval()
+    model.generation_config = GenerationConfig(
+        decoder_start_token_id=50258,
+        eos_token_id=50257,
+        pad_token_id=50257,
+        lang_to_id=LANG_TO_ID,
+        task_to_id={"transcribe": 50360, "translate": 50359},
+        no_timestamps_token_id=50364,
+        is_multilingual=True,
+        max_length=448,
+    )
+
+    asr = ASRModel.__new__(ASRModel)
+    asr.model = model
+    asr.device = torch.device("cpu")
+    asr.torch_dtype = torch.float32
+    asr.decoding = DecodingPolicy("fast")
+    asr.auto_languages = ("vi", "en")
+    asr.runtime = RuntimeConfig()
+    asr.assisted = None
+    asr.processor = MagicMock()
+    asr.processor.feature_extractor = WhisperFeatureExtractor(feature_size=80)
+    asr.processor.batch_decode.side_effect = lambda sequences, **kwargs: (
+        ["text"] * len(sequences)
+    )
+    asr.features = LogMelExtractor.from_feature_extractor(
+        asr.processor.feature_extractor
+    )
+    return asr
+
+
+def test_detect_language_matches_whisper(asr_model):
+    features = torch.randn(2, 80, 3000)
+    encoder_outputs = asr_model.model.get_encoder()(features)
+
+    languages, probabilities = asr_model.detect_language(encoder_outputs)
+
+    expected = asr_model.model.detect_language(input_features=features).tolist()
+    id_to_lang = {v: k[2:-2] for k, v in LANG_TO_ID.items()}
+    assert languages == [id_to_lang[i] for i in expected]
+    assert all(0.5 <= p <= 1.0 for p in probabilities)
+
+
+def test_auto_language_reuses_the_encoder_pass(asr_model, mocker):
+    encoder = asr_model.model.get_encoder()
+    spy = mocker.spy(encoder, "forward")
+
+    result = asr_model.transcribe_features(
+        torch.randn(80, 3000), language="auto", duration=1.0
+    )
+
+    assert spy.call_count == 1
+    assert result["language"] in ("vi", "en")
+    assert 0.5 <= result["language_probability"] <= 1.0
+
+
+def test_fixed_language_has_no_probability(asr_model):
+    result = asr_model.transcribe_features(
+        torch.randn(80, 3000), language="vi", duration=1.0
+    )
+
+    assert result["language"] == "vi"
+    assert result["language_probability"] is None
+
+
+@pytest.mark.parametrize("language", ["vi", "auto"])
+def test_assisted_decoding_keeps_the_transcription(asr_model, language):
+    draft = WhisperForCausalLM(copy.deepcopy(asr_model.model.config)).eval()
+    draft.load_state_dict(asr_model.model.state_dict(), strict=False)
+    draft.generation_config = copy.deepcopy(asr_model.model.generation_config)
+    features = torch.randn(80, 3000)
+
+    asr_model.processor.batch_decode.side_effect = lambda sequences, **kwargs: [
+        sequence.tolist() for sequence in sequences
+    ]
+    try:
+        expected = asr_model.transcribe_features(
+            features, language=language, duration=1.0
+        )
+        assisted = AssistedDecoding(draft)
+        asr_model.assisted = assisted
+        result = asr_model.transcribe_features(
+            features, language=language, duration=1.0
+        )
+    finally:
+        asr_model.assisted = None
+        asr_model.processor.batch_decode.side_effect = lambda sequences, **kwargs: (
+            ["text"] * len(sequences)
+        )
+
+    assert result["text"] == expected["text"]
+    assert result["language"] == expected["language"]
+    assert assisted.stats["calls"] == 1
+
+
+def test_batch_features_are_extracted_in_one_pass(asr_model):
+    stats = dict(asr_model.features.stats)
+    clips = [torch.randn(n).numpy() * 0.1 for n in (8000, 16000, 4000)]
+
+    results = asr_model.transcribe_audio_batch(clips, 16000, language="vi")
+
+    assert [r["text"] for r in results] == ["text"] * 3
+    assert asr_model.features.stats["batches"] == stats["batches"] + 1
+    assert asr_model.features.stats["clips"] == stats["clips"] + 3
@@ -0,0 +1,250 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import soxr
+
+from translator_by_speech.streaming import IncrementalTranslator, StreamingTranscriber
+
+
+@pytest.fixture
+def mock_translator():
+    translator = MagicMock()
+    translator.translate.side_effect = lambda texts: [f"<{t}>" for t in texts]
+    return translator
+
+
+def make_asr(hypotheses):
+    # Unfinished segments: the whole window stays partial
+    return FakeStreamingASR(
+        [[{"text": h, "start": 0.0, "end": None}] for h in hypotheses]
+    )
+
+
+SECOND = np.zeros(16000, dtype=np.float32)
+
+
+def test_stable_sentences_are_translated_before_the_end(mock_translator):
+    asr = make_asr(
+        [
+            "Xin chào",
+            "Xin chào các bạn.",
+            "Xin chào các bạn. Hôm nay",
+            "Xin chào các bạn. Hôm nay trời đẹp",
+        ]
+    )
+    incremental = IncrementalTranslator(
+        asr, mock_translator, sampling_rate=16000, min_step_seconds=1.0
+    )
+
+    assert incremental.feed(SECOND) == []
+    assert incremental.feed(SECOND) == []
+    # Third pass agrees with the second on the whole first sentence
+    assert incremental.feed(SECOND) == [
+        {"source_text": "Xin chào các bạn.", "translated_text": "<Xin chào các bạn.>"}
+    ]
+    assert incremental.feed(SECOND) == []
+    assert incremental.stable_text == "Xin chào các bạn. Hôm nay"
+
+    assert incremental.finish() == [
+        {"source_text": "Hôm nay trời đẹp", "translated_text": "<Hôm nay trời đẹp>"}
+    ]
+    assert incremental.stable_text == ""
+
+
+def test_small_chunks_do_not_trigger_asr(mock_translator):
+    asr = make_asr(["a b c"])
+    incremental = IncrementalTranslator(
+        asr, mock_translator, sampling_rate=16000, min_step_seconds=1.0
+    )
+
+    results = list(incremental.stream([SECOND[:4800] for _ in range(3)]))
+
+    assert len(asr.calls) == 1
+    assert results == [{"source_text": "a b c", "translated_text": "<a b c>"}]
+
+
+def test_long_clause_is_committed_without_punctuation(mock_translator):
+    asr = make_asr(["one two three four five"] * 2)
+    incremental = IncrementalTranslator(
+        asr,
+        mock_translator,
+        sampling_rate=16000,
+        agreement=2,
+        min_step_seconds=1.0,
+        max_chunk_words=2,
+    )
+
+    incremental.feed(SECOND)
+    results = incremental.feed(SECOND)
+
+    assert [r["source_text"] for r in results] == ["one two", "three four"]
+
+
+def test_speech_after_30_seconds_is_translated(mock_translator):
+    asr = FakeStreamingASR([])
+    incremental = IncrementalTranslator(
+        asr,
+        mock_translator,
+        sampling_rate=16000,
+        min_step_seconds=1.0,
+        keep_seconds=2.0,
+    )
+    windows = []
+
+    def transcribe_features(features, language, return_timestamps, prompt, duration):
+        # One sentence per second of the window, named by its stream time
+        windows.append(duration)
+        offset = int(incremental.transcriber._buffer_start / 16000)
+        segments = [
+            {"text": f"t{offset + k}.", "start": float(k), "end": float(k + 1)}
+            for k in range(int(duration))
+        ]
+        return {"text": " ".join(s["text"] for s in segments), "segments": segments}
+
+    asr.transcribe_features = transcribe_features
+
+    results = list(incremental.stream([SECOND] * 40))
+
+    # Committed audio leaves the window, so each pass stays short
+    assert max(windows) <= 4.0
+    assert [r["source_text"] for r in results] == [f"t{i}." for i in range(40)]
+
+
+class FakeStreamingASR:
+    """ASR stand-in that returns scripted segments for each window."""
+
+    def __init__(self, results):
+        self.processor = MagicMock()
+        self.processor.feature_extractor.sampling_rate = 16000
+        self.processor.feature_extractor.mel_filters = np.ones((201, 4))
+        self.results = list(results)
+        self.calls = []
+
+    def transcribe_features(
+        self, features, language, return_timestamps, prompt, duration=None
+    ):
+        self.calls.append(prompt)
+        segments = self.results.pop(0)
+        return {
+            "text": " ".join(s["text"] for s in segments),
+            "segments": segments,
+        }
+
+
+def test_streaming_transcriber_commits_finished_segments():
+    asr = FakeStreamingASR(
+        [
+            [{"text": "Xin chào.", "start": 0.0, "end": 1.0}],
+            [
+                {"text": "Xin chào.", "start": 0.0, "end": 1.0},
+                {"text": "Hôm nay", "start": 1.0, "end": None},
+            ],
+            [{"text": "Hôm nay trời đẹp.", "start": 0.0, "end": 2.5}],
+        ]
+    )
+    transcriber = StreamingTranscriber(asr, sampling_rate=16000, keep_seconds=1.0)
+    second = np.zeros(16000, dtype=np.float32)
+
+    result = transcriber.push(second)
+    assert result["partial_text"] == "Xin chào."
+    assert result["committed_text"] == ""
+
+    result = transcriber.push(second)
+    assert result["new_text"] == "Xin chào."
+    assert result["partial_text"] == "Hôm nay"
+    assert transcriber._buffer_start == 16000
+
+    # No new audio: the previous result is reused without calling the model
+    assert transcriber.push(np.zeros(0, dtype=np.float32)) is result
+    assert len(asr.calls) == 2
+
+    result = transcriber.push(second)
+    assert asr.calls[-1] == "Xin chào."
+    assert result["text"] == "Xin chào. Hôm nay trời đẹp."
+
+    final = transcriber.flush()
+    assert final["committed_text"] == "Xin chào. Hôm nay trời đẹp."
+    assert final["new_text"] == "Hôm nay trời đẹp."
+
+
+def test_streaming_transcriber_converts_int16():
+    asr = FakeStreamingASR([[{"text": "a", "start": 0.0, "end": None}]])
+    transcriber = StreamingTranscriber(asr, sampling_rate=16000)
+
+    transcriber.push(np.full(1600, 16384, dtype=np.int16))
+
+    assert transcriber._buffer.dtype == np.float32
+    assert transcriber._buffer.max() == pytest.approx(0.5, abs=1e-3)
+
+
+def test_streaming_transcriber_resamples_chunks_as_one_stream():
+    asr = FakeStreamingASR([[{"text": "a", "start": 0.0, "end": None}]] * 10)
+    transcriber = StreamingTranscriber(asr, sampling_rate=8000)
+    tone = np.sin(np.arange(8000, dtype=np.float32) * 0.05).astype(np.float32)
+
+    for chunk in np.split(tone, 10):
+        transcriber.push(chunk)
+    transcriber._append(
+        transcriber._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+    )
+
+    # No artifacts at the chunk boundaries: the same as resampling at once
+    expected = soxr.resample(tone, 8000, 16000)
+    assert len(transcriber._buffer) == len(expected)
+    np.testing.assert_allclose(transcriber._buffer, expected, atol=1e-3)
+
+
+def test_transcribe_blocks_fills_windows_before_transcribing():
+    asr = FakeStreamingASR(
+        [
+            [
+                {"text": "first.", "start": 0.0, "end": 20.0},
+                {"text": "second", "start": 20.0, "end": None},
+            ],
+            [{"text": "second part.", "start": 0.0, "end": 15.0}],
+        ]
+    )
+    transcriber = StreamingTranscriber(asr, sampling_rate=16000, keep_seconds=0.0)
+    blocks = [np.zeros(16000 * 10, dtype=np.float32)] * 4
+
+    result = transcriber.transcribe_blocks(blocks)
+
+    # One pass for the first 30 s window and one for the remaining 20 s
+    assert len(asr.calls) == 2
+    assert asr.calls[1] == "first."
+    assert result["committed_text"] == "first. second part."
+
+    # Segment times count from the start of the stream
+    assert result["segments"] == [
+        {"text": "first.", "start": 0.0, "end": 20.0},
+        {"text": "second part.", "start": 20.0, "end": 35.0},
+    ]
+
+
+def test_streaming_transcriber_keeps_the_detected_language():
+    asr = FakeStreamingASR([[{"text": "xin chào", "start": 0.0, "end": 1.0}]] * 2)
+    detections = iter([("vi", 0.9), ("vi", None)])
+    transcribe_features = asr.transcribe_features
+
+    def detecting_transcribe_features(features, language, **kwargs):
+        result = transcribe_features(features, language, **kwargs)
+        detected, probability = next(detections)
+        result["language"] = detected if language == "auto" else language
+        result["language_probability"] = probability if language == "auto" else None
+        asr.languages.append(language)
+        return result
+
+    asr.languages = []
+    asr.transcribe_features = detecting_transcribe_features
+    transcriber = StreamingTranscriber(asr, sampling_rate=16000, language="auto")
+
+    transcriber.push(np.zeros(16000, dtype=np.float32))
+    result = transcriber.push(np.zeros(16000, dtype=np.float32))
+
+    assert asr.languages == ["auto", "vi"]
+    assert result["language"] == "vi"
+    assert result["language_probability"] == 0.9
+
+    transcriber.reset()
+    assert transcriber.language == "auto"
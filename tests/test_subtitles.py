@@ -0,0 +1,57 @@
+import pytest
+
+from translator_by_speech.subtitles import (
+    format_timestamp,
+    render_subtitles,
+    subtitle_path,
+    to_srt,
+    to_vtt,
+)
+
+SEGMENTS = [
+    {
+        "start": 0.0,
+        "end": 2.5,
+        "source_text": "Xin chào.",
+        "translated_text": "Hello.",
+    },
+    {"start": 2.5, "end": 3.0, "source_text": " ", "translated_text": ""},
+    {
+        "start": 3661.25,
+        "end": 3663.0,
+        "source_text": "Tạm biệt.",
+        "translated_text": "Goodbye.",
+    },
+]
+
+
+def test_format_timestamp():
+    assert format_timestamp(0.0) == "00:00:00,000"
+    assert format_timestamp(3661.2504) == "01:01:01,250"
+    assert format_timestamp(59.9996, ".") == "00:01:00.000"
+
+
+def test_to_srt_writes_bilingual_cues_and_skips_empty_segments():
+    assert to_srt(SEGMENTS) == (
+        "1\n00:00:00,000 --> 00:00:02,500\nXin chào.\nHello.\n"
+        "\n"
+        "2\n01:01:01,250 --> 01:01:03,000\nTạm biệt.\nGoodbye.\n"
+    )
+
+
+def test_to_vtt_has_a_header_and_dot_milliseconds():
+    vtt = to_vtt(SEGMENTS)
+
+    assert vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:02.500\n")
+    assert vtt.count("-->") == 2
+
+
+def test_render_subtitles_rejects_unknown_formats():
+    assert render_subtitles(SEGMENTS, "vtt") == to_vtt(SEGMENTS)
+    with pytest.raises(ValueError):
+        render_subtitles(SEGMENTS, "ass")
+
+
+def test_subtitle_path():
+    assert subtitle_path("/a/talk.wav", "srt") == "/a/talk.srt"
+    assert subtitle_path("/a/talk.flac", "vtt", "out") == "out/talk.vtt"
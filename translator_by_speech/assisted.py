@@ -0,0 +1,168 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import torch
+
+
+class AssistedDecoding:
+    """
+    Assisted (speculative) generation with a small draft model.
+
+    The draft model proposes a few tokens and the main model checks all of
+    them in one forward pass, keeping the prefix it agrees with plus its own
+    next token. Decoding stays greedy, so the output is identical to the main
+    model decoding alone; only the number of main-model passes changes.
+
+    The draft model must share the main model's vocabulary.
+    """
+
+    def __init__(
+        self,
+        draft_model: torch.nn.Module,
+        compare_every: int = 0,
+        num_assistant_tokens: Optional[int] = None,
+    ):
+        """
+        Initialize assisted decoding.
+
+        Args:
+            draft_model: Small model proposing tokens for the main model
+            compare_every: Also decode every n-th call without the draft model
+                to measure the speedup and check the output is identical (0 to disable)
+            num_assistant_tokens: Tokens the draft proposes per step (adapted
+                from the acceptance rate by transformers if None)
+        """
+        if compare_every < 0:
+            raise ValueError("compare_every must be 0 or positive")
+
+        self.draft_model = draft_model
+        self.compare_every = compare_every
+        if num_assistant_tokens:
+            self.draft_model.generation_config.num_assistant_tokens = (
+                num_assistant_tokens
+            )
+
+        # Forward hooks share counters, so assisted calls run one at a time
+        self._lock = threading.Lock()
+        self._drafted = 0
+
+        self.stats = {
+            "calls": 0,
+            "verify_passes": 0,
+            "draft_tokens": 0,
+            "accepted_tokens": 0,
+            "seconds": 0.0,
+            "compared": 0,
+            "mismatches": 0,
+            "compared_seconds": 0.0,
+            "baseline_seconds": 0.0,
+        }
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Fraction of draft tokens the main model accepted."""
+        return self.stats["accepted_tokens"] / max(self.stats["draft_tokens"], 1)
+
+    @property
+    def tokens_per_pass(self) -> float:
+        """Tokens produced per main-model forward pass (1.0 without a draft)."""
+        passes = self.stats["verify_passes"]
+        return (self.stats["accepted_tokens"] + passes) / max(passes, 1)
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """Wall-clock speedup over decoding without the draft, if measured."""
+        if not self.stats["compared"] or not self.stats["compared_seconds"]:
+            return None
+        return self.stats["baseline_seconds"] / self.stats["compared_seconds"]
+
+    def generate(self, model: torch.nn.Module, **generate_kwargs) -> Any:
+        """
+        Run model.generate with the draft model.
+
+        Args:
+            model: Main model
+            **generate_kwargs: Arguments for model.generate (greedy decoding)
+
+        Returns:
+            Output of model.generate
+        """
+        with self._lock:
+            self._drafted = 0
+            hooks = [
+                model.register_forward_hook(self._on_verify, with_kwargs=True),
+                self.draft_model.register_forward_hook(self._on_draft),
+            ]
+            start = time.perf_counter()
+            try:
+                outputs = model.generate(
+                    assistant_model=self.draft_model, **generate_kwargs
+                )
+            finally:
+                for hook in hooks:
+                    hook.remove()
+            elapsed = time.perf_counter() - start
+
+            self.stats["calls"] += 1
+            self.stats["seconds"] += elapsed
+            if self.compare_every and self.stats["calls"] % self.compare_every == 0:
+                self._compare(model, generate_kwargs, outputs, elapsed)
+
+        return outputs
+
+    def _compare(
+        self,
+        model: torch.nn.Module,
+        generate_kwargs: Dict[str, Any],
+        outputs: Any,
+        elapsed: float,
+    ) -> None:
+        """Decode again without the draft model and record time and agreement."""
+        start = time.perf_counter()
+        baseline = model.generate(**generate_kwargs)
+        self.stats["baseline_seconds"] += time.perf_counter() - start
+        self.stats["compared_seconds"] += elapsed
+        self.stats["compared"] += 1
+
+        if baseline.shape != outputs.shape or not torch.equal(baseline, outputs):
+            self.stats["mismatches"] += 1
+            print("Warning: assisted decoding output differs from the main model")
+
+    def _on_draft(self, module: torch.nn.Module, args: Any, output: Any) -> None:
+        """Count one proposed token per draft forward pass."""
+        self._drafted += 1
+
+    def _on_verify(
+        self, module: torch.nn.Module, args: Any, kwargs: Dict[str, Any], output: Any
+    ) -> None:
+        """Count the draft tokens the main model agreed with in this pass."""
+        drafted, self._drafted = self._drafted, 0
+        self.stats["verify_passes"] += 1
+
+        input_ids = kwargs.get("decoder_input_ids")
+        if input_ids is None:
+            input_ids = kwargs.get("input_ids")
+        if not drafted or input_ids is None or output.logits.shape[1] <= drafted:
+            return
+
+        # Accepted tokens are the drafts up to the main model's first disagreement
+        predicted = output.logits[0, -drafted - 1 : -1].argmax(-1)
+        agrees = predicted == input_ids[0, -drafted:]
+        self.stats["draft_tokens"] += drafted
+        self.stats["accepted_tokens"] += int(agrees.int().cumprod(0).sum())
+
+
+def format_assisted_stats(assisted: AssistedDecoding) -> str:
+    """Human-readable summary of assisted decoding stats."""
+    stats = assisted.stats
+    summary = (
+        f"{stats['calls']} calls, acceptance {assisted.acceptance_rate:.0%}, "
+        f"{assisted.tokens_per_pass:.2f} tokens per pass"
+    )
+    if assisted.speedup is not None:
+        summary += (
+            f", speedup {assisted.speedup:.2f}x over {stats['compared']} "
+            f"compared calls ({stats['mismatches']} mismatches)"
+        )
+    return summary
@@ -0,0 +1,105 @@
+import queue
+import threading
+from typing import Iterable, Iterator, Optional, TypeVar
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+T = TypeVar("T")
+
+# Marks the end of a prefetched iterable
+_END = object()
+
+
+def iter_audio_blocks(
+    file_path: str,
+    target_rate: Optional[int] = None,
+    block_seconds: float = 10.0,
+) -> Iterator[np.ndarray]:
+    """
+    Read an audio file block by block as mono float32.
+
+    Each block is downmixed and resampled on its own, with a streaming
+    resampler so block boundaries do not cause artifacts. Memory use depends
+    on the block size, not on the length of the file.
+
+    Args:
+        file_path: Path to the audio file
+        target_rate: Output sampling rate (defaults to the file's rate)
+        block_seconds: Duration of each block read from the file
+
+    Yields:
+        Mono float32 blocks at ``target_rate``
+    """
+    with sf.SoundFile(file_path) as f:
+        target_rate = target_rate or f.samplerate
+        resampler = None
+        if target_rate != f.samplerate:
+            resampler = soxr.ResampleStream(
+                f.samplerate, target_rate, 1, dtype="float32"
+            )
+
+        blocksize = max(1, int(block_seconds * f.samplerate))
+        for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+            # Convert to mono if stereo
+            mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono)
+            if len(mono):
+                yield mono
+
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            if len(tail):
+                yield tail
+
+
+def prefetch(iterable: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Produce items of an iterable on a background thread.
+
+    Up to ``depth`` items are read ahead, so decoding overlaps with whatever
+    the consumer does with the previous item. Exceptions raised by the
+    producer are re-raised in the consumer.
+
+    Args:
+        iterable: Iterable to read ahead
+        depth: Maximum number of items buffered
+
+    Yields:
+        Items of ``iterable`` in order
+    """
+    items: "queue.Queue" = queue.Queue(depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                items.put(item)
+            items.put(_END)
+        except BaseException as e:
+            items.put(e)
+
+    thread = threading.Thread(target=produce, name="audio-prefetch", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stop.set()
+        while thread.is_alive():
+            try:
+                items.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.01)
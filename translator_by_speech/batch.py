@@ -0,0 +1,237 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Audio files picked up when a directory is processed
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3")
+
+
+def collect_audio_files(paths: List[str]) -> List[str]:
+    """
+    Audio files given directly or found in the given directories.
+
+    Args:
+        paths: Audio files or directories containing audio files
+
+    Returns:
+        Existing audio file paths, directory contents in sorted order
+    """
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.lower().endswith(AUDIO_EXTENSIONS)
+            )
+        elif os.path.exists(path):
+            file_paths.append(path)
+        else:
+            print(f"Error: File not found: {path}")
+    return file_paths
+
+
+class AudioPrefetcher:
+    """
+    Decodes upcoming audio files on a thread pool while the model is busy.
+
+    Up to ``depth`` files are decoded ahead of the consumer. The number of
+    decoded files waiting when the consumer asks for the next one (queue
+    depth) and the time it had to wait for decoding (stall time) are recorded
+    in ``stats`` so the pipeline can be tuned: a stall time near zero means
+    decoding keeps up, a depth that stays at zero means more workers or a
+    larger depth are needed.
+    """
+
+    def __init__(
+        self,
+        file_paths: Iterable[str],
+        load_fn: Callable[[str], Any],
+        workers: int = 2,
+        depth: int = 8,
+    ):
+        """
+        Initialize the prefetcher. Decoding starts when iteration starts.
+
+        Args:
+            file_paths: Audio files in processing order
+            load_fn: Function decoding one file, e.g. ASRModel.load_audio_file
+            workers: Number of decoding threads
+            depth: Maximum number of files decoded ahead of the consumer
+        """
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+
+        self.file_paths = file_paths
+        self.load_fn = load_fn
+        self.workers = workers
+        self.depth = depth
+
+        self.stats = {
+            "files": 0,
+            "errors": 0,
+            "stall_seconds": 0.0,
+            "queue_depth_total": 0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """Average number of decoded files waiting when one was requested."""
+        return self.stats["queue_depth_total"] / max(self.stats["files"], 1)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Yield decoded files in order.
+
+        Yields:
+            Tuples of (file path, load_fn result, exception or None)
+        """
+        paths = iter(self.file_paths)
+        window: "deque[Tuple[str, Future]]" = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="audio-prefetch"
+        ) as executor:
+
+            def fill() -> None:
+                while len(window) < self.depth:
+                    path = next(paths, None)
+                    if path is None:
+                        return
+                    window.append((path, executor.submit(self.load_fn, path)))
+
+            try:
+                fill()
+                while window:
+                    ready = sum(future.done() for _, future in window)
+                    path, future = window.popleft()
+
+                    start = time.perf_counter()
+                    error = future.exception()
+                    self.stats["stall_seconds"] += time.perf_counter() - start
+                    self.stats["files"] += 1
+                    self.stats["queue_depth_total"] += ready
+                    self.stats["max_queue_depth"] = max(
+                        self.stats["max_queue_depth"], ready
+                    )
+
+                    # Keep the pool busy before handing the file to the consumer
+                    fill()
+
+                    if error is not None:
+                        self.stats["errors"] += 1
+                        yield path, None, error
+                    else:
+                        yield path, future.result(), None
+            finally:
+                for _, future in window:
+                    future.cancel()
+
+
+class OutputWriter:
+    """Writes output files on a background thread so inference is not blocked."""
+
+    def __init__(self, encoding: str = "utf-8"):
+        """
+        Initialize the writer.
+
+        Args:
+            encoding: Text encoding of written files
+        """
+        self.encoding = encoding
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="output-writer"
+        )
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+        self.stats = {"written": 0, "errors": 0}
+
+    @property
+    def pending(self) -> int:
+        """Number of writes that have not finished yet."""
+        with self._lock:
+            return sum(not future.done() for future in self._futures)
+
+    def write_text(self, file_path: str, text: str) -> Future:
+        """
+        Queue a text file to be written.
+
+        Args:
+            file_path: Destination path (parent directories are created)
+            text: File contents
+
+        Returns:
+            Future that completes when the file is written
+        """
+        future = self._executor.submit(self._write, file_path, text)
+        with self._lock:
+            # Forget finished writes so the list does not grow without bound
+            self._futures = [f for f in self._futures if not f.done()]
+            self._futures.append(future)
+        return future
+
+    def flush(self) -> List[Exception]:
+        """
+        Wait for all queued writes.
+
+        Returns:
+            Exceptions raised by writes that failed
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        return [e for e in (future.exception() for future in futures) if e]
+
+    def close(self) -> List[Exception]:
+        """Wait for all queued writes and stop the writer thread."""
+        errors = self.flush()
+        self._executor.shutdown(wait=True)
+        return errors
+
+    def _write(self, file_path: str, text: str) -> None:
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(file_path, "w", encoding=self.encoding) as f:
+                f.write(text)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self.stats["written"] += 1
+
+
+def batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """
+    Group an iterable into lists of at most ``batch_size`` items.
+
+    Args:
+        items: Items to group
+        batch_size: Maximum number of items per list
+
+    Yields:
+        Lists of consecutive items
+    """
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def format_prefetch_stats(stats: Dict[str, Any]) -> str:
+    """Human-readable summary of AudioPrefetcher stats."""
+    files = max(stats["files"], 1)
+    return (
+        f"{stats['files']} files, {stats['errors']} decode errors, "
+        f"stall {stats['stall_seconds']:.2f}s, "
+        f"mean queue depth {stats['queue_depth_total'] / files:.1f} "
+        f"(max {stats['max_queue_depth']})"
+    )
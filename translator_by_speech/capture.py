@@ -0,0 +1,192 @@
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import numpy as np
+
+# PortAudio values (pyaudio.paInt16, pyaudio.paContinue, pyaudio.paInputOverflow),
+# kept here so the module can be used and tested with a fake audio backend
+PA_INT16 = 8
+PA_CONTINUE = 0
+PA_INPUT_OVERFLOW = 0x2
+
+
+class CallbackCapture:
+    """
+    Non-blocking microphone capture using PyAudio's callback mode.
+
+    PortAudio delivers each buffer on its own thread; the callback only wraps
+    the bytes in a NumPy array and puts it on a bounded queue, so the calling
+    thread is free while recording. Frames are consumed with ``frames()``
+    (generator) or ``async for`` (async iterator). Input overflows reported by
+    PortAudio and frames dropped because the consumer fell behind are counted.
+    """
+
+    def __init__(
+        self,
+        audio: Optional[Any] = None,
+        rate: int = 16000,
+        channels: int = 1,
+        chunk: int = 1024,
+        max_queue: int = 64,
+    ):
+        """
+        Initialize the capture. The stream is opened by start().
+
+        Args:
+            audio: PyAudio instance (or a compatible fake); created if None
+            rate: Sampling rate in Hz
+            channels: Number of input channels
+            chunk: Number of frames per buffer
+            max_queue: Maximum number of buffers waiting for the consumer
+        """
+        if audio is None:
+            import pyaudio
+
+            audio = pyaudio.PyAudio()
+
+        self.audio = audio
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+        self.max_queue = max_queue
+
+        self.overflows = 0
+        self.dropped = 0
+
+        self._stream = None
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(max_queue)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_queue: Optional["asyncio.Queue[Optional[np.ndarray]]"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the stream is open and capturing."""
+        return self._stream is not None
+
+    def start(self) -> "CallbackCapture":
+        """Open the input stream and start capturing."""
+        with self._lock:
+            if self._stream is None:
+                self._stream = self.audio.open(
+                    format=PA_INT16,
+                    channels=self.channels,
+                    rate=self.rate,
+                    input=True,
+                    frames_per_buffer=self.chunk,
+                    stream_callback=self._callback,
+                )
+                self._stream.start_stream()
+        return self
+
+    def stop(self) -> None:
+        """Stop capturing and end the frame iterators."""
+        with self._lock:
+            stream, self._stream = self._stream, None
+
+        if stream is None:
+            return
+
+        stream.stop_stream()
+        stream.close()
+        self._deliver(None)
+
+    def __enter__(self) -> "CallbackCapture":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def frames(self, timeout: Optional[float] = None) -> Iterator[np.ndarray]:
+        """
+        Yield captured buffers until the capture is stopped.
+
+        Args:
+            timeout: Seconds to wait for a buffer before giving up (None waits forever)
+
+        Yields:
+            int16 arrays of shape (chunk,) for mono or (chunk, channels)
+        """
+        while True:
+            try:
+                frame = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if frame is None:
+                return
+            yield frame
+
+    async def __aiter__(self) -> AsyncIterator[np.ndarray]:
+        """Asynchronously yield captured buffers until the capture is stopped."""
+        # Switch delivery to the asyncio queue and hand over buffers that
+        # arrived before iteration started; the lock keeps the audio thread
+        # from putting a buffer on the sync queue after it was drained
+        with self._lock:
+            self._async_queue = asyncio.Queue(self.max_queue)
+            self._loop = asyncio.get_running_loop()
+            while True:
+                try:
+                    frame = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._put_async(frame)
+
+        try:
+            while True:
+                frame = await self._async_queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            with self._lock:
+                self._loop = None
+                self._async_queue = None
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: runs on the audio thread and must not block."""
+        if status & PA_INPUT_OVERFLOW:
+            self.overflows += 1
+
+        frame = np.frombuffer(in_data, dtype=np.int16)
+        if self.channels > 1:
+            frame = frame.reshape(-1, self.channels)
+
+        self._deliver(frame)
+        return None, PA_CONTINUE
+
+    def _deliver(self, frame: Optional[np.ndarray]) -> None:
+        """Route a buffer (or the end marker) to the active consumer."""
+        with self._lock:
+            loop = self._loop
+            if loop is not None:
+                try:
+                    loop.call_soon_threadsafe(self._put_async, frame)
+                    return
+                except RuntimeError:
+                    # The event loop is closed; fall back to the sync queue
+                    pass
+
+            self._offer(self._queue, frame, queue.Full)
+
+    def _put_async(self, frame: Optional[np.ndarray]) -> None:
+        """Put a buffer on the asyncio queue (runs on the event loop thread)."""
+        if self._async_queue is None:
+            self._offer(self._queue, frame, queue.Full)
+        else:
+            self._offer(self._async_queue, frame, asyncio.QueueFull)
+
+    def _offer(self, target, frame: Optional[np.ndarray], full_error: type) -> None:
+        """Put without blocking, counting dropped buffers when the queue is full."""
+        try:
+            target.put_nowait(frame)
+        except full_error:
+            if frame is None:
+                # Make room so the end marker always arrives
+                evicted = target.get_nowait()
+                target.put_nowait(None)
+                if evicted is not None:
+                    self.dropped += 1
+            else:
+                self.dropped += 1
@@ -1,13 +1,40 @@
 import argparse
 import os
 import sys
+import time
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
 
 # Import our custom modules
 # Assuming these modules are in the same directory or properly installed
 try:
+    from translator_by_speech.assisted import format_assisted_stats
+    from translator_by_speech.batch import (
+        OutputWriter,
+        collect_audio_files,
+        format_prefetch_stats,
+    )
+    from translator_by_speech.client import (
+        DEFAULT_SOCKET_PATH,
+        ModelClient,
+        model_settings,
+    )
+    from translator_by_speech.decoding import DECODING_PROFILES
+    from translator_by_speech.runtime import (
+        DEFAULT_RUNTIME_CONFIG,
+        RuntimeConfig,
+        autotune,
+        candidate_configs,
+    )
     from translator_by_speech.record import AudioRecorder
+    from translator_by_speech.results import (
+        DEFAULT_RESULTS_DB,
+        ResultStore,
+        legacy_txt_files,
+        model_version,
+    )
     from translator_by_speech.speech_recognition import ASRModel
     from translator_by_speech.translator import (
         create_vi2en_translator,
@@ -15,6 +42,16 @@ try:
         TranslationModel,
     )
     from translator_by_speech.pipeline import SpeechTranslationPipeline
+    from translator_by_speech.segmentation import translate_segmented
+    from translator_by_speech.speculative import (
+        SpeculativeTranscriber,
+        format_speculative_stats,
+    )
+    from translator_by_speech.subtitles import (
+        SUBTITLE_FORMATS,
+        render_subtitles,
+        subtitle_path,
+    )
 except ImportError:
     print("Error: Required modules not found.")
     print(
@@ -26,8 +63,40 @@ except ImportError:
 class TranslationCLI:
     """Command Line Interface for audio recording, transcription and translation."""
 
-    def __init__(self):
-        """Initialize the CLI application with all required components."""
+    def __init__(
+        self,
+        decoding_profile: str = "balanced",
+        latency_budget: Optional[float] = None,
+        glossaries: Optional[Dict[str, str]] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        draft_models: Optional[Dict[str, str]] = None,
+        assisted_compare_every: int = 0,
+        results_db: str = DEFAULT_RESULTS_DB,
+        write_txt: bool = False,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        use_daemon: bool = True,
+        early_asr: bool = False,
+    ):
+        """
+        Initialize the CLI application with all required components.
+
+        Args:
+            decoding_profile: Decoding profile ("fast", "balanced" or "quality")
+            latency_budget: Seconds a translation call may take (narrows the beam)
+            glossaries: Glossary TSV paths keyed by direction ("vi2en", "en2vi")
+            runtime: Threading and execution settings shared by all models
+            draft_models: Draft models for assisted decoding keyed by model
+                ("asr", "vi2en", "en2vi")
+            assisted_compare_every: Also decode every n-th assisted call
+                without the draft to measure the speedup (0 to disable)
+            results_db: SQLite database results are appended to
+            write_txt: Also write the legacy per-file text files to transcripts/
+            socket_path: Unix socket of a running model server
+            use_daemon: Send requests to the model server if one is running,
+                instead of loading the models in this process
+            early_asr: In 'speak' mode, start transcribing when speech pauses
+                instead of after the silence that ends the recording
+        """
         # Initialize audio recorder
         self.recorder = AudioRecorder(output_directory="recordings")
 
@@ -37,6 +106,15 @@ class TranslationCLI:
         self._en2vi_translator = None
         self._vi2en_pipeline = None
         self._en2vi_pipeline = None
+        self._auto_pipeline = None
+
+        # Decoding settings applied when the models are loaded
+        self.decoding_profile = decoding_profile
+        self.latency_budget = latency_budget
+        self.glossaries = glossaries or {}
+        self.runtime = runtime or RuntimeConfig()
+        self.draft_models = draft_models or {}
+        self.assisted_compare_every = assisted_compare_every
 
         # Default language settings
         self.source_lang = "vi"
@@ -46,6 +124,43 @@ class TranslationCLI:
         os.makedirs("recordings", exist_ok=True)
         os.makedirs("transcripts", exist_ok=True)
 
+        # Results are appended to one indexed store; text files are optional
+        self.store = ResultStore(results_db)
+        self.write_txt = write_txt
+
+        # Output files are written in the background so inference is not blocked
+        self.writer = OutputWriter()
+        self._closed = False
+
+        # Utterances are transcribed speculatively while the recorder waits for silence
+        self.early_asr = (
+            SpeculativeTranscriber(self._transcribe_samples) if early_asr else None
+        )
+
+        # Models already loaded by a model server are used instead of local ones
+        self.client = ModelClient.connect(socket_path) if use_daemon else None
+        if self.client is not None:
+            mismatches = self.client.mismatched_settings(
+                model_settings(
+                    decoding_profile=self.decoding_profile,
+                    latency_budget=self.latency_budget,
+                    glossaries=self.glossaries,
+                    runtime=self.runtime.to_dict(),
+                    draft_models=self.draft_models,
+                    assisted_compare_every=self.assisted_compare_every,
+                )
+            )
+            if mismatches:
+                print(
+                    f"Model server at {socket_path} runs with different settings; "
+                    "loading the models in this process instead:"
+                )
+                for mismatch in mismatches:
+                    print(f"  - {mismatch}")
+                self.client = None
+            else:
+                print(f"Using model server at {socket_path}")
+
         print("Translation CLI initialized. Type 'help' for available commands.")
 
     @property
@@ -53,7 +168,13 @@ class TranslationCLI:
         """Lazy-loaded ASR model."""
         if self._asr_model is None:
             print("Loading ASR model (this may take a moment)...")
-            self._asr_model = ASRModel(model_id="suzii/vi-whisper-large-v3-turbo-v1")
+            self._asr_model = ASRModel(
+                model_id="suzii/vi-whisper-large-v3-turbo-v1",
+                decoding_profile=self.decoding_profile,
+                runtime=self.runtime,
+                draft_model_id=self.draft_models.get("asr"),
+                assisted_compare_every=self.assisted_compare_every,
+            )
         return self._asr_model
 
     @property
@@ -61,7 +182,14 @@ class TranslationCLI:
         """Lazy-loaded Vietnamese to English translator."""
         if self._vi2en_translator is None:
             print("Loading Vietnamese to English translation model...")
-            self._vi2en_translator = create_vi2en_translator()
+            self._vi2en_translator = create_vi2en_translator(
+                decoding_profile=self.decoding_profile,
+                latency_budget=self.latency_budget,
+                glossary=self.glossaries.get("vi2en"),
+                runtime=self.runtime,
+                draft_model=self.draft_models.get("vi2en"),
+                assisted_compare_every=self.assisted_compare_every,
+            )
         return self._vi2en_translator
 
     @property
@@ -69,7 +197,14 @@ class TranslationCLI:
         """Lazy-loaded English to Vietnamese translator."""
         if self._en2vi_translator is None:
             print("Loading English to Vietnamese translation model...")
-            self._en2vi_translator = create_en2vi_translator()
+            self._en2vi_translator = create_en2vi_translator(
+                decoding_profile=self.decoding_profile,
+                latency_budget=self.latency_budget,
+                glossary=self.glossaries.get("en2vi"),
+                runtime=self.runtime,
+                draft_model=self.draft_models.get("en2vi"),
+                assisted_compare_every=self.assisted_compare_every,
+            )
         return self._en2vi_translator
 
     @property
@@ -96,6 +231,17 @@ class TranslationCLI:
             )
         return self._en2vi_pipeline
 
+    @property
+    def auto_pipeline(self) -> SpeechTranslationPipeline:
+        """Lazy-loaded pipeline that detects the spoken language of each input."""
+        if self._auto_pipeline is None:
+            self._auto_pipeline = SpeechTranslationPipeline(
+                asr_model=self.asr_model,
+                source_lang="auto",
+                translators={"vi": self.vi2en_translator, "en": self.en2vi_translator},
+            )
+        return self._auto_pipeline
+
     def record_audio(
         self, duration: Optional[int] = None, silence_detection: bool = True
     ) -> str:
@@ -139,19 +285,20 @@ class TranslationCLI:
         """
         try:
             print(f"Transcribing audio file: {file_path}")
-            result = self.asr_model.transcribe_audio_file(
-                file_path, language=self.source_lang
-            )
-
-            # Save transcript to file
-            transcript_path = os.path.join(
-                "transcripts", os.path.basename(file_path).replace(".wav", ".txt")
-            )
-
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(result["text"])
+            if self.client is not None:
+                result = self.client.transcribe_file(file_path, self.source_lang)
+            else:
+                start = time.perf_counter()
+                result = self.asr_model.transcribe_audio_file(
+                    file_path, language=self.source_lang
+                )
+                result = {
+                    **result,
+                    "timings": {"asr_seconds": time.perf_counter() - start},
+                    "models": {"asr": model_version(self.asr_model)},
+                }
 
-            print(f"Transcript saved to: {transcript_path}")
+            self._save_results(file_path, result)
             return result
 
         except Exception as e:
@@ -169,10 +316,17 @@ class TranslationCLI:
             Translated text
         """
         try:
-            if self.source_lang == "vi" and self.target_lang == "en":
-                translation = self.vi2en_translator.translate(text)
+            if self.source_lang == "auto":
+                print("Language detection needs audio; set the languages with 'lang'")
+                return ""
+            elif self.client is not None:
+                translation = self.client.translate_text(
+                    text, self.source_lang, self.target_lang
+                )
+            elif self.source_lang == "vi" and self.target_lang == "en":
+                translation = translate_segmented(self.vi2en_translator.translate, text)
             elif self.source_lang == "en" and self.target_lang == "vi":
-                translation = self.en2vi_translator.translate(text)
+                translation = translate_segmented(self.en2vi_translator.translate, text)
             else:
                 print(
                     f"Unsupported language pair: {self.source_lang} → {self.target_lang}"
@@ -200,44 +354,201 @@ class TranslationCLI:
                 print(f"Error: File not found: {file_path}")
                 return {}
 
-            # Choose the appropriate pipeline based on source/target languages
-            if self.source_lang == "vi" and self.target_lang == "en":
-                pipeline = self.vi2en_pipeline
-            elif self.source_lang == "en" and self.target_lang == "vi":
-                pipeline = self.en2vi_pipeline
-            else:
-                print(
-                    f"Unsupported language pair: {self.source_lang} → {self.target_lang}"
+            # Process through the model server or the local pipeline
+            if self.client is not None:
+                print(f"Processing audio file: {file_path}")
+                result = self.client.process_file(
+                    file_path, self.source_lang, self.target_lang
                 )
-                return {}
+            else:
+                pipeline = self._select_pipeline()
+                if pipeline is None:
+                    return {}
+
+                print(f"Processing audio file: {file_path}")
+                result = pipeline.translate_speech_from_file(file_path)
+
+            self._save_results(file_path, result)
+            return result
 
-            # Process through pipeline
-            print(f"Processing audio file: {file_path}")
-            result = pipeline.translate_speech_from_file(file_path)
+        except Exception as e:
+            print(f"Error processing audio file: {str(e)}")
+            return {}
 
-            # Save results to files
-            basename = os.path.basename(file_path).replace(".wav", "")
+    def process_audio_files(
+        self, paths: List[str], batch_size: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many audio files, decoding upcoming files while the models run.
+
+        Args:
+            paths: Audio files or directories containing audio files
+            batch_size: Maximum number of files per ASR batch
 
-            # Save transcript
-            transcript_path = os.path.join("transcripts", f"{basename}_transcript.txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(result["source_text"])
+        Returns:
+            List of result dictionaries, one per processed file
+        """
+        file_paths = self.collect_audio_files(paths)
+        if not file_paths:
+            return []
+
+        if self.client is not None:
+            # Files go in batched requests, so the server batches them
+            print(f"Processing {len(file_paths)} audio files...")
+            prefetch_stats: Optional[Dict[str, Any]] = {}
+            file_results = self.client.process_files(
+                file_paths,
+                self.source_lang,
+                self.target_lang,
+                batch_size=batch_size,
+                prefetch_stats=prefetch_stats,
+            )
+        else:
+            pipeline = self._select_pipeline()
+            if pipeline is None:
+                return []
 
-            # Save translation
-            translation_path = os.path.join(
-                "transcripts", f"{basename}_translation.txt"
+            print(f"Processing {len(file_paths)} audio files...")
+            file_results = pipeline.translate_speech_from_files(
+                file_paths, batch_size=batch_size
             )
-            with open(translation_path, "w", encoding="utf-8") as f:
-                f.write(result["translated_text"])
+            prefetch_stats = None
+
+        results = []
+        for result in file_results:
+            if "error" in result:
+                print(f"Error processing {result['file_path']}: {result['error']}")
+                continue
+
+            self._save_results(result["file_path"], result)
+            self._print_detected_language(result)
+            results.append(result)
+
+        if prefetch_stats is None:
+            # Complete once the generator is exhausted
+            prefetch_stats = pipeline.prefetch_stats
+        if prefetch_stats:
+            print(f"Decoding: {format_prefetch_stats(prefetch_stats)}")
+        print(f"Pending writes: {self.writer.pending}")
+        return results
+
+    def export_subtitles(
+        self, file_path: str, subtitle_format: str = "srt"
+    ) -> Optional[str]:
+        """
+        Transcribe an audio file with timestamps and write bilingual subtitles.
 
-            print(f"Transcript saved to: {transcript_path}")
-            print(f"Translation saved to: {translation_path}")
+        Args:
+            file_path: Path to audio file
+            subtitle_format: "srt" or "vtt"
 
-            return result
+        Returns:
+            Path of the subtitle file, or None if processing failed
+        """
+        try:
+            if not os.path.exists(file_path):
+                print(f"Error: File not found: {file_path}")
+                return None
+
+            if self.client is not None:
+                print(f"Subtitling audio file: {file_path}")
+                result = self.client.process_file(
+                    file_path, self.source_lang, self.target_lang, subtitles=True
+                )
+            else:
+                pipeline = self._select_pipeline()
+                if pipeline is None:
+                    return None
+
+                print(f"Subtitling audio file: {file_path}")
+                result = pipeline.translate_speech_segments_from_file(file_path)
+            output_path = subtitle_path(file_path, subtitle_format, "transcripts")
+            self.writer.write_text(
+                output_path, render_subtitles(result["segments"], subtitle_format)
+            )
+            self.store.add(file_path, result)
+
+            print(f"{len(result['segments'])} subtitles saved to: {output_path}")
+            return output_path
 
         except Exception as e:
-            print(f"Error processing audio file: {str(e)}")
-            return {}
+            print(f"Error subtitling audio file: {str(e)}")
+            return None
+
+    @staticmethod
+    def collect_audio_files(paths: List[str]) -> List[str]:
+        """Audio files given directly or found in the given directories."""
+        return collect_audio_files(paths)
+
+    def _select_pipeline(self) -> Optional[SpeechTranslationPipeline]:
+        """Choose the appropriate pipeline based on source/target languages."""
+        if self.source_lang == "auto":
+            return self.auto_pipeline
+        elif self.source_lang == "vi" and self.target_lang == "en":
+            return self.vi2en_pipeline
+        elif self.source_lang == "en" and self.target_lang == "vi":
+            return self.en2vi_pipeline
+
+        print(f"Unsupported language pair: {self.source_lang} → {self.target_lang}")
+        return None
+
+    def _save_results(self, file_path: str, result: Dict[str, Any]) -> None:
+        """Append the result of an audio file to the store (and the text files)."""
+        self.store.add(file_path, result)
+        print(f"Result stored in: {self.store.db_path}")
+
+        if not self.write_txt:
+            return
+
+        files = legacy_txt_files(
+            file_path,
+            result.get("source_text", result.get("text", "")),
+            result.get("translated_text"),
+        )
+        for file_name, text in files:
+            output_path = os.path.join("transcripts", file_name)
+            self.writer.write_text(output_path, text)
+            print(f"Saved to: {output_path}")
+
+    def lookup_result(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the stored result of an audio file, by content first and then by path.
+
+        Args:
+            file_path: Path to audio file
+
+        Returns:
+            Latest stored record, or None
+        """
+        record = None
+        if os.path.exists(file_path):
+            record = self.store.lookup_hash(self.store.file_hash(file_path))
+        return record or self.store.lookup_path(file_path)
+
+    def _print_detected_language(self, result: Dict[str, Any]) -> None:
+        """Print the detected language and its confidence in auto mode."""
+        if result.get("language_probability") is not None:
+            print(
+                f"Detected language: {result['source_lang']} "
+                f"({result['language_probability']:.0%} confidence) "
+                f"→ {result['target_lang']}"
+            )
+
+    def close(self) -> None:
+        """
+        Wait for queued output files to be written and close the store.
+
+        Safe to call more than once; later calls do nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.early_asr is not None:
+            self.early_asr.close()
+        for error in self.writer.close():
+            print(f"Error writing output: {str(error)}")
+        self.store.close()
 
     def record_and_process(self) -> Dict[str, Any]:
         """
@@ -246,14 +557,61 @@ class TranslationCLI:
         Returns:
             Dictionary with results
         """
-        file_path = self.record_audio(silence_detection=True)
-        if not file_path:
+        if self.early_asr is None or self.client is not None:
+            file_path = self.record_audio(silence_detection=True)
+            if not file_path:
+                return {}
+            return self.process_audio_file(file_path)
+
+        pipeline = self._select_pipeline()
+        if pipeline is None:
+            return {}
+
+        try:
+            print("Recording... (speak now, will stop after silence)")
+            file_path = self.recorder.record_until_silence(
+                silence_threshold=500,
+                silence_duration=1.5,
+                max_duration=60,
+                on_pause=self.early_asr.start,
+                on_resume=self.early_asr.cancel,
+            )
+        except Exception as e:
+            self.early_asr.cancel()
+            print(f"Error during recording: {str(e)}")
+            return {}
+
+        # Fall back to the whole recording if it ended while speaking
+        early = self.early_asr.result()
+        if early is None:
+            return self.process_audio_file(file_path)
+
+        try:
+            result = pipeline.translate_transcription(*early)
+            self._save_results(file_path, result)
+            return result
+
+        except Exception as e:
+            print(f"Error processing audio file: {str(e)}")
             return {}
 
-        return self.process_audio_file(file_path)
+    def _transcribe_samples(self, samples: np.ndarray) -> Dict[str, Any]:
+        """Transcribe recorded int16 samples with the selected pipeline."""
+        pipeline = self._select_pipeline()
+        if pipeline is None:
+            raise ValueError(
+                f"Unsupported language pair: {self.source_lang} → {self.target_lang}"
+            )
+        return pipeline.asr_model.transcribe_pcm(
+            samples, self.recorder.rate, language=pipeline.source_lang
+        )
 
     def switch_languages(self) -> None:
         """Switch source and target languages."""
+        if self.source_lang == "auto":
+            print("The source language is detected automatically; nothing to switch")
+            return
+
         self.source_lang, self.target_lang = self.target_lang, self.source_lang
         print(f"Languages switched: {self.source_lang} → {self.target_lang}")
 
@@ -262,9 +620,15 @@ class TranslationCLI:
         Set source and target languages.
 
         Args:
-            source: Source language code ('en' or 'vi')
-            target: Target language code ('en' or 'vi')
+            source: Source language code ('en', 'vi' or 'auto')
+            target: Target language code ('en' or 'vi'; ignored for 'auto')
         """
+        if source == "auto":
+            # Vietnamese audio is translated to English and vice versa
+            self.source_lang = self.target_lang = "auto"
+            print("Languages set to: auto (vi → en, en → vi)")
+            return
+
         if source not in ["en", "vi"] or target not in ["en", "vi"]:
             print("Error: Supported languages are 'en' (English) and 'vi' (Vietnamese)")
             return
@@ -273,6 +637,78 @@ class TranslationCLI:
         self.target_lang = target
         print(f"Languages set to: {self.source_lang} → {self.target_lang}")
 
+    def autotune(
+        self, output_path: str = DEFAULT_RUNTIME_CONFIG, try_compile: bool = False
+    ) -> RuntimeConfig:
+        """
+        Benchmark runtime settings on this host and save the fastest.
+
+        The workload transcribes five seconds of synthetic audio and translates
+        a few sentences with the current language setting.
+
+        Args:
+            output_path: JSON file the best settings are written to
+            try_compile: Also benchmark each setting with torch.compile (the
+                warmup run includes the compile time)
+
+        Returns:
+            The fastest runtime config
+        """
+        if self.source_lang == "en":
+            translator = self.en2vi_translator
+            sentences = [
+                "Hello, how are you today?",
+                "The meeting has been moved to three o'clock this afternoon.",
+            ]
+        else:
+            translator = self.vi2en_translator
+            sentences = [
+                "Xin chào, hôm nay bạn thế nào?",
+                "Cuộc họp đã được dời sang ba giờ chiều nay.",
+            ]
+        sampling_rate = 16000
+        audio = np.random.default_rng(0).normal(0, 0.05, 5 * sampling_rate)
+        audio = audio.astype(np.float32)
+
+        def run(config: RuntimeConfig) -> None:
+            self._use_runtime(config, [self.asr_model, translator])
+            self.asr_model.transcribe_audio(
+                audio, sampling_rate, language=translator.src_lang[:2]
+            )
+            translator.translate(sentences)
+
+        configs = candidate_configs(self.runtime, try_compile=try_compile)
+        print(f"Benchmarking {len(configs)} runtime configurations...")
+        best, results = autotune(run, configs)
+
+        for config, seconds in sorted(results, key=lambda result: result[1]):
+            print(
+                f"  {seconds:7.3f}s  threads={config.intra_op_threads} "
+                f"inference_mode={config.inference_mode} bf16={config.bf16_autocast} "
+                f"compile={config.compile}"
+            )
+
+        # Keep using the best settings in this session
+        self.runtime = best
+        best.apply_threads()
+        self._use_runtime(
+            best, [self._asr_model, self._vi2en_translator, self._en2vi_translator]
+        )
+
+        best.save(output_path)
+        print(f"Best runtime settings saved to: {output_path}")
+        return best
+
+    @staticmethod
+    def _use_runtime(config: RuntimeConfig, models: List[Any]) -> None:
+        """Switch loaded models to ``config``, compiling or uncompiling them."""
+        for model in models:
+            if model is None:
+                continue
+            if model.runtime.compile != config.compile:
+                config.prepare_model(model.model)
+            model.runtime = config
+
     def print_help(self) -> None:
         """Print help information."""
         print("\n=== Audio Translation CLI Help ===")
@@ -281,9 +717,20 @@ class TranslationCLI:
         print("  transcribe <file>       - Transcribe an audio file")
         print("  translate <text>        - Translate text")
         print("  process <file>          - Process audio file (transcribe + translate)")
+        print("  process <file|dir> ...  - Process many audio files in batches")
+        print(
+            "  subtitles <file> [fmt]  - Write bilingual srt (default) or vtt subtitles"
+        )
         print("  speak                   - Record and process audio")
         print("  switch                  - Switch languages")
         print("  lang <src> <tgt>        - Set languages (en/vi)")
+        print("  lang auto               - Detect the spoken language of each input")
+        print(
+            "  autotune [file]         - Benchmark and save the fastest runtime settings"
+            " (add --compile to include torch.compile)"
+        )
+        print("  lookup <file>           - Show the stored result of an audio file")
+        print("  export [dir]            - Export stored results as text files")
         print("  status                  - Show current status")
         print("  help                    - Show this help message")
         print("  exit                    - Exit the application")
@@ -296,12 +743,46 @@ class TranslationCLI:
         print("\n=== Current Status ===")
         print(f"Source language: {self.source_lang}")
         print(f"Target language: {self.target_lang}")
+        print(f"Decoding profile: {self.decoding_profile}")
+        print(f"Runtime: {self.runtime}")
+        if self.client is not None:
+            server = self.client.ping()
+            print(
+                f"Model server: {self.client.socket_path} (pid {server['pid']}, "
+                f"ASR loaded: {server['asr_loaded']}, "
+                f"translators: {', '.join(server['translators']) or 'none'})"
+            )
         print(f"ASR model loaded: {self._asr_model is not None}")
         print(f"VI→EN translator loaded: {self._vi2en_translator is not None}")
         print(f"EN→VI translator loaded: {self._en2vi_translator is not None}")
+        for translator in (self._vi2en_translator, self._en2vi_translator):
+            if translator is not None and translator.glossary is not None:
+                stats = translator.glossary_stats
+                print(
+                    f"Glossary {translator.src_lang}→{translator.tgt_lang}: "
+                    f"{stats['exact_matches']} sentences without a model call, "
+                    f"{stats['protected_terms']} terms protected, "
+                    f"{stats['model_calls_saved']} model calls saved"
+                )
+        models = {
+            "ASR": self._asr_model,
+            "VI→EN": self._vi2en_translator,
+            "EN→VI": self._en2vi_translator,
+        }
+        for name, model in models.items():
+            if model is not None and model.assisted is not None:
+                print(
+                    f"Assisted decoding {name}: {format_assisted_stats(model.assisted)}"
+                )
+        if self.early_asr is not None:
+            print(f"Early ASR: {format_speculative_stats(self.early_asr)}")
         print(f"Output directories:")
         print(f"  - Recordings: {os.path.abspath('recordings')}")
         print(f"  - Transcripts: {os.path.abspath('transcripts')}")
+        print(
+            f"  - Results: {os.path.abspath(self.store.db_path)} "
+            f"({len(self.store)} stored)"
+        )
         print("====================\n")
 
     def handle_command(self, command: str, args: List[str]) -> bool:
@@ -325,6 +806,11 @@ class TranslationCLI:
         elif command == "status":
             self.print_status()
 
+        elif command == "autotune":
+            try_compile = "--compile" in args
+            paths = [arg for arg in args if arg != "--compile"]
+            self.autotune(paths[0] if paths else DEFAULT_RUNTIME_CONFIG, try_compile)
+
         elif command == "record":
             duration = int(args[0]) if args else None
             self.record_audio(duration=duration)
@@ -351,21 +837,64 @@ class TranslationCLI:
                 print("Error: Missing file path")
                 return True
 
+            if len(args) > 1 or os.path.isdir(args[0]):
+                self.process_audio_files(args)
+                return True
+
             result = self.process_audio_file(args[0])
             if result:
+                self._print_detected_language(result)
                 print(f"\nTranscription: {result['source_text']}")
                 print(f"Translation: {result['translated_text']}\n")
 
+        elif command == "subtitles":
+            if not args:
+                print("Error: Missing file path")
+                return True
+
+            subtitle_format = args[1] if len(args) > 1 else "srt"
+            if subtitle_format not in SUBTITLE_FORMATS:
+                print(f"Error: Subtitle format must be one of: {SUBTITLE_FORMATS}")
+                return True
+
+            self.export_subtitles(args[0], subtitle_format)
+
         elif command == "speak":
             result = self.record_and_process()
             if result:
+                self._print_detected_language(result)
                 print(f"\nTranscription: {result['source_text']}")
                 print(f"Translation: {result['translated_text']}\n")
 
+        elif command == "lookup":
+            if not args:
+                print("Error: Missing file path")
+                return True
+
+            record = self.lookup_result(args[0])
+            if record is None:
+                print(f"No stored result for: {args[0]}")
+                return True
+
+            print(f"\nTranscription: {record['transcript']}")
+            if record["translation"] is not None:
+                print(f"Translation: {record['translation']}")
+            print(f"Models: {record['models']}")
+            print(f"Timings: {record['timings']}\n")
+
+        elif command == "export":
+            directory = args[0] if args else "transcripts"
+            count = self.store.export_txt(directory)
+            print(f"Exported {count} results to: {directory}")
+
         elif command == "switch":
             self.switch_languages()
 
         elif command == "lang":
+            if args[:1] == ["auto"]:
+                self.set_languages("auto", "auto")
+                return True
+
             if len(args) < 2:
                 print("Error: Missing language codes")
                 return True
@@ -408,6 +937,9 @@ class TranslationCLI:
         except KeyboardInterrupt:
             print("\nExiting...")
 
+        finally:
+            self.close()
+
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
@@ -415,9 +947,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--source",
         "-s",
-        choices=["en", "vi"],
+        choices=["en", "vi", "auto"],
         default="vi",
-        help="Source language (default: vi)",
+        help="Source language, or auto to detect it (default: vi)",
     )
     parser.add_argument(
         "--target",
@@ -433,9 +965,193 @@ def parse_args() -> argparse.Namespace:
         metavar="DURATION",
         help="Record audio for DURATION seconds",
     )
-    parser.add_argument("--process", "-p", metavar="FILE", help="Process audio file")
+    parser.add_argument(
+        "--process",
+        "-p",
+        nargs="+",
+        metavar="FILE",
+        help="Process audio files (or directories of audio files)",
+    )
+    parser.add_argument(
+        "--subtitles",
+        choices=list(SUBTITLE_FORMATS),
+        help="Write bilingual subtitles in this format for the --process files",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(DECODING_PROFILES),
+        default="balanced",
+        help="Decoding profile trading latency for quality (default: balanced)",
+    )
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Seconds a translation call may take; narrows the beam to fit",
+    )
+    parser.add_argument(
+        "--glossary",
+        metavar="TSV",
+        help="Glossary of approved translations for the selected direction",
+    )
+    parser.add_argument(
+        "--asr-draft",
+        metavar="MODEL_ID",
+        help="Smaller Whisper model (e.g. distil-whisper) for assisted ASR decoding",
+    )
+    parser.add_argument(
+        "--translation-draft",
+        metavar="MODEL",
+        help="Smaller translation model with the same tokenizer for assisted "
+        "decoding in the selected direction",
+    )
+    parser.add_argument(
+        "--assisted-compare-every",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Also decode every N-th assisted call without the draft to report speedup",
+    )
+    parser.add_argument(
+        "--threads", type=int, metavar="N", help="Intra-op threads used by torch"
+    )
+    parser.add_argument(
+        "--interop-threads",
+        type=int,
+        metavar="N",
+        help="Inter-op threads used by torch",
+    )
+    parser.add_argument(
+        "--no-inference-mode",
+        action="store_true",
+        help="Use torch.no_grad instead of torch.inference_mode",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the models with torch.compile (with --autotune, benchmark "
+        "settings with and without it)",
+    )
+    parser.add_argument(
+        "--bf16", action="store_true", help="Use bfloat16 autocast on supported CPUs"
+    )
+    parser.add_argument(
+        "--runtime-config",
+        metavar="JSON",
+        default=DEFAULT_RUNTIME_CONFIG,
+        help=f"Runtime settings file (default: {DEFAULT_RUNTIME_CONFIG})",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Benchmark runtime settings and save the fastest to --runtime-config",
+    )
+    parser.add_argument(
+        "--results-db",
+        metavar="PATH",
+        default=DEFAULT_RESULTS_DB,
+        help=f"SQLite database results are stored in (default: {DEFAULT_RESULTS_DB})",
+    )
+    parser.add_argument(
+        "--txt",
+        action="store_true",
+        help="Also write per-file transcript and translation text files",
+    )
+    parser.add_argument(
+        "--export-txt",
+        metavar="DIR",
+        help="Export stored results as per-file text files to DIR and exit",
+    )
+    parser.add_argument(
+        "--early-asr",
+        action="store_true",
+        help="In 'speak' mode, start transcribing when speech pauses to hide "
+        "the silence wait",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a model server that later invocations send their requests to",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket of the model server (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Load the models in this process even if a model server is running",
+    )
     parser.add_argument(
         "--interactive", "-i", action="store_true", help="Start interactive mode"
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # Glossaries and translation drafts belong to one translation direction
+    if args.source == "auto" and (args.glossary or args.translation_draft):
+        parser.error(
+            "--glossary and --translation-draft apply to one direction; "
+            "use --source vi or --source en instead of auto"
+        )
+
+    return args
+
+
+def runtime_from_args(args: argparse.Namespace) -> RuntimeConfig:
+    """
+    Runtime settings from the settings file, overridden by command line flags.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Runtime config for the models
+    """
+    runtime = RuntimeConfig()
+    if os.path.exists(args.runtime_config):
+        runtime = RuntimeConfig.load(args.runtime_config)
+
+    changes = {}
+    if args.threads:
+        changes["intra_op_threads"] = args.threads
+    if args.interop_threads:
+        changes["inter_op_threads"] = args.interop_threads
+    if args.no_inference_mode:
+        changes["inference_mode"] = False
+    if args.compile:
+        changes["compile"] = True
+    if args.bf16:
+        changes["bf16_autocast"] = True
+
+    return runtime.replace(**changes)
+
+
+def model_settings_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Model settings shared by TranslationCLI and ModelServer.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Keyword arguments for the model settings of either class
+    """
+    direction = f"{args.source}2{args.target}"
+    glossaries = {direction: args.glossary} if args.glossary else {}
+    draft_models = {}
+    if args.asr_draft:
+        draft_models["asr"] = args.asr_draft
+    if args.translation_draft:
+        draft_models[direction] = args.translation_draft
+
+    return {
+        "decoding_profile": args.profile,
+        "latency_budget": args.latency_budget,
+        "glossaries": glossaries,
+        "runtime": runtime_from_args(args),
+        "draft_models": draft_models,
+        "assisted_compare_every": args.assisted_compare_every,
+    }
@@ -0,0 +1,491 @@
+import json
+import os
+import socket
+import struct
+import tempfile
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from translator_by_speech.pcm import INT16_SCALE, as_int16
+
+# Unix socket the model server listens on
+DEFAULT_SOCKET_PATH = os.environ.get("TRANSLATOR_SOCKET") or os.path.join(
+    tempfile.gettempdir(), "translator-by-speech.sock"
+)
+
+# Runtime settings file of the CLI (runtime.DEFAULT_RUNTIME_CONFIG, read
+# here without importing torch)
+RUNTIME_CONFIG = "runtime_config.json"
+
+# Messages are JSON prefixed with their length as a 4-byte big-endian integer
+_HEADER = struct.Struct(">I")
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Send one length-prefixed JSON message."""
+    payload = json.dumps(message, default=_to_json).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Receive one length-prefixed JSON message.
+
+    Returns:
+        The message, or None if the peer closed the connection
+    """
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a message")
+    return json.loads(payload.decode("utf-8"))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy scalars and arrays found in results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def attach_shared_audio(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a shared memory block created by a client.
+
+    The client that created the block unlinks it, so the attaching process
+    must not register it for cleanup.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always tracks attached blocks
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def model_settings(
+    decoding_profile: str = "balanced",
+    latency_budget: Optional[float] = None,
+    glossaries: Optional[Dict[str, str]] = None,
+    runtime: Optional[Dict[str, Any]] = None,
+    draft_models: Optional[Dict[str, str]] = None,
+    assisted_compare_every: int = 0,
+) -> Dict[str, Any]:
+    """
+    Model settings a client expects the server to use, as sent in requests.
+
+    Args:
+        decoding_profile: Decoding profile ("fast", "balanced" or "quality")
+        latency_budget: Seconds a translation call may take
+        glossaries: Glossary TSV paths keyed by direction ("vi2en", "en2vi")
+        runtime: RuntimeConfig settings (defaults for missing keys)
+        draft_models: Draft models for assisted decoding keyed by model
+        assisted_compare_every: Speedup measurement interval of assisted decoding
+
+    Returns:
+        JSON-serializable settings
+    """
+    return {
+        "decoding_profile": decoding_profile,
+        "latency_budget": latency_budget,
+        "glossaries": {
+            direction: os.path.abspath(path)
+            for direction, path in (glossaries or {}).items()
+        },
+        "runtime": runtime or {},
+        "draft_models": dict(draft_models or {}),
+        "assisted_compare_every": assisted_compare_every,
+    }
+
+
+class ModelClient:
+    """
+    Client of a running model server.
+
+    Requests are sent over a Unix socket; audio arrays are handed over in a
+    shared memory block instead of being serialized. Importing this module
+    does not load torch or the models, so clients start quickly.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 600.0):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Unix socket of the model server
+            timeout: Seconds to wait for a response
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    @classmethod
+    def connect(
+        cls, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 600.0
+    ) -> Optional["ModelClient"]:
+        """
+        Client of the server at ``socket_path``, if one is running.
+
+        Args:
+            socket_path: Unix socket of the model server
+            timeout: Seconds to wait for responses to later requests
+
+        Returns:
+            Connected client, or None if no server answers
+        """
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+            return None
+
+        client = cls(socket_path, timeout=1.0)
+        try:
+            client.ping()
+        except (OSError, RuntimeError):
+            return None
+        client.timeout = timeout
+        return client
+
+    def request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Each request uses its own connection, so one client can be shared by
+        threads and async tasks.
+
+        Args:
+            message: Request with an "op" and its arguments
+            timeout: Seconds to wait for the response (the client's timeout
+                if None)
+
+        Returns:
+            The "result" of the response
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout if timeout is None else timeout)
+            sock.connect(self.socket_path)
+            send_message(sock, message)
+            response = recv_message(sock)
+
+        if response is None:
+            raise ConnectionError("Model server closed the connection")
+        if not response.get("ok"):
+            raise RuntimeError(f"Model server error: {response.get('error')}")
+        return response.get("result")
+
+    def ping(self) -> Dict[str, Any]:
+        """Server process id and loaded models."""
+        return self.request({"op": "ping"})
+
+    def mismatched_settings(self, settings: Dict[str, Any]) -> List[str]:
+        """
+        Settings the server was started with that differ from ``settings``.
+
+        Args:
+            settings: Settings built with ``model_settings``
+
+        Returns:
+            One description per differing setting (empty if they all match)
+        """
+        return self.request({"op": "check_settings", "settings": settings})
+
+    def process_file(
+        self,
+        file_path: str,
+        source_lang: str = "vi",
+        target_lang: str = "en",
+        subtitles: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe and translate an audio file the server can read.
+
+        Args:
+            file_path: Path to the audio file
+            source_lang: Source language ("vi", "en" or "auto")
+            target_lang: Target language ("en" or "vi")
+            subtitles: Also return translated, timed "segments"
+
+        Returns:
+            Pipeline result dictionary
+        """
+        return self.request(
+            {
+                "op": "process_file",
+                "path": os.path.abspath(file_path),
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "subtitles": subtitles,
+            }
+        )
+
+    def process_files(
+        self,
+        file_paths: List[str],
+        source_lang: str = "vi",
+        target_lang: str = "en",
+        batch_size: int = 8,
+        prefetch_stats: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe and translate many audio files, ``batch_size`` per request.
+
+        The server decodes upcoming files of a request while the models run
+        and batches short files, as ``translate_speech_from_files`` does
+        in-process. Each request may take ``timeout`` seconds per file, and a
+        request that fails only fails its own files.
+
+        Args:
+            file_paths: Paths to the audio files
+            source_lang: Source language ("vi", "en" or "auto")
+            target_lang: Target language ("en" or "vi")
+            batch_size: Number of files per request (and per ASR batch)
+            prefetch_stats: Dictionary the server's decoding stats of all
+                requests are added to
+
+        Yields:
+            Result dictionaries in input order, each with its "file_path";
+            files that failed carry an "error" message instead of text
+        """
+        for start in range(0, len(file_paths), batch_size):
+            batch = file_paths[start : start + batch_size]
+            try:
+                response = self.request(
+                    {
+                        "op": "process_files",
+                        "paths": [os.path.abspath(file_path) for file_path in batch],
+                        "source_lang": source_lang,
+                        "target_lang": target_lang,
+                        "batch_size": batch_size,
+                    },
+                    timeout=self.timeout * len(batch),
+                )
+            except (OSError, RuntimeError) as e:
+                for file_path in batch:
+                    yield {"file_path": file_path, "error": str(e)}
+                continue
+
+            if prefetch_stats is not None:
+                _add_prefetch_stats(prefetch_stats, response["prefetch_stats"])
+            for file_path, result in zip(batch, response["results"]):
+                yield {**result, "file_path": file_path}
+
+    def transcribe_file(self, file_path: str, language: str = "vi") -> Dict[str, Any]:
+        """Transcribe an audio file the server can read."""
+        return self.request(
+            {
+                "op": "transcribe_file",
+                "path": os.path.abspath(file_path),
+                "language": language,
+            }
+        )
+
+    def translate_text(
+        self, text: str, source_lang: str = "vi", target_lang: str = "en"
+    ) -> str:
+        """Translate text sentence by sentence."""
+        return self.request(
+            {
+                "op": "translate_text",
+                "text": text,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+            }
+        )
+
+    def translate_audio(
+        self,
+        audio_array: np.ndarray,
+        sampling_rate: int,
+        source_lang: str = "vi",
+        target_lang: str = "en",
+    ) -> Dict[str, Any]:
+        """
+        Transcribe and translate audio samples, handed over in shared memory.
+
+        Args:
+            audio_array: Mono audio samples (float, or int16 PCM)
+            sampling_rate: Sampling rate of the audio
+            source_lang: Source language ("vi", "en" or "auto")
+            target_lang: Target language ("en" or "vi")
+
+        Returns:
+            Pipeline result dictionary
+        """
+        audio_array = np.asarray(audio_array).reshape(-1)
+
+        # The server reads the samples straight from the shared block
+        shm = shared_memory.SharedMemory(create=True, size=max(audio_array.size * 4, 1))
+        try:
+            shared = np.ndarray(audio_array.size, dtype=np.float32, buffer=shm.buf)
+            if np.issubdtype(audio_array.dtype, np.integer):
+                # int16 PCM is scaled into the block as PCMConverter does
+                np.multiply(as_int16(audio_array), INT16_SCALE, out=shared)
+            else:
+                shared[:] = audio_array
+            del shared
+            return self.request(
+                {
+                    "op": "translate_audio",
+                    "shm": shm.name,
+                    "samples": audio_array.size,
+                    "sampling_rate": sampling_rate,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                }
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        """Stop the server."""
+        self.request({"op": "shutdown"})
+
+
+def run_client(argv: Optional[List[str]] = None) -> bool:
+    """
+    Process audio files through a running model server without loading torch.
+
+    Only ``--process`` runs (with ``--source``, ``--target``, ``--subtitles``,
+    ``--results-db``, ``--txt`` and ``--socket``) are handled here; anything
+    else is left to the full CLI.
+
+    Args:
+        argv: Command line arguments (sys.argv[1:] if None)
+
+    Returns:
+        True if the command was handled, False if the full CLI must run it
+    """
+    # Imported here so that other clients do not depend on them
+    import argparse
+
+    from translator_by_speech.batch import collect_audio_files
+    from translator_by_speech.results import (
+        DEFAULT_RESULTS_DB,
+        ResultStore,
+        legacy_txt_files,
+    )
+    from translator_by_speech.subtitles import (
+        SUBTITLE_FORMATS,
+        render_subtitles,
+        subtitle_path,
+    )
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--source", "-s", choices=["en", "vi", "auto"], default="vi")
+    parser.add_argument("--target", "-t", choices=["en", "vi"], default="en")
+    parser.add_argument("--process", "-p", nargs="+")
+    parser.add_argument("--subtitles", choices=list(SUBTITLE_FORMATS))
+    parser.add_argument("--results-db", default=DEFAULT_RESULTS_DB)
+    parser.add_argument("--txt", action="store_true")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--no-daemon", action="store_true")
+
+    try:
+        args, unknown = parser.parse_known_args(argv)
+    except SystemExit:
+        # Let the full CLI report the error
+        return False
+    if unknown or args.no_daemon or not args.process:
+        return False
+
+    # The server must run the models with the settings this run would use
+    client = ModelClient.connect(args.socket)
+    runtime = None
+    if os.path.exists(RUNTIME_CONFIG):
+        with open(RUNTIME_CONFIG, encoding="utf-8") as f:
+            runtime = json.load(f)
+    if client is None or client.mismatched_settings(model_settings(runtime=runtime)):
+        return False
+
+    print(f"Using model server at {args.socket}")
+    os.makedirs("transcripts", exist_ok=True)
+    store = ResultStore(args.results_db)
+    try:
+        file_paths = collect_audio_files(args.process)
+        for file_path, result in _server_results(client, file_paths, args):
+            store.add(file_path, result)
+            print(f"Result stored in: {store.db_path}")
+
+            outputs = []
+            if args.subtitles:
+                outputs.append(
+                    (
+                        subtitle_path(file_path, args.subtitles, "transcripts"),
+                        render_subtitles(result["segments"], args.subtitles),
+                    )
+                )
+            elif args.txt:
+                files = legacy_txt_files(
+                    file_path, result["source_text"], result["translated_text"]
+                )
+                outputs.extend(
+                    (os.path.join("transcripts", file_name), text)
+                    for file_name, text in files
+                )
+            for output_path, text in outputs:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                print(f"Saved to: {output_path}")
+    finally:
+        store.close()
+    return True
+
+
+def _server_results(
+    client: ModelClient, file_paths: List[str], args: Any
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Results of the files of a ``run_client`` run; failed files are reported.
+
+    Yields:
+        File path and its result dictionary
+    """
+    if args.subtitles:
+        # Segments are timed file by file
+        for file_path in file_paths:
+            try:
+                print(f"Subtitling audio file: {file_path}")
+                result = client.process_file(
+                    file_path, args.source, args.target, subtitles=True
+                )
+            except (OSError, RuntimeError) as e:
+                print(f"Error processing audio file: {str(e)}")
+                continue
+            yield file_path, result
+        return
+
+    if not file_paths:
+        return
+
+    # Files go in batched requests, so the server batches ASR and translation
+    print(f"Processing {len(file_paths)} audio files...")
+    for result in client.process_files(file_paths, args.source, args.target):
+        if "error" in result:
+            print(f"Error processing {result['file_path']}: {result['error']}")
+            continue
+        yield result["file_path"], result
+
+
+def _add_prefetch_stats(total: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    """Add the AudioPrefetcher stats of one request to ``total``."""
+    for key, value in stats.items():
+        if key.startswith("max_"):
+            total[key] = max(total.get(key, value), value)
+        else:
+            total[key] = total.get(key, 0) + value
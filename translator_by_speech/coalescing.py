@@ -0,0 +1,244 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from translator_by_speech.translator import TranslationModel
+
+
+class CoalescingTranslator:
+    """Thread-safe front end that merges concurrent translation requests into batches."""
+
+    def __init__(
+        self,
+        translator_model: TranslationModel,
+        max_batch_size: int = 16,
+        max_latency: float = 0.01,
+    ):
+        """
+        Initialize the coalescing translator and start its worker thread.
+
+        Args:
+            translator_model: Translation model that runs the batched generate calls
+            max_batch_size: Maximum number of unique texts per generate call
+            max_latency: Seconds to wait for more requests after the first one arrives
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.translator_model = translator_model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        # Pending requests and in-flight futures keyed by (generation options, text)
+        self._queue: "queue.Queue[Optional[Tuple[Tuple, str]]]" = queue.Queue()
+        self._pending: Dict[Tuple[Tuple, str], Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Counters for monitoring
+        self.stats = {"requests": 0, "deduplicated": 0, "batches": 0, "texts": 0}
+
+        self._worker = threading.Thread(
+            target=self._run, name="coalescing-translator", daemon=True
+        )
+        self._worker.start()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped model's attributes (src_lang, tokenizer, ...)
+        if name == "translator_model":
+            raise AttributeError(name)
+        return getattr(self.translator_model, name)
+
+    def submit(
+        self, text: str, num_beams: Optional[int] = None, early_stopping: bool = True
+    ) -> Future:
+        """
+        Queue a single text for translation.
+
+        Args:
+            text: Input text to translate
+            num_beams: Number of beams for beam search (chosen by the model if None)
+            early_stopping: Whether to stop beam search when first complete candidate is found
+
+        Returns:
+            Future resolving to the translated text
+        """
+        key = ((num_beams, early_stopping), text)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("CoalescingTranslator is closed")
+
+            self.stats["requests"] += 1
+
+            # Share the future of an identical request that is still in flight
+            future = self._pending.get(key)
+            if future is not None:
+                self.stats["deduplicated"] += 1
+                return future
+
+            future = Future()
+            self._pending[key] = future
+            self._queue.put(key)
+
+        return future
+
+    def translate(
+        self,
+        text: Union[str, List[str]],
+        num_beams: Optional[int] = None,
+        early_stopping: bool = True,
+    ) -> Union[str, List[str]]:
+        """
+        Translate text, blocking until the coalesced batch has finished.
+
+        Args:
+            text: Input text or list of texts to translate
+            num_beams: Number of beams for beam search (chosen by the model if None)
+            early_stopping: Whether to stop beam search when first complete candidate is found
+
+        Returns:
+            Translated text or list of translated texts
+        """
+        is_single_text = isinstance(text, str)
+        texts = [text] if is_single_text else text
+
+        futures = [self.submit(t, num_beams, early_stopping) for t in texts]
+        translated_texts = [future.result() for future in futures]
+
+        return translated_texts[0] if is_single_text else translated_texts
+
+    async def atranslate(
+        self,
+        text: Union[str, List[str]],
+        num_beams: Optional[int] = None,
+        early_stopping: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Union[str, List[str]]:
+        """
+        Asynchronously translate text through the coalescing queue.
+
+        Args:
+            text: Input text or list of texts to translate
+            num_beams: Number of beams for beam search (chosen by the model if None)
+            early_stopping: Whether to stop beam search when first complete candidate is found
+            timeout: Seconds to wait before raising asyncio.TimeoutError
+
+        Returns:
+            Translated text or list of translated texts
+        """
+        is_single_text = isinstance(text, str)
+        texts = [text] if is_single_text else text
+
+        # Shield the shared futures so one cancelled caller does not cancel
+        # a deduplicated request that other callers are still waiting on
+        futures = [
+            asyncio.shield(
+                asyncio.wrap_future(self.submit(t, num_beams, early_stopping))
+            )
+            for t in texts
+        ]
+        translated_texts = await asyncio.wait_for(asyncio.gather(*futures), timeout)
+
+        return translated_texts[0] if is_single_text else translated_texts
+
+    def close(self) -> None:
+        """Stop accepting requests, flush the queue and join the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+        self._worker.join()
+
+    def __enter__(self) -> "CoalescingTranslator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _collect(
+        self, first: Tuple[Tuple, str]
+    ) -> Tuple[List[Tuple[Tuple, str]], bool]:
+        """Gather requests that arrive within the latency window after ``first``."""
+        keys = [first]
+        stop = False
+        deadline = time.monotonic() + self.max_latency
+
+        while len(keys) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                key = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+
+            if key is None:
+                stop = True
+                break
+            keys.append(key)
+
+        return keys, stop
+
+    def _run(self) -> None:
+        """Worker loop: collect a window of requests and run them as batches."""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            keys, stop = self._collect(first)
+
+            # Requests with different generation options cannot share a batch
+            groups: Dict[Tuple, List[Tuple[Tuple, str]]] = {}
+            for key in keys:
+                groups.setdefault(key[0], []).append(key)
+
+            for (num_beams, early_stopping), group in groups.items():
+                self._translate_group(group, num_beams, early_stopping)
+
+        # Requests still queued after shutdown was requested
+        while True:
+            try:
+                key = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if key is not None:
+                self._translate_group([key], *key[0])
+
+    def _translate_group(
+        self,
+        keys: List[Tuple[Tuple, str]],
+        num_beams: Optional[int],
+        early_stopping: bool,
+    ) -> None:
+        """Run one batched generate call and resolve the matching futures."""
+        translations: List[str] = []
+        error: Optional[Exception] = None
+        try:
+            translations = self.translator_model.translate(
+                [text for _, text in keys],
+                num_beams=num_beams,
+                early_stopping=early_stopping,
+            )
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(keys)
+            futures = [self._pending.pop(key) for key in keys]
+
+        for future, translation in zip(futures, translations or [None] * len(keys)):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(translation)
@@ -0,0 +1,189 @@
+import math
+import threading
+from typing import Any, Dict, Optional
+
+# Decoding profiles, from lowest latency to best quality:
+#   num_beams: beam width for inputs that are not short
+#   short_input_tokens: inputs up to this many source tokens are decoded greedily
+#   asr_tokens_per_second: Whisper token budget per second of audio (None for
+#     the full budget); dense Vietnamese speech runs at about 12 tokens a second,
+#     so the budget only stops runaway output instead of cutting transcripts
+#   target_ratio: translation token budget per source token
+#   min_new_tokens: smallest budget for any input
+DECODING_PROFILES: Dict[str, Dict[str, Optional[float]]] = {
+    "fast": {
+        "num_beams": 1,
+        "short_input_tokens": 0,
+        "asr_tokens_per_second": 15.0,
+        "target_ratio": 1.5,
+        "min_new_tokens": 16,
+    },
+    "balanced": {
+        "num_beams": 3,
+        "short_input_tokens": 8,
+        "asr_tokens_per_second": None,
+        "target_ratio": 2.0,
+        "min_new_tokens": 24,
+    },
+    "quality": {
+        "num_beams": 5,
+        "short_input_tokens": 0,
+        "asr_tokens_per_second": 18.0,
+        "target_ratio": 3.0,
+        "min_new_tokens": 32,
+    },
+}
+
+# Largest token budget of one Whisper window: the decoder holds 448 positions,
+# a few of which the prompt (start, language and task tokens) takes
+ASR_MAX_NEW_TOKENS = 440
+
+
+class DecodingPolicy:
+    """
+    Chooses token budgets and beam widths from the input size.
+
+    The translation latency of a request is estimated from the time per decoded
+    token of previous calls, so a latency budget can narrow the beam until the
+    estimate fits.
+    """
+
+    def __init__(
+        self,
+        profile: str = "balanced",
+        seconds_per_token: float = 0.01,
+        smoothing: float = 0.2,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            profile: Name of a profile in DECODING_PROFILES
+            seconds_per_token: Initial estimate of the time to decode one token
+                of one sequence (refined by ``record``)
+            smoothing: Weight of each new observation in the running estimate
+        """
+        if profile not in DECODING_PROFILES:
+            raise ValueError(
+                f"Unknown decoding profile: {profile} "
+                f"(choose from {', '.join(DECODING_PROFILES)})"
+            )
+
+        self.profile = profile
+        self.settings = DECODING_PROFILES[profile]
+        self.seconds_per_token = seconds_per_token
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def asr_max_new_tokens(self, duration_seconds: Optional[float]) -> int:
+        """
+        Token budget for transcribing audio of the given duration.
+
+        Args:
+            duration_seconds: Duration of the audio (None for the full budget)
+
+        Returns:
+            Maximum number of tokens to generate
+        """
+        tokens_per_second = self.settings["asr_tokens_per_second"]
+        if duration_seconds is None or tokens_per_second is None:
+            return ASR_MAX_NEW_TOKENS
+
+        budget = math.ceil(duration_seconds * tokens_per_second)
+        budget += int(self.settings["min_new_tokens"])
+        return min(budget, ASR_MAX_NEW_TOKENS)
+
+    def translation_max_new_tokens(self, source_tokens: int) -> int:
+        """
+        Token budget for translating a text of ``source_tokens`` tokens.
+
+        Args:
+            source_tokens: Number of source tokens (the longest text of a batch)
+
+        Returns:
+            Maximum number of tokens to generate
+        """
+        return math.ceil(source_tokens * self.settings["target_ratio"]) + int(
+            self.settings["min_new_tokens"]
+        )
+
+    def num_beams(
+        self,
+        source_tokens: int,
+        batch_size: int = 1,
+        latency_budget: Optional[float] = None,
+    ) -> int:
+        """
+        Beam width for translating a batch.
+
+        Args:
+            source_tokens: Number of source tokens (the longest text of a batch)
+            batch_size: Number of texts decoded together
+            latency_budget: Seconds the request may take (None for no limit)
+
+        Returns:
+            Beam width; 1 means greedy decoding
+        """
+        if source_tokens <= self.settings["short_input_tokens"]:
+            return 1
+
+        num_beams = int(self.settings["num_beams"])
+        if latency_budget is not None:
+            max_new_tokens = self.translation_max_new_tokens(source_tokens)
+            while (
+                num_beams > 1
+                and self.estimate_seconds(max_new_tokens, num_beams * batch_size)
+                > latency_budget
+            ):
+                num_beams -= 1
+
+        return num_beams
+
+    def translation_settings(
+        self,
+        source_tokens: int,
+        batch_size: int = 1,
+        num_beams: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generation arguments for translating a batch.
+
+        Args:
+            source_tokens: Number of source tokens (the longest text of a batch)
+            batch_size: Number of texts decoded together
+            num_beams: Beam width requested by the caller (chosen if None)
+            latency_budget: Seconds the request may take (None for no limit)
+
+        Returns:
+            Dictionary with "num_beams" and "max_new_tokens"
+        """
+        if num_beams is None:
+            num_beams = self.num_beams(source_tokens, batch_size, latency_budget)
+
+        return {
+            "num_beams": num_beams,
+            "max_new_tokens": self.translation_max_new_tokens(source_tokens),
+        }
+
+    def estimate_seconds(self, max_new_tokens: int, num_sequences: int) -> float:
+        """Estimated worst-case time to decode ``num_sequences`` sequences."""
+        return max_new_tokens * num_sequences * self.seconds_per_token
+
+    def record(self, generated_tokens: int, num_sequences: int, seconds: float) -> None:
+        """
+        Update the time-per-token estimate from a finished generate call.
+
+        Args:
+            generated_tokens: Length of the generated sequences
+            num_sequences: Number of sequences decoded (beams times batch size)
+            seconds: Wall time of the call
+        """
+        if generated_tokens <= 0 or num_sequences <= 0:
+            return
+
+        observed = seconds / (generated_tokens * num_sequences)
+        with self._lock:
+            self.seconds_per_token += self.smoothing * (
+                observed - self.seconds_per_token
+            )
@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class AsyncExecutor:
+    """Bounded thread pool for running blocking audio and model work from asyncio."""
+
+    def __init__(self, max_workers: int = 1, thread_name_prefix: str = ""):
+        """
+        Initialize the executor. Worker threads are only started on first use.
+
+        Args:
+            max_workers: Maximum number of calls running at the same time
+            thread_name_prefix: Prefix for the worker thread names
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazily created thread pool."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.thread_name_prefix,
+                )
+            return self._executor
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop.
+
+        Cancelling the awaiting task (or hitting the timeout) drops the call if it
+        is still queued. A call that has already started runs to completion in its
+        worker thread, but its result is discarded.
+
+        Args:
+            func: Blocking callable to run
+            *args: Positional arguments for the callable
+            timeout: Seconds to wait before raising asyncio.TimeoutError
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+        return await asyncio.wait_for(future, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker threads, cancelling calls that have not started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,290 @@
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import torch
+
+# Whisper front-end parameters (16 kHz audio, 25 ms window, 10 ms hop, 30 s input)
+N_FFT = 400
+HOP_LENGTH = 160
+CHUNK_SECONDS = 30
+
+
+def log_mel_from_power(mel_power: np.ndarray) -> np.ndarray:
+    """
+    Apply Whisper's log compression and normalization to a mel power spectrogram.
+
+    Args:
+        mel_power: Mel power spectrogram of shape (n_mels, n_frames)
+
+    Returns:
+        Normalized log-mel spectrogram as float32
+    """
+    log_spec = np.log10(np.maximum(mel_power, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0).astype(np.float32)
+
+
+class LogMelCache:
+    """
+    Incremental Whisper log-mel features for overlapping windows of a stream.
+
+    Mel power frames that only depend on samples inside the window are cached
+    by their absolute frame index, so when the window moves forward only the
+    new frames and the few frames at the window edges are computed. Frames in
+    the zero padding up to 30 s are never computed.
+    """
+
+    def __init__(
+        self,
+        mel_filters: np.ndarray,
+        sampling_rate: int = 16000,
+        n_fft: int = N_FFT,
+        hop_length: int = HOP_LENGTH,
+        chunk_seconds: int = CHUNK_SECONDS,
+    ):
+        """
+        Initialize the feature cache.
+
+        Args:
+            mel_filters: Mel filterbank of shape (n_fft // 2 + 1, n_mels), as in
+                WhisperFeatureExtractor.mel_filters
+            sampling_rate: Sampling rate of the audio
+            n_fft: FFT size
+            hop_length: Number of samples between frames
+            chunk_seconds: Length the audio is padded to
+        """
+        self.mel_filters = np.asarray(mel_filters, dtype=np.float32)
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_samples = chunk_seconds * sampling_rate
+        self.n_frames = self.n_samples // hop_length
+
+        self._window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+        self._offsets = np.arange(n_fft) - n_fft // 2
+
+        # Cached interior frames covering absolute frames [_first, _first + width)
+        self._first = 0
+        self._cache = np.zeros((self.mel_filters.shape[1], 0), dtype=np.float32)
+
+        # Counters for monitoring
+        self.stats = {"computed_frames": 0, "cached_frames": 0}
+
+    def reset(self) -> None:
+        """Drop all cached frames."""
+        self._first = 0
+        self._cache = self._cache[:, :0]
+
+    def window_features(self, audio: np.ndarray, start_sample: int = 0) -> np.ndarray:
+        """
+        Compute the log-mel spectrogram of a window of the stream.
+
+        Args:
+            audio: Float32 samples of the window (at most 30 s)
+            start_sample: Absolute position of the window in the stream; must
+                be a multiple of the hop length for cached frames to be reused
+
+        Returns:
+            Log-mel features of shape (n_mels, n_frames), matching the Hugging
+            Face Whisper feature extractor
+        """
+        n = len(audio)
+        if n > self.n_samples:
+            raise ValueError(f"Window is longer than {self.n_samples} samples")
+
+        half = self.n_fft // 2
+        mel_power = np.zeros((self.mel_filters.shape[1], self.n_frames), np.float32)
+
+        # Frames t whose samples all lie inside the window
+        first_interior = -(-half // self.hop_length)
+        end_interior = max((n - half) // self.hop_length + 1, first_interior)
+        # Frames from here on only see zero padding
+        end_nonzero = min(-(-(n + half) // self.hop_length), self.n_frames)
+
+        aligned = start_sample % self.hop_length == 0
+        if aligned and end_interior > first_interior:
+            base = start_sample // self.hop_length
+            mel_power[:, first_interior:end_interior] = self._interior_frames(
+                audio, base, first_interior, end_interior
+            )
+            edge_frames = list(range(first_interior)) + list(
+                range(end_interior, end_nonzero)
+            )
+        else:
+            edge_frames = list(range(end_nonzero))
+
+        if edge_frames:
+            frames = np.asarray(edge_frames)
+            mel_power[:, frames] = self._compute_frames(audio, frames)
+
+        return log_mel_from_power(mel_power)
+
+    def _interior_frames(
+        self, audio: np.ndarray, base: int, start: int, end: int
+    ) -> np.ndarray:
+        """Return interior frames [start, end) of the window, using the cache."""
+        abs_start, abs_end = base + start, base + end
+        cache_end = self._first + self._cache.shape[1]
+
+        if abs_start < self._first or abs_start > cache_end:
+            # The window moved backwards or skipped ahead: start over
+            self._first, self._cache = abs_start, self._cache[:, :0]
+            cache_end = abs_start
+
+        if abs_end > cache_end:
+            missing = np.arange(cache_end - base, end)
+            self._cache = np.concatenate(
+                [self._cache, self._compute_frames(audio, missing)], axis=1
+            )
+
+        # Forget frames before the window so memory stays bounded
+        self._cache = self._cache[:, abs_start - self._first :]
+        self._first = abs_start
+
+        self.stats["cached_frames"] += min(cache_end, abs_end) - abs_start
+        return self._cache[:, : end - start]
+
+    def _compute_frames(self, audio: np.ndarray, frames: np.ndarray) -> np.ndarray:
+        """Compute mel power for the given frame indices of the padded window."""
+        # Sample indices of each frame in the centered, reflect-padded signal
+        idx = frames[:, None] * self.hop_length + self._offsets[None, :]
+        idx = np.abs(idx)
+        idx = np.where(idx >= self.n_samples, 2 * (self.n_samples - 1) - idx, idx)
+
+        samples = np.zeros(idx.shape, dtype=np.float32)
+        inside = idx < len(audio)
+        samples[inside] = audio[idx[inside]]
+
+        spectrum = np.fft.rfft(samples * self._window, axis=1)
+        power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+
+        self.stats["computed_frames"] += len(frames)
+        return self.mel_filters.T @ power.T
+
+
+class LogMelExtractor:
+    """
+    Batched Whisper log-mel features computed with torch.
+
+    Matches the Hugging Face Whisper feature extractor (padding to 30 s,
+    centered reflect-padded STFT, Slaney mel filterbank, log10 and per-clip
+    dynamic range clamp) for a whole batch of clips at once. The Hann window
+    and mel filterbank are built once. The STFT only covers the audio of the
+    longest clip plus one window; frames that only see the zero padding up to
+    30 s are filled with the clip's floor value instead of being computed.
+    """
+
+    def __init__(
+        self,
+        mel_filters: np.ndarray,
+        sampling_rate: int = 16000,
+        n_fft: int = N_FFT,
+        hop_length: int = HOP_LENGTH,
+        chunk_seconds: int = CHUNK_SECONDS,
+        device: Optional[torch.device] = None,
+    ):
+        """
+        Initialize the extractor.
+
+        Args:
+            mel_filters: Mel filterbank of shape (n_fft // 2 + 1, n_mels), as in
+                WhisperFeatureExtractor.mel_filters
+            sampling_rate: Sampling rate of the audio
+            n_fft: FFT size
+            hop_length: Number of samples between frames
+            chunk_seconds: Length the audio is padded to
+            device: Device the features are computed on (CPU if None)
+        """
+        self.device = device or torch.device("cpu")
+        self.sampling_rate = sampling_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_samples = chunk_seconds * sampling_rate
+        self.n_frames = self.n_samples // hop_length
+
+        # Built once and reused by every batch
+        self.mel_filters = torch.as_tensor(
+            np.asarray(mel_filters).T, dtype=torch.float32, device=self.device
+        ).contiguous()
+        self.window = torch.hann_window(n_fft, device=self.device)
+
+        # Counters for monitoring
+        self.stats = {
+            "batches": 0,
+            "clips": 0,
+            "computed_frames": 0,
+            "padded_frames": 0,
+        }
+
+    @classmethod
+    def from_feature_extractor(
+        cls, feature_extractor: Any, device: Optional[torch.device] = None
+    ) -> "LogMelExtractor":
+        """
+        Create an extractor with the settings of a Hugging Face Whisper feature extractor.
+
+        Args:
+            feature_extractor: WhisperFeatureExtractor of the processor
+            device: Device the features are computed on
+
+        Returns:
+            Extractor producing the same features
+        """
+        return cls(
+            feature_extractor.mel_filters,
+            sampling_rate=feature_extractor.sampling_rate,
+            n_fft=feature_extractor.n_fft,
+            hop_length=feature_extractor.hop_length,
+            chunk_seconds=feature_extractor.chunk_length,
+            device=device,
+        )
+
+    def __call__(self, clips: Sequence[np.ndarray]) -> torch.Tensor:
+        """
+        Compute the log-mel spectrograms of a batch of clips.
+
+        Args:
+            clips: Float32 mono clips at the extractor's sampling rate (longer
+                clips are truncated to 30 s)
+
+        Returns:
+            Features of shape (batch, n_mels, n_frames) on the extractor's device
+        """
+        if not clips:
+            raise ValueError("clips must not be empty")
+
+        half = self.n_fft // 2
+        lengths = [min(len(clip), self.n_samples) for clip in clips]
+        longest = max(lengths)
+
+        # Frames from here on only see zero padding in every clip
+        n_computed = min(-(-(longest + half) // self.hop_length), self.n_frames)
+        # Trailing zeros so the reflect padding at the end mirrors zeros only
+        n_padded = min(longest + self.n_fft, self.n_samples)
+
+        waveforms = np.zeros((len(clips), n_padded), dtype=np.float32)
+        for row, (clip, length) in zip(waveforms, zip(clips, lengths)):
+            row[:length] = clip[:length]
+        waveforms = torch.from_numpy(waveforms).to(self.device)
+
+        stft = torch.stft(
+            waveforms,
+            self.n_fft,
+            self.hop_length,
+            window=self.window,
+            return_complex=True,
+        )
+        power = (stft[..., :n_computed].abs() ** 2).contiguous()
+        log_spec = torch.clamp(self.mel_filters @ power, min=1e-10).log10()
+
+        # Padded frames (log10 of the 1e-10 clamp) are raised to the floor of
+        # each clip's dynamic range
+        floor = log_spec.amax(dim=(1, 2), keepdim=True) - 8.0
+        padding = torch.clamp(floor, min=-10.0)
+        features = padding.expand(-1, log_spec.shape[1], self.n_frames).clone()
+        features[..., :n_computed] = torch.maximum(log_spec, floor)
+
+        self.stats["batches"] += 1
+        self.stats["clips"] += len(clips)
+        self.stats["computed_frames"] += n_computed * len(clips)
+        self.stats["padded_frames"] += (self.n_frames - n_computed) * len(clips)
+        return (features + 4.0) / 4.0
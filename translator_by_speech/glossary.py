@@ -0,0 +1,253 @@
+import re
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Trailing punctuation kept outside of full-sentence matches
+_TRAILING_PUNCTUATION = ".!?…;:,"
+
+# Placeholder that replaces protected terms before translation
+PLACEHOLDER = "__T{}__"
+
+# Placeholders may come back from the model with extra spaces
+_PLACEHOLDER_PATTERN = re.compile(r"__\s*T\s*(\d+)\s*__")
+
+
+def _fold(text: str) -> str:
+    """Lowercase text without changing its length, so offsets stay valid."""
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _normalize(text: str) -> str:
+    """Key used for full-sentence matches: folded case and single spaces."""
+    return " ".join(_fold(text).split())
+
+
+class Glossary:
+    """
+    Phrase table with approved translations of fixed phrases and terms.
+
+    Full sentences that are in the table are answered without the model.
+    Terms inside longer sentences are found in one pass with an Aho-Corasick
+    automaton, replaced by placeholders before translation and restored
+    afterwards. Matching ignores case and only matches whole words.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, str]] = None):
+        """
+        Initialize the glossary.
+
+        Args:
+            entries: Mapping of source phrases to their translations
+        """
+        self._exact: Dict[str, str] = {}
+
+        # Automaton: goto transitions, the term ending at each node, failure
+        # links and all terms matched at each node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._term: List[Optional[Tuple[int, str]]] = [None]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self._built = True
+
+        for source, target in (entries or {}).items():
+            self.add(source, target)
+
+    @classmethod
+    def from_tsv(cls, file_path: str) -> "Glossary":
+        """
+        Load a glossary from a tab-separated file of ``source<TAB>target`` lines.
+
+        Blank lines and lines starting with ``#`` are ignored.
+
+        Args:
+            file_path: Path to the TSV file
+
+        Returns:
+            Glossary with all entries of the file
+        """
+        glossary = cls()
+        with open(file_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.rstrip("\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+
+                columns = line.split("\t")
+                if len(columns) < 2 or not columns[0].strip():
+                    raise ValueError(
+                        f"{file_path}:{line_number}: expected 'source<TAB>target'"
+                    )
+                glossary.add(columns[0], columns[1])
+
+        return glossary
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, source: str, target: str) -> None:
+        """
+        Add or replace an entry.
+
+        Args:
+            source: Source phrase
+            target: Approved translation
+        """
+        key = _normalize(source)
+        if not key:
+            raise ValueError("Glossary source phrase must not be empty")
+
+        self._exact[key] = target.strip()
+
+        # Insert the phrase into the trie; failure links are rebuilt lazily
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._term.append(None)
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._term[node] = (len(key), key)
+        self._built = False
+
+    def lookup(self, text: str) -> Optional[str]:
+        """
+        Translation of a full sentence, if the sentence is in the glossary.
+
+        Trailing punctuation that the entry lacks is carried over.
+
+        Args:
+            text: Sentence to look up
+
+        Returns:
+            Approved translation, or None if there is no full-sentence entry
+        """
+        key = _normalize(text)
+        target = self._exact.get(key)
+        if target is not None:
+            return target
+
+        stripped = key.rstrip(_TRAILING_PUNCTUATION).rstrip()
+        if stripped != key:
+            target = self._exact.get(stripped)
+            if target is not None:
+                return target + key[len(stripped) :].strip()
+
+        return None
+
+    def find_terms(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find glossary terms in a text.
+
+        Overlapping matches are resolved leftmost-longest.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            List of (start, end, translation) for non-overlapping whole-word matches
+        """
+        self._build()
+
+        matches = []
+        folded = _fold(text)
+        node = 0
+        for end, char in enumerate(folded, start=1):
+            # Any whitespace character matches a space of the normalized terms
+            if char.isspace():
+                char = " "
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for length, key in self._output[node]:
+                start = end - length
+                if self._is_word_boundary(text, start, end):
+                    matches.append((start, end, self._exact[key]))
+
+        # Prefer the earliest, then the longest match
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        terms = []
+        position = 0
+        for start, end, target in matches:
+            if start >= position:
+                terms.append((start, end, target))
+                position = end
+        return terms
+
+    def protect(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Replace glossary terms with numbered placeholders.
+
+        Args:
+            text: Text to translate
+
+        Returns:
+            Text with placeholders, and the translations they stand for
+        """
+        pieces = []
+        targets = []
+        position = 0
+        for start, end, target in self.find_terms(text):
+            pieces.append(text[position:start])
+            pieces.append(PLACEHOLDER.format(len(targets)))
+            targets.append(target)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces), targets
+
+    @staticmethod
+    def restore(translation: str, targets: List[str]) -> Optional[str]:
+        """
+        Put the approved translations back in place of the placeholders.
+
+        Args:
+            translation: Model output for a protected text
+            targets: Translations returned by ``protect``
+
+        Returns:
+            Restored translation, or None if the model lost or invented a placeholder
+        """
+        found = [int(i) for i in _PLACEHOLDER_PATTERN.findall(translation)]
+        if sorted(found) != list(range(len(targets))):
+            return None
+
+        return _PLACEHOLDER_PATTERN.sub(lambda m: targets[int(m.group(1))], translation)
+
+    @staticmethod
+    def _is_word_boundary(text: str, start: int, end: int) -> bool:
+        """Whether text[start:end] is not part of a longer word."""
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def _build(self) -> None:
+        """Compute failure links breadth-first after entries were added."""
+        if self._built:
+            return
+
+        for node, term in enumerate(self._term):
+            self._fail[node] = 0
+            self._output[node] = [term] if term else []
+
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                if target == child:
+                    target = 0
+                self._fail[child] = target
+
+                # A match here also ends every shorter term along the failure chain
+                self._output[child] = self._output[child] + self._output[target]
+
+        self._built = True
@@ -0,0 +1,454 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from translator_by_speech.client import ModelClient
+
+# Audio clip used as a request: (name, samples, sampling rate)
+AudioInput = Tuple[str, np.ndarray, int]
+
+# Async callable that processes one clip, e.g. SpeechTranslationPipeline.atranslate_speech
+Target = Callable[[np.ndarray, int], Awaitable[Any]]
+
+
+def load_wav_directory(directory: str) -> List[AudioInput]:
+    """
+    Load every WAV file of a directory as load-test input.
+
+    Args:
+        directory: Directory containing WAV files
+
+    Returns:
+        List of (file name, samples, sampling rate), sorted by file name
+    """
+    # Import here to avoid loading the models' dependencies for synthetic runs
+    from translator_by_speech.speech_recognition import ASRModel
+
+    inputs = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(".wav"):
+            audio, sampling_rate = ASRModel.load_audio_file(
+                os.path.join(directory, name)
+            )
+            inputs.append((name, audio, sampling_rate))
+
+    if not inputs:
+        raise ValueError(f"No WAV files found in {directory}")
+    return inputs
+
+
+def synthetic_audio(
+    count: int = 8,
+    seconds: float = 5.0,
+    sampling_rate: int = 16000,
+    seed: int = 0,
+) -> List[AudioInput]:
+    """
+    Generate speech-like clips: tones with a syllable-rate envelope and noise.
+
+    Args:
+        count: Number of clips
+        seconds: Duration of each clip
+        sampling_rate: Sampling rate of the clips
+        seed: Random seed, so runs are repeatable
+
+    Returns:
+        List of (name, samples, sampling rate)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sampling_rate)) / sampling_rate
+
+    inputs = []
+    for i in range(count):
+        pitch = rng.uniform(100, 250)
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+        audio = 0.3 * envelope * np.sin(2 * np.pi * pitch * t)
+        audio += rng.normal(0, 0.01, len(t))
+        inputs.append((f"synthetic-{i}", audio.astype(np.float32), sampling_rate))
+    return inputs
+
+
+class LoadGenerator:
+    """
+    Replays audio clips against a target and records the latency of each request.
+
+    In closed-loop mode ``concurrency`` clients send requests back to back. In
+    open-loop mode requests arrive at ``rate`` per second (Poisson arrivals)
+    whatever the response times are, and at most ``concurrency`` are in
+    flight; time spent waiting for a free slot is reported as queueing delay.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        inputs: List[AudioInput],
+        concurrency: int = 4,
+        rate: Optional[float] = None,
+        requests: Optional[int] = None,
+        duration: Optional[float] = None,
+        timeout: Optional[float] = None,
+        interval: float = 10.0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the load generator.
+
+        Args:
+            target: Async callable processing one clip
+            inputs: Clips replayed in order, cycling
+            concurrency: Closed loop: number of clients; open loop: maximum
+                number of requests in flight
+            rate: Arrivals per second for open-loop mode (closed loop if None)
+            requests: Total number of requests to send
+            duration: Seconds to keep sending requests
+            timeout: Seconds after which a request counts as failed
+            interval: Width of the time windows of the report timeline
+            seed: Random seed for open-loop arrival times
+        """
+        if not inputs:
+            raise ValueError("inputs must not be empty")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if requests is None and duration is None:
+            requests = len(inputs)
+
+        self.target = target
+        self.inputs = inputs
+        self.concurrency = concurrency
+        self.rate = rate
+        self.requests = requests
+        self.duration = duration
+        self.timeout = timeout
+        self.interval = interval
+        self.random = random.Random(seed)
+
+        self.records: List[Dict[str, Any]] = []
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Send the load and wait for all requests to finish.
+
+        Returns:
+            Summary of the run (see ``summarize``)
+        """
+        self.records = []
+        self._start = time.perf_counter()
+        self._sent = 0
+
+        if self.rate is None:
+            await asyncio.gather(*(self._client() for _ in range(self.concurrency)))
+        else:
+            await self._open_loop()
+
+        return summarize(self.records, time.perf_counter() - self._start, self.interval)
+
+    def _next_input(self) -> Optional[Tuple[int, AudioInput]]:
+        """Next clip to send, or None when the run is over."""
+        if self.requests is not None and self._sent >= self.requests:
+            return None
+        if (
+            self.duration is not None
+            and time.perf_counter() - self._start >= self.duration
+        ):
+            return None
+
+        index = self._sent
+        self._sent += 1
+        return index, self.inputs[index % len(self.inputs)]
+
+    async def _client(self) -> None:
+        """Closed-loop client: send the next request as soon as one finishes."""
+        while True:
+            item = self._next_input()
+            if item is None:
+                return
+            await self._request(item, time.perf_counter())
+
+    async def _open_loop(self) -> None:
+        """Open-loop arrivals at the configured rate."""
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = []
+        next_arrival = time.perf_counter()
+
+        while True:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            item = self._next_input()
+            if item is None:
+                break
+            tasks.append(asyncio.ensure_future(self._queued(item, next_arrival, slots)))
+            next_arrival += self.random.expovariate(self.rate)
+
+        await asyncio.gather(*tasks)
+
+    async def _queued(
+        self,
+        item: Tuple[int, AudioInput],
+        arrival: float,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        async with slots:
+            await self._request(item, arrival)
+
+    async def _request(self, item: Tuple[int, AudioInput], arrival: float) -> None:
+        """Send one request and record its timings."""
+        index, (name, audio, sampling_rate) = item
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(self.target(audio, sampling_rate), self.timeout)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        end = time.perf_counter()
+
+        self.records.append(
+            {
+                "index": index,
+                "input": name,
+                "arrival": arrival - self._start,
+                "start": start - self._start,
+                "end": end - self._start,
+                "queueing_delay": start - arrival,
+                "latency": end - arrival,
+                "error": error,
+            }
+        )
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p90/p99 and max of a list of seconds."""
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99), "max": max(values)}
+
+
+def summarize(
+    records: List[Dict[str, Any]], elapsed: float, interval: float = 10.0
+) -> Dict[str, Any]:
+    """
+    Summarize request records of a load-test run.
+
+    Args:
+        records: Records collected by LoadGenerator
+        elapsed: Wall time of the run
+        interval: Width of the time windows in "timeline"
+
+    Returns:
+        Dictionary with totals, throughput, latency and queueing-delay
+        percentiles, error rate, and the same metrics per time window
+    """
+    succeeded = [r for r in records if r["error"] is None]
+    summary = {
+        "requests": len(records),
+        "errors": len(records) - len(succeeded),
+        "error_rate": (len(records) - len(succeeded)) / max(len(records), 1),
+        "elapsed": elapsed,
+        "throughput": len(succeeded) / elapsed if elapsed > 0 else 0.0,
+        "latency": _percentiles([r["latency"] for r in succeeded]),
+        "queueing_delay": _percentiles([r["queueing_delay"] for r in records]),
+        "timeline": [],
+    }
+
+    # Bucket requests by completion time
+    windows: Dict[int, List[Dict[str, Any]]] = {}
+    for record in records:
+        windows.setdefault(int(record["end"] // interval), []).append(record)
+
+    for window in sorted(windows):
+        window_records = windows[window]
+        window_succeeded = [r for r in window_records if r["error"] is None]
+        summary["timeline"].append(
+            {
+                "start": window * interval,
+                "requests": len(window_records),
+                "throughput": len(window_succeeded) / interval,
+                "error_rate": 1 - len(window_succeeded) / len(window_records),
+                "latency_p50": _percentiles([r["latency"] for r in window_succeeded])[
+                    "p50"
+                ],
+                "queueing_delay_p50": _percentiles(
+                    [r["queueing_delay"] for r in window_records]
+                )["p50"],
+            }
+        )
+
+    return summary
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    """Human-readable load-test report."""
+
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.3f}s"
+
+    lines = [
+        (
+            f"Requests: {summary['requests']} ({summary['errors']} errors, "
+            f"{summary['error_rate']:.1%} error rate) in {summary['elapsed']:.1f}s"
+        ),
+        f"Throughput: {summary['throughput']:.2f} requests/s",
+    ]
+    for metric in ("latency", "queueing_delay"):
+        values = summary[metric]
+        lines.append(
+            f"{metric.replace('_', ' ').capitalize()}: "
+            + ", ".join(f"{k} {seconds(v)}" for k, v in values.items())
+        )
+
+    lines.append("Timeline:")
+    for window in summary["timeline"]:
+        lines.append(
+            f"  {window['start']:6.0f}s  {window['requests']:4d} req  "
+            f"{window['throughput']:6.2f} req/s  "
+            f"errors {window['error_rate']:.1%}  "
+            f"p50 {seconds(window['latency_p50'])}  "
+            f"queue p50 {seconds(window['queueing_delay_p50'])}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Load test the speech pipeline")
+    parser.add_argument("--wav-dir", help="Directory of WAV files to replay")
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=8,
+        metavar="N",
+        help="Number of synthetic clips when no --wav-dir is given (default: 8)",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=5.0, help="Synthetic clip duration"
+    )
+    parser.add_argument(
+        "--source",
+        "-s",
+        choices=["en", "vi", "auto"],
+        default="vi",
+        help="Source language (default: vi)",
+    )
+    parser.add_argument(
+        "--concurrency", "-c", type=int, default=4, help="Clients or in-flight limit"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop arrivals per second (closed loop if omitted)",
+    )
+    parser.add_argument("--requests", "-n", type=int, help="Total requests to send")
+    parser.add_argument("--duration", type=float, help="Seconds to send requests")
+    parser.add_argument("--timeout", type=float, help="Per-request timeout in seconds")
+    parser.add_argument(
+        "--interval", type=float, default=10.0, help="Timeline window in seconds"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Concurrent inference calls per model (default: 1)",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Send requests to the model server on this socket instead of "
+        "loading the models in process",
+    )
+    return parser.parse_args()
+
+
+def server_target(socket_path: str, source_lang: str = "vi") -> Target:
+    """
+    Target sending each clip to a running model server.
+
+    Args:
+        socket_path: Unix socket of the model server
+        source_lang: Source language ("vi", "en" or "auto")
+
+    Returns:
+        Async callable processing one clip
+    """
+    client = ModelClient.connect(socket_path)
+    if client is None:
+        raise ValueError(f"No model server is running on {socket_path}")
+    target_lang = "vi" if source_lang == "en" else "en"
+
+    async def target(audio_array: np.ndarray, sampling_rate: int) -> Any:
+        return await asyncio.to_thread(
+            client.translate_audio, audio_array, sampling_rate, source_lang, target_lang
+        )
+
+    return target
+
+
+def main() -> None:
+    """Run a load test against an in-process pipeline or a model server."""
+    args = parse_args()
+    if args.wav_dir:
+        inputs = load_wav_directory(args.wav_dir)
+    else:
+        inputs = synthetic_audio(args.synthetic, args.seconds)
+
+    if args.socket:
+        run_load_test(server_target(args.socket, args.source), inputs, args)
+        return
+
+    # Import here to avoid loading the models' dependencies for --help
+    from translator_by_speech.pipeline import SpeechTranslationPipeline
+    from translator_by_speech.speech_recognition import ASRModel
+    from translator_by_speech.translator import (
+        create_en2vi_translator,
+        create_vi2en_translator,
+    )
+
+    print("Loading models...")
+    asr_model = ASRModel(max_concurrency=args.max_concurrency)
+    translators = {}
+    if args.source in ("vi", "auto"):
+        translators["vi"] = create_vi2en_translator(
+            max_concurrency=args.max_concurrency
+        )
+    if args.source in ("en", "auto"):
+        translators["en"] = create_en2vi_translator(
+            max_concurrency=args.max_concurrency
+        )
+    pipeline = SpeechTranslationPipeline(
+        asr_model=asr_model,
+        translator_model=translators.get(args.source),
+        source_lang=args.source,
+        target_lang="vi_VN" if args.source == "en" else "en_XX",
+        translators=translators,
+    )
+
+    run_load_test(pipeline.atranslate_speech, inputs, args)
+
+
+def run_load_test(
+    target: Target, inputs: List[AudioInput], args: argparse.Namespace
+) -> None:
+    """Replay the inputs against a target and print the report."""
+    generator = LoadGenerator(
+        target,
+        inputs,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        requests=args.requests,
+        duration=args.duration,
+        timeout=args.timeout,
+        interval=args.interval,
+    )
+    mode = f"open loop at {args.rate}/s" if args.rate else "closed loop"
+    print(f"Replaying {len(inputs)} clips, {mode}, concurrency {args.concurrency}")
+    print(format_report(asyncio.run(generator.run())))
+
+
+if __name__ == "__main__":
+    main()
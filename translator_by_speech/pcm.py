@@ -0,0 +1,89 @@
+import threading
+from typing import Union
+
+import numpy as np
+
+PCMData = Union[bytes, bytearray, memoryview, np.ndarray]
+
+# Scale that maps int16 samples to [-1.0, 1.0)
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def as_int16(pcm: PCMData) -> np.ndarray:
+    """
+    View raw 16-bit PCM as an int16 array without copying.
+
+    Args:
+        pcm: Little-endian int16 PCM as bytes, bytearray, memoryview or array
+
+    Returns:
+        One-dimensional int16 array sharing memory with ``pcm`` when possible
+    """
+    if isinstance(pcm, np.ndarray):
+        if pcm.dtype != np.int16:
+            raise ValueError(f"Expected int16 PCM, got {pcm.dtype}")
+        return pcm.reshape(-1)
+
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+def peak_amplitude(audio_array: np.ndarray) -> float:
+    """
+    Peak absolute amplitude, without allocating an ``abs`` temporary.
+
+    Args:
+        audio_array: Audio samples
+
+    Returns:
+        Largest absolute sample value (0.0 for empty input)
+    """
+    if audio_array.size == 0:
+        return 0.0
+    return float(max(audio_array.max(), -audio_array.min()))
+
+
+class PCMConverter:
+    """
+    Converts int16 PCM to float32 in one pass into a reusable buffer.
+
+    Each thread gets its own buffer, which grows as needed and is reused by
+    later calls, so repeated conversions do not allocate.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def convert(self, pcm: PCMData, channels: int = 1) -> np.ndarray:
+        """
+        Scale int16 PCM to float32 in [-1.0, 1.0), downmixing to mono.
+
+        Args:
+            pcm: Interleaved little-endian int16 PCM
+            channels: Number of interleaved channels
+
+        Returns:
+            Float32 view into the thread's buffer; it is overwritten by the
+            next call on the same thread, so copy it to keep it
+        """
+        samples = as_int16(pcm)
+        num_frames = len(samples) // channels
+        out = self._buffer(num_frames)
+
+        if channels == 1:
+            np.multiply(samples, INT16_SCALE, out=out)
+        else:
+            frames = samples[: num_frames * channels].reshape(num_frames, channels)
+            np.sum(frames, axis=1, dtype=np.float32, out=out)
+            out *= INT16_SCALE / channels
+
+        return out
+
+    def _buffer(self, size: int) -> np.ndarray:
+        """Return a float32 buffer of ``size`` samples, growing it if needed."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) < size:
+            # Grow geometrically so slowly increasing sizes do not reallocate each time
+            capacity = max(size, 2 * len(buffer) if buffer is not None else 0)
+            buffer = np.empty(capacity, dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer[:size]
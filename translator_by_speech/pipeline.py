@@ -1,10 +1,25 @@
-from typing import Dict, Optional
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
-from translator_by_speech.speech_recognition import ASRModel
+from translator_by_speech.batch import AudioPrefetcher, batched
+from translator_by_speech.results import model_version
+from translator_by_speech.segmentation import (
+    join_translations,
+    make_batches,
+    split_sentences,
+    translate_segmented,
+    translate_segmented_batch,
+)
+from translator_by_speech.speech_recognition import AUTO_LANGUAGE, ASRModel
+from translator_by_speech.streaming import IncrementalTranslator
 from translator_by_speech.translator import TranslationModel
 
+# Target language of each detected source language in "auto" mode
+AUTO_TARGET_LANGS = {"vi": "en_XX", "en": "vi_VN"}
+
 
 class SpeechTranslationPipeline:
     """Pipeline that combines ASR and translation for end-to-end speech translation."""
@@ -15,6 +30,8 @@ class SpeechTranslationPipeline:
         translator_model: Optional[TranslationModel] = None,
         source_lang: str = "vi",
         target_lang: str = "en_XX",
+        translation_batch_size: int = 16,
+        translators: Optional[Dict[str, TranslationModel]] = None,
     ):
         """
         Initialize the speech translation pipeline.
@@ -22,8 +39,12 @@ class SpeechTranslationPipeline:
         Args:
             asr_model: ASR model instance (creates a new one if None)
             translator_model: Translation model instance (creates a new one if None)
-            source_lang: Source language code for ASR
-            target_lang: Target language code for translation
+            source_lang: Source language code for ASR, or "auto" to detect the
+                language of each input and route it to the matching translator
+            target_lang: Target language code for translation (ignored for "auto")
+            translation_batch_size: Maximum number of sentences per translation batch
+            translators: Translation models keyed by source language for "auto"
+                (creates vi→en and en→vi models if None)
         """
         # Import here to avoid circular imports
         from translator_by_speech.translator import (
@@ -33,22 +54,39 @@ class SpeechTranslationPipeline:
 
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.translation_batch_size = translation_batch_size
 
         # Initialize ASR model if not provided
         self.asr_model = asr_model or ASRModel()
 
+        # Detected languages are routed to one translator per source language
+        if source_lang == AUTO_LANGUAGE:
+            translators = translators or {
+                "vi": create_vi2en_translator(),
+                "en": create_en2vi_translator(),
+            }
+            target_langs = AUTO_TARGET_LANGS
+
         # Initialize translation model if not provided
-        if translator_model is None:
-            if source_lang == "vi" and target_lang == "en_XX":
-                translator_model = create_vi2en_translator()
-            elif source_lang == "en" and target_lang == "vi_VN":
-                translator_model = create_en2vi_translator()
-            else:
-                raise ValueError(
-                    f"Unsupported language pair: {source_lang} -> {target_lang}"
-                )
+        else:
+            if translator_model is None:
+                if source_lang == "vi" and target_lang == "en_XX":
+                    translator_model = create_vi2en_translator()
+                elif source_lang == "en" and target_lang == "vi_VN":
+                    translator_model = create_en2vi_translator()
+                else:
+                    raise ValueError(
+                        f"Unsupported language pair: {source_lang} -> {target_lang}"
+                    )
+            translators = {source_lang: translator_model}
+            target_langs = {source_lang: target_lang}
 
         self.translator_model = translator_model
+        self.translators = translators
+        self.target_langs = target_langs
+
+        # Decoding stats of the latest translate_speech_from_files run
+        self.prefetch_stats: Optional[Dict[str, Any]] = None
 
     def translate_speech_from_file(self, file_path: str) -> Dict[str, str]:
         """
@@ -61,20 +99,71 @@ class SpeechTranslationPipeline:
             Dictionary with original transcription and translation
         """
         # Transcribe audio to text
+        start = time.perf_counter()
         asr_result = self.asr_model.transcribe_audio_file(
             file_path, language=self.source_lang
         )
+        asr_seconds = time.perf_counter() - start
 
-        # Translate the transcribed text
-        transcription = asr_result["text"]
-        translation = self.translator_model.translate(transcription)
+        # Translate the transcribed text sentence by sentence
+        translator_model = self._route(asr_result)
+        start = time.perf_counter()
+        translation = translate_segmented(
+            translator_model.translate,
+            asr_result["text"],
+            batch_size=self.translation_batch_size,
+        )
 
-        return {
-            "source_text": transcription,
-            "source_lang": self.source_lang,
-            "translated_text": translation,
-            "target_lang": self.target_lang,
-        }
+        return self._make_result(
+            asr_result, translation, asr_seconds, time.perf_counter() - start
+        )
+
+    def translate_speech_segments_from_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Transcribe an audio file with segment timestamps and translate each segment.
+
+        The text of all segments is translated together in batched calls, so
+        subtitling a long file costs one batched translation pass rather than
+        one call per segment.
+
+        Args:
+            file_path: Path to the audio file
+
+        Returns:
+            Result dictionary whose "segments" lists the start and end
+            (seconds), source text and translated text of each segment
+        """
+        start = time.perf_counter()
+        asr_result = self.asr_model.transcribe_audio_file(
+            file_path, language=self.source_lang, return_timestamps=True
+        )
+        asr_seconds = time.perf_counter() - start
+
+        segments = asr_result.get("segments") or []
+        translator_model = self._route(asr_result)
+        start = time.perf_counter()
+        translations = translate_segmented_batch(
+            translator_model.translate,
+            [segment["text"] for segment in segments],
+            batch_size=self.translation_batch_size,
+        )
+
+        result = self._make_result(
+            asr_result,
+            " ".join(t for t in translations if t),
+            asr_seconds,
+            time.perf_counter() - start,
+        )
+        result["segments"] = [
+            {
+                "start": segment["start"],
+                "end": segment["end"],
+                "source_text": segment["text"],
+                "translated_text": translation,
+            }
+            for segment, translation in zip(segments, translations)
+        ]
+        return result
 
     def translate_speech(
         self, audio_array: np.ndarray, sampling_rate: int
@@ -90,17 +179,279 @@ class SpeechTranslationPipeline:
             Dictionary with original transcription and translation
         """
         # Transcribe audio to text
+        start = time.perf_counter()
         asr_result = self.asr_model.transcribe_audio(
             audio_array, sampling_rate, language=self.source_lang
         )
+        asr_seconds = time.perf_counter() - start
+
+        return self.translate_transcription(asr_result, asr_seconds)
+
+    def translate_transcription(
+        self, asr_result: Dict[str, Any], asr_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Translate a transcription and build the result dictionary.
+
+        Args:
+            asr_result: Transcription result of the ASR model
+            asr_seconds: Time the transcription took
+
+        Returns:
+            Dictionary with original transcription and translation
+        """
+        # Translate the transcribed text sentence by sentence
+        translator_model = self._route(asr_result)
+        start = time.perf_counter()
+        translation = translate_segmented(
+            translator_model.translate,
+            asr_result["text"],
+            batch_size=self.translation_batch_size,
+        )
+
+        return self._make_result(
+            asr_result, translation, asr_seconds, time.perf_counter() - start
+        )
+
+    def translate_speech_from_files(
+        self,
+        file_paths: Iterable[str],
+        batch_size: int = 8,
+        prefetch_depth: int = 16,
+        decode_workers: int = 2,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Process many audio files, decoding upcoming files while the models run.
+
+        Short files are transcribed ``batch_size`` at a time in one generate
+        call and their sentences are translated together; files longer than
+        30 seconds go through the streaming long-form path one by one.
+        Decoding stats are available in ``prefetch_stats``.
+
+        Args:
+            file_paths: Paths to the audio files
+            batch_size: Maximum number of files per ASR batch
+            prefetch_depth: Maximum number of files decoded ahead
+            decode_workers: Number of decoding threads
+
+        Yields:
+            Result dictionaries in input order, each with a "file_path" key;
+            files that failed carry an "error" message instead of text
+        """
+
+        def load(file_path: str):
+            # Long files are streamed later instead of being decoded whole
+            if self.asr_model.is_long_audio_file(file_path):
+                return None
+            return self.asr_model.load_audio_file(file_path)
+
+        prefetcher = AudioPrefetcher(
+            file_paths, load, workers=decode_workers, depth=prefetch_depth
+        )
+        self.prefetch_stats = prefetcher.stats
+
+        for batch in batched(prefetcher, batch_size):
+            clips = [item for item in batch if item[1] is not None]
+            results: Dict[str, Dict[str, str]] = {}
+
+            if clips:
+                start = time.perf_counter()
+                asr_results = self.asr_model.transcribe_audio_batch(
+                    [audio for _, (audio, _), _ in clips],
+                    [rate for _, (_, rate), _ in clips],
+                    language=self.source_lang,
+                )
+                asr_seconds = (time.perf_counter() - start) / len(clips)
+
+                # Translate the files of each detected language together
+                groups: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+                for (file_path, _, _), asr_result in zip(clips, asr_results):
+                    try:
+                        translator_model = self._route(asr_result)
+                    except ValueError as e:
+                        results[file_path] = {"error": str(e)}
+                        continue
+                    groups.setdefault(id(translator_model), []).append(
+                        (file_path, asr_result)
+                    )
+
+                for group in groups.values():
+                    start = time.perf_counter()
+                    translations = translate_segmented_batch(
+                        self._route(group[0][1]).translate,
+                        [asr_result["text"] for _, asr_result in group],
+                        batch_size=self.translation_batch_size,
+                    )
+                    translation_seconds = (time.perf_counter() - start) / len(group)
+                    for (file_path, asr_result), translation in zip(
+                        group, translations
+                    ):
+                        results[file_path] = self._make_result(
+                            asr_result, translation, asr_seconds, translation_seconds
+                        )
+
+            for file_path, decoded, error in batch:
+                if error is not None:
+                    yield {"file_path": file_path, "error": str(error)}
+                elif decoded is None:
+                    try:
+                        result = self.translate_speech_from_file(file_path)
+                    except Exception as e:
+                        yield {"file_path": file_path, "error": str(e)}
+                        continue
+                    yield {"file_path": file_path, **result}
+                else:
+                    yield {"file_path": file_path, **results[file_path]}
+
+    def create_incremental_translator(
+        self, sampling_rate: int, agreement: int = 2, **kwargs
+    ) -> IncrementalTranslator:
+        """
+        Create a simultaneous translator that shares this pipeline's models.
+
+        Args:
+            sampling_rate: Sampling rate of the incoming audio
+            agreement: Number of successive ASR passes that must agree on a word
+            **kwargs: Extra options for IncrementalTranslator
+
+        Returns:
+            IncrementalTranslator for streaming audio of one speaker
+        """
+        if self.source_lang == AUTO_LANGUAGE:
+            raise ValueError("Incremental translation needs a fixed source language")
+
+        return IncrementalTranslator(
+            asr_model=self.asr_model,
+            translator_model=self.translator_model,
+            sampling_rate=sampling_rate,
+            source_lang=self.source_lang,
+            agreement=agreement,
+            **kwargs,
+        )
+
+    async def atranslate_speech_from_file(
+        self, file_path: str, timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Asynchronously process audio file through ASR and translation.
+
+        Decoding and inference run on the models' executors, so many pipelines
+        can be awaited concurrently. Cancelling the task abandons the request.
 
-        # Translate the transcribed text
-        transcription = asr_result["text"]
-        translation = self.translator_model.translate(transcription)
+        Args:
+            file_path: Path to the audio file
+            timeout: Seconds to wait for the whole request
 
+        Returns:
+            Dictionary with original transcription and translation
+        """
+
+        async def _run() -> Dict[str, str]:
+            start = time.perf_counter()
+            asr_result = await self.asr_model.atranscribe_audio_file(
+                file_path, language=self.source_lang
+            )
+            return await self._atranslate_result(
+                asr_result, time.perf_counter() - start
+            )
+
+        return await asyncio.wait_for(_run(), timeout)
+
+    async def atranslate_speech(
+        self,
+        audio_array: np.ndarray,
+        sampling_rate: int,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, str]:
+        """
+        Asynchronously process audio array through ASR and translation.
+
+        Args:
+            audio_array: Numpy array of audio samples
+            sampling_rate: Sampling rate of the audio
+            timeout: Seconds to wait for the whole request
+
+        Returns:
+            Dictionary with original transcription and translation
+        """
+
+        async def _run() -> Dict[str, str]:
+            start = time.perf_counter()
+            asr_result = await self.asr_model.atranscribe_audio(
+                audio_array, sampling_rate, language=self.source_lang
+            )
+            return await self._atranslate_result(
+                asr_result, time.perf_counter() - start
+            )
+
+        return await asyncio.wait_for(_run(), timeout)
+
+    async def _atranslate_result(
+        self, asr_result: Dict[str, Any], asr_seconds: Optional[float] = None
+    ) -> Dict[str, str]:
+        """Translate a transcription asynchronously and build the result dictionary."""
+        translator_model = self._route(asr_result)
+        start = time.perf_counter()
+        pieces, separators = split_sentences(asr_result["text"])
+        batches = make_batches(pieces, self.translation_batch_size)
+
+        # Batches are queued on the translator's executor together
+        batch_translations = await asyncio.gather(
+            *(
+                translator_model.atranslate([pieces[i] for i in batch])
+                for batch in batches
+            )
+        )
+
+        translations = [""] * len(pieces)
+        for batch, batch_translation in zip(batches, batch_translations):
+            for i, translated_text in zip(batch, batch_translation):
+                translations[i] = translated_text
+
+        translation = join_translations(translations, separators)
+
+        return self._make_result(
+            asr_result, translation, asr_seconds, time.perf_counter() - start
+        )
+
+    def _source_lang(self, asr_result: Dict[str, Any]) -> str:
+        """Language of a transcription: the detected one in "auto" mode."""
+        if self.source_lang == AUTO_LANGUAGE:
+            return asr_result.get("language") or AUTO_LANGUAGE
+        return self.source_lang
+
+    def _route(self, asr_result: Dict[str, Any]) -> TranslationModel:
+        """Translator for the language of a transcription."""
+        source_lang = self._source_lang(asr_result)
+        if source_lang not in self.translators:
+            raise ValueError(f"No translator for source language: {source_lang}")
+        return self.translators[source_lang]
+
+    def _make_result(
+        self,
+        asr_result: Dict[str, Any],
+        translation: str,
+        asr_seconds: Optional[float] = None,
+        translation_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the result dictionary of a translated transcription.
+
+        Batched calls pass each input's share of the batch time.
+        """
+        source_lang = self._source_lang(asr_result)
         return {
-            "source_text": transcription,
-            "source_lang": self.source_lang,
+            "source_text": asr_result["text"],
+            "source_lang": source_lang,
             "translated_text": translation,
-            "target_lang": self.target_lang,
+            "target_lang": self.target_langs[source_lang],
+            "language_probability": asr_result.get("language_probability"),
+            "timings": {
+                "asr_seconds": asr_seconds,
+                "translation_seconds": translation_seconds,
+            },
+            "models": {
+                "asr": model_version(self.asr_model),
+                "translation": model_version(self.translators[source_lang]),
+            },
         }
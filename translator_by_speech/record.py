@@ -4,6 +4,15 @@ import os
 import time
 from datetime import datetime
 
+import numpy as np
+
+from translator_by_speech.capture import CallbackCapture
+from translator_by_speech.ring_buffer import AudioRingBuffer
+
+# PortAudio error code of a blocking read after an input overflow
+# (pyaudio.paInputOverflowed)
+PA_INPUT_OVERFLOWED = -9981
+
 
 class AudioRecorder:
     def __init__(self, output_directory="recordings"):
@@ -21,6 +30,9 @@ class AudioRecorder:
         # PyAudio instance
         self.audio = pyaudio.PyAudio()
 
+        # Input overflows seen by listen (audio lost while the caller was busy)
+        self.overflows = 0
+
     def record(self, duration=5, filename=None):
         """
         Record audio for a specified duration.
@@ -67,7 +79,14 @@ class AudioRecorder:
         return filepath
 
     def record_until_silence(
-        self, silence_threshold=1000, silence_duration=2, max_duration=60, filename=None
+        self,
+        silence_threshold=1000,
+        silence_duration=2,
+        max_duration=60,
+        filename=None,
+        on_pause=None,
+        on_resume=None,
+        pause_duration=0.3,
     ):
         """
         Record audio until silence is detected or max duration is reached.
@@ -77,6 +96,12 @@ class AudioRecorder:
             silence_duration (int): Consecutive seconds of silence to stop recording
             max_duration (int): Maximum recording duration in seconds
             filename (str, optional): Output filename. If None, generates a timestamped filename.
+            on_pause (callable, optional): Called with the int16 samples recorded
+                so far when speech pauses for ``pause_duration`` seconds, e.g. to
+                start transcribing before the silence is confirmed
+            on_resume (callable, optional): Called without arguments when speech
+                resumes after on_pause was called
+            pause_duration (float): Seconds of silence after speech that count as a pause
 
         Returns:
             str: Path to the saved audio file
@@ -102,6 +127,9 @@ class AudioRecorder:
         frames = []
         silence_count = 0
         start_time = time.time()
+        pause_chunks = max(int(pause_duration * self.rate / self.chunk), 1)
+        heard_speech = False
+        paused = False
 
         # Record audio until silence is detected or max duration is reached
         while True:
@@ -109,15 +137,23 @@ class AudioRecorder:
             frames.append(data)
 
             # Check for silence (simplified approach)
-            amplitude = max(
-                abs(int.from_bytes(data[i : i + 2], byteorder="little", signed=True))
-                for i in range(0, len(data), 2)
-            )
+            amplitude = self._amplitude(np.frombuffer(data, dtype=np.int16))
 
             if amplitude < silence_threshold:
                 silence_count += 1
             else:
                 silence_count = 0
+                heard_speech = True
+                if paused:
+                    paused = False
+                    if on_resume is not None:
+                        on_resume()
+
+            # Report each pause once, with everything recorded so far
+            if heard_speech and not paused and silence_count == pause_chunks:
+                paused = True
+                if on_pause is not None:
+                    on_pause(np.frombuffer(b"".join(frames), dtype=np.int16))
 
             # Check if silence duration threshold is reached
             if silence_count >= int(silence_duration * self.rate / self.chunk):
@@ -138,6 +174,145 @@ class AudioRecorder:
 
         return filepath
 
+    def listen(
+        self,
+        silence_threshold=1000,
+        silence_duration=2,
+        max_duration=60,
+        pre_roll=0.5,
+    ):
+        """
+        Continuously capture audio and yield each detected utterance.
+
+        Audio is written into a preallocated ring buffer, so memory stays
+        constant however long the session runs. An utterance starts when a
+        chunk exceeds the silence threshold and includes up to ``pre_roll``
+        seconds of audio from before that chunk, so the onset of speech is not
+        lost. Capture stops when the generator is closed.
+
+        Args:
+            silence_threshold (int): Amplitude threshold to consider as silence
+            silence_duration (float): Consecutive seconds of silence that end an utterance
+            max_duration (float): Maximum utterance duration in seconds
+            pre_roll (float): Seconds of audio kept before speech is detected
+
+        Yields:
+            numpy.ndarray: Read-only int16 view of the utterance samples. The view
+            is only valid until the next utterance is requested; copy it (or
+            save it with save_samples) to keep it.
+        """
+        pre_roll_samples = int(pre_roll * self.rate)
+        max_samples = int(max_duration * self.rate)
+        silence_chunks = int(silence_duration * self.rate / self.chunk)
+
+        # Room for the longest utterance, its pre-roll and the chunk being read
+        ring = AudioRingBuffer(max_samples + pre_roll_samples + 2 * self.chunk)
+
+        # Open audio stream
+        stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk,
+        )
+
+        start = None
+        silence_count = 0
+        last_end = 0
+
+        try:
+            while True:
+                samples = np.frombuffer(self._read_chunk(stream), dtype=np.int16)
+                chunk_start = ring.total_written
+                ring.write(samples)
+
+                is_silent = self._amplitude(samples) < silence_threshold
+
+                if start is None:
+                    if is_silent:
+                        continue
+                    # Speech detected: include the pre-roll, but not audio
+                    # that belonged to the previous utterance
+                    start = max(chunk_start - pre_roll_samples, last_end, ring.oldest)
+                    silence_count = 0
+                    continue
+
+                silence_count = silence_count + 1 if is_silent else 0
+                end = ring.total_written
+
+                if silence_count >= silence_chunks or end - start >= max_samples:
+                    last_end = end
+                    utterance = ring.view(start, end)
+                    start = None
+                    yield utterance
+        finally:
+            # Stop and close the stream
+            stream.stop_stream()
+            stream.close()
+
+    def _read_chunk(self, stream):
+        """
+        Read one chunk, counting input overflows instead of raising on them.
+
+        PortAudio's input buffer overflows while the consumer of ``listen``
+        handles an utterance; the audio it lost cannot be recovered, but the
+        session goes on.
+        """
+        try:
+            return stream.read(self.chunk)
+        except OSError as e:
+            if e.errno != PA_INPUT_OVERFLOWED:
+                raise
+            self.overflows += 1
+            return stream.read(self.chunk, exception_on_overflow=False)
+
+    def capture(self, max_queue=64):
+        """
+        Create a non-blocking callback-mode capture using this recorder's settings.
+
+        Args:
+            max_queue (int): Maximum number of buffers waiting for the consumer
+
+        Returns:
+            CallbackCapture: Capture to use as a context manager, iterating over
+            frames() or with ``async for``
+        """
+        return CallbackCapture(
+            self.audio,
+            rate=self.rate,
+            channels=self.channels,
+            chunk=self.chunk,
+            max_queue=max_queue,
+        )
+
+    def save_samples(self, samples, filename=None):
+        """
+        Save int16 samples (e.g. an utterance from listen) to a WAV file.
+
+        Args:
+            samples (numpy.ndarray): Samples to save
+            filename (str, optional): Output filename. If None, generates a timestamped filename.
+
+        Returns:
+            str: Path to the saved audio file
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"recording_{timestamp}.wav"
+
+        filepath = os.path.join(self.output_directory, filename)
+        self._save_audio(filepath, [memoryview(np.ascontiguousarray(samples))])
+
+        return filepath
+
+    @staticmethod
+    def _amplitude(samples):
+        """Peak absolute amplitude of int16 samples."""
+        if len(samples) == 0:
+            return 0
+        return int(np.abs(samples.astype(np.int32)).max())
+
     def _save_audio(self, filepath, frames):
         """Save recorded frames to a WAV file."""
         wf = wave.open(filepath, "wb")
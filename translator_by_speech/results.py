@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Database the CLI stores results in
+DEFAULT_RESULTS_DB = os.path.join("transcripts", "results.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    source_lang TEXT,
+    target_lang TEXT,
+    transcript TEXT NOT NULL,
+    translation TEXT,
+    timings TEXT NOT NULL,
+    models TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_input_hash ON results (input_hash);
+CREATE INDEX IF NOT EXISTS results_file_path ON results (file_path);
+"""
+
+_COLUMNS = (
+    "input_hash",
+    "file_path",
+    "created_at",
+    "source_lang",
+    "target_lang",
+    "transcript",
+    "translation",
+    "timings",
+    "models",
+)
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_version(model: Any) -> str:
+    """
+    Name of a loaded model with its Hub revision, e.g. ``org/name@0123abcd4567``.
+
+    Args:
+        model: ASRModel or TranslationModel
+
+    Returns:
+        Model name, with the commit hash of the downloaded files if known
+    """
+    # ASRModel names its model model_id, TranslationModel model_name
+    name = getattr(model, "model_id", None)
+    if not isinstance(name, str):
+        name = getattr(model, "model_name", None)
+    config = getattr(getattr(model, "model", None), "config", None)
+    revision = getattr(config, "_commit_hash", None)
+    if isinstance(revision, str):
+        return f"{name}@{revision[:12]}"
+    return str(name)
+
+
+class ResultStore:
+    """
+    Append-only SQLite store of transcripts and translations.
+
+    Results are indexed by the hash of the input audio and by its path.
+    Records are never updated: processing a file again appends a new record
+    and lookups return the latest one. Writes are buffered and inserted in
+    bulk, one transaction per batch.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_RESULTS_DB, batch_size: int = 256):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: Path of the SQLite database file
+            batch_size: Number of buffered records that triggers a write
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Any, ...]] = []
+
+        # Input hashes keyed by path, with the size and mtime they were read at
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return row[0]
+
+    def add(
+        self,
+        file_path: str,
+        result: Dict[str, Any],
+        input_hash: Optional[str] = None,
+    ) -> None:
+        """
+        Queue the result of one input.
+
+        Args:
+            file_path: Path of the input audio file
+            result: Pipeline result ("source_text", "translated_text", ...) or
+                transcription result ("text", "language")
+            input_hash: Hash of the input (computed from the file if None)
+        """
+        if input_hash is None:
+            input_hash = self.file_hash(file_path)
+
+        record = (
+            input_hash,
+            os.path.abspath(file_path),
+            time.time(),
+            result.get("source_lang", result.get("language")),
+            result.get("target_lang"),
+            result.get("source_text", result.get("text", "")),
+            result.get("translated_text"),
+            json.dumps(result.get("timings") or {}),
+            json.dumps(result.get("models") or {}),
+        )
+        with self._lock:
+            self._pending.append(record)
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def file_hash(self, file_path: str) -> str:
+        """
+        SHA-256 of a file's contents, read once per version of the file.
+
+        Args:
+            file_path: Path of the input audio file
+
+        Returns:
+            Hash of the file, reused until its size or mtime changes
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+
+        input_hash = file_hash(path)
+        with self._lock:
+            self._hashes[path] = (stat.st_size, stat.st_mtime_ns, input_hash)
+        return input_hash
+
+    def flush(self) -> int:
+        """
+        Write all buffered records.
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            records, self._pending = self._pending, []
+            if records:
+                with self._connection:
+                    self._connection.executemany(
+                        f"INSERT INTO results ({', '.join(_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        records,
+                    )
+        return len(records)
+
+    def lookup_hash(self, input_hash: str) -> Optional[Dict[str, Any]]:
+        """Latest result for an input hash, or None."""
+        return self._latest("input_hash", input_hash)
+
+    def lookup_path(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Latest result for an input path, or None."""
+        return self._latest("file_path", os.path.abspath(file_path))
+
+    def iter_latest(self) -> Iterator[Dict[str, Any]]:
+        """
+        Latest result of every input path.
+
+        Yields:
+            Result records ordered by path
+        """
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM results WHERE id IN "
+                "(SELECT MAX(id) FROM results GROUP BY file_path) "
+                "ORDER BY file_path"
+            ).fetchall()
+        for row in rows:
+            yield self._to_dict(row)
+
+    def export_txt(self, directory: str = "transcripts") -> int:
+        """
+        Write the latest results in the legacy per-file text layout.
+
+        Translated inputs get ``<name>_transcript.txt`` and
+        ``<name>_translation.txt``; transcribed-only inputs get ``<name>.txt``.
+
+        Args:
+            directory: Directory the text files are written to
+
+        Returns:
+            Number of inputs exported
+        """
+        os.makedirs(directory, exist_ok=True)
+        count = 0
+        for record in self.iter_latest():
+            files = legacy_txt_files(
+                record["file_path"], record["transcript"], record["translation"]
+            )
+            for file_name, text in files:
+                file_path = os.path.join(directory, file_name)
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Write buffered records and close the database."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def _latest(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT * FROM results WHERE {column} = ? ORDER BY id DESC LIMIT 1",
+                (value,),
+            ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        record = dict(row)
+        record["timings"] = json.loads(record["timings"])
+        record["models"] = json.loads(record["models"])
+        return record
+
+
+def legacy_txt_files(
+    file_path: str, transcript: str, translation: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """
+    File names and contents of a result in the legacy text layout.
+
+    Args:
+        file_path: Path of the input audio file
+        transcript: Transcribed text
+        translation: Translated text (None if the input was only transcribed)
+
+    Returns:
+        List of (file name, text) pairs
+    """
+    basename = os.path.splitext(os.path.basename(file_path))[0]
+    if translation is None:
+        return [(f"{basename}.txt", transcript)]
+    return [
+        (f"{basename}_transcript.txt", transcript),
+        (f"{basename}_translation.txt", translation),
+    ]
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size ring buffer of audio samples with zero-copy reads.
+
+    The storage is mirrored: every sample is written at position ``i`` and
+    ``i + capacity``, so any span of up to ``capacity`` recent samples is one
+    contiguous slice and can be returned as a view without copying. Memory is
+    allocated once and stays constant however long the stream runs.
+    """
+
+    def __init__(self, capacity: int, dtype: np.dtype = np.int16):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity: Number of most recent samples that can be read back
+            dtype: Sample type
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._total = 0
+
+    @property
+    def total_written(self) -> int:
+        """Absolute number of samples written since creation."""
+        return self._total
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still available."""
+        return max(0, self._total - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Append samples, overwriting the oldest ones when full.
+
+        Args:
+            samples: Samples to append
+        """
+        # Samples older than the capacity would be overwritten right away
+        skipped = max(0, len(samples) - self.capacity)
+        samples = samples[skipped:]
+        n = len(samples)
+        pos = (self._total + skipped) % self.capacity
+
+        # Write each sample at pos and pos + capacity, wrapping at most once
+        first = min(n, self.capacity - pos)
+        for offset in (pos, pos + self.capacity):
+            self._data[offset : offset + first] = samples[:first]
+        if n > first:
+            for offset in (0, self.capacity):
+                self._data[offset : offset + n - first] = samples[first:]
+
+        self._total += skipped + n
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """
+        Return samples [start, end) as a read-only view into the buffer.
+
+        The view stays valid until ``capacity`` more samples are written;
+        copy it if it has to be kept longer.
+
+        Args:
+            start: Absolute index of the first sample
+            end: Absolute index after the last sample
+
+        Returns:
+            Zero-copy view of the requested samples
+        """
+        if start < self.oldest or end > self._total or start > end:
+            raise ValueError(
+                f"Samples [{start}, {end}) are not in the buffer "
+                f"(available: [{self.oldest}, {self._total}))"
+            )
+
+        pos = start % self.capacity
+        view = self._data[pos : pos + end - start]
+        view.flags.writeable = False
+        return view
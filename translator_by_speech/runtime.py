@@ -0,0 +1,262 @@
+import contextlib
+import functools
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import torch
+
+# File the CLI reads runtime settings from and auto-tuning writes them to
+DEFAULT_RUNTIME_CONFIG = "runtime_config.json"
+
+
+def bf16_supported() -> bool:
+    """Whether this CPU runs bfloat16 matmuls natively (e.g. AVX512-BF16, AMX)."""
+    is_supported = getattr(torch.ops.mkldnn, "_is_mkldnn_bf16_supported", None)
+    try:
+        return bool(is_supported and is_supported())
+    except RuntimeError:
+        return False
+
+
+class RuntimeConfig:
+    """
+    Threading and execution settings shared by the ASR and translation models.
+
+    Thread counts are process-wide torch settings; the other settings apply to
+    each inference call made through ``inference_context``.
+    """
+
+    def __init__(
+        self,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        inference_mode: bool = True,
+        compile: bool = False,
+        bf16_autocast: bool = False,
+        cpu_affinity: Optional[List[int]] = None,
+    ):
+        """
+        Initialize the runtime config.
+
+        Args:
+            intra_op_threads: Threads used inside one operator (torch default if None)
+            inter_op_threads: Threads running independent operators (torch
+                default if None; can only be set before torch starts parallel work)
+            inference_mode: Use torch.inference_mode instead of torch.no_grad
+            compile: Compile model forward passes with torch.compile
+            bf16_autocast: Run CPU inference under bfloat16 autocast (only
+                applied when the CPU supports bfloat16)
+            cpu_affinity: CPU cores the process is pinned to (Linux only)
+        """
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.inference_mode = inference_mode
+        self.compile = compile
+        self.bf16_autocast = bf16_autocast
+        self.cpu_affinity = cpu_affinity
+
+    def __repr__(self) -> str:
+        settings = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"RuntimeConfig({settings})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RuntimeConfig) and self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Settings as a JSON-serializable dictionary."""
+        return {
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "inference_mode": self.inference_mode,
+            "compile": self.compile,
+            "bf16_autocast": self.bf16_autocast,
+            "cpu_affinity": self.cpu_affinity,
+        }
+
+    def replace(self, **changes) -> "RuntimeConfig":
+        """Copy of the config with some settings changed."""
+        return RuntimeConfig(**{**self.to_dict(), **changes})
+
+    def save(self, file_path: str = DEFAULT_RUNTIME_CONFIG) -> None:
+        """Write the settings to a JSON file."""
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, file_path: str = DEFAULT_RUNTIME_CONFIG) -> "RuntimeConfig":
+        """Read settings written by ``save``."""
+        with open(file_path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def apply_threads(self) -> None:
+        """Apply the thread counts and CPU affinity to the current process."""
+        if self.cpu_affinity and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.cpu_affinity)
+
+        if self.intra_op_threads and torch.get_num_threads() != self.intra_op_threads:
+            torch.set_num_threads(self.intra_op_threads)
+
+        if (
+            self.inter_op_threads
+            and torch.get_num_interop_threads() != self.inter_op_threads
+        ):
+            try:
+                torch.set_num_interop_threads(self.inter_op_threads)
+            except RuntimeError:
+                print(
+                    "Warning: inter-op threads can only be set before torch starts "
+                    f"parallel work; keeping {torch.get_num_interop_threads()}"
+                )
+
+    @contextlib.contextmanager
+    def inference_context(self, device: torch.device) -> Iterator[None]:
+        """
+        Context for one inference call: no autograd, and bf16 autocast if enabled.
+
+        Args:
+            device: Device the model runs on
+        """
+        with contextlib.ExitStack() as stack:
+            if self.inference_mode:
+                stack.enter_context(torch.inference_mode())
+            else:
+                stack.enter_context(torch.no_grad())
+
+            if self.bf16_autocast and device.type == "cpu" and bf16_supported():
+                stack.enter_context(torch.autocast("cpu", dtype=torch.bfloat16))
+
+            yield
+
+    def prepare_model(self, model: torch.nn.Module) -> torch.nn.Module:
+        """
+        Compile the model's forward pass if enabled.
+
+        Compilation happens lazily on the first call, so the compiled forward
+        falls back to the eager one for good if compiling fails then (or when
+        new input shapes are compiled later). A model can be prepared again
+        with other settings, e.g. while benchmarking.
+
+        Args:
+            model: Model in eval mode
+
+        Returns:
+            The same model, with a compiled forward when compilation works here
+        """
+        # Start from the class's forward, undoing an earlier compile
+        model.__dict__.pop("forward", None)
+        if self.compile:
+            try:
+                model.forward = _compiled_with_fallback(model.forward)
+            except Exception as e:
+                print(f"Warning: torch.compile unavailable, running eagerly: {e}")
+        return model
+
+
+def _compiled_with_fallback(forward: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Compiled ``forward`` that switches to ``forward`` if compiling fails.
+
+    Only compiler errors cause the fallback; any other error (bad inputs, out
+    of memory) is raised as it would be without compilation.
+    """
+    # Loaded by torch.compile anyway
+    from torch._dynamo.exc import BackendCompilerFailed, Unsupported
+
+    compiled = torch.compile(forward, dynamic=True)
+    failed = False
+
+    @functools.wraps(forward)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        nonlocal failed
+        if not failed:
+            try:
+                return compiled(*args, **kwargs)
+            except (BackendCompilerFailed, Unsupported) as e:
+                failed = True
+                print(f"Warning: torch.compile failed, running eagerly: {e}")
+        return forward(*args, **kwargs)
+
+    return run
+
+
+def candidate_configs(
+    base: RuntimeConfig,
+    thread_counts: Optional[List[int]] = None,
+    try_bf16: Optional[bool] = None,
+    try_compile: bool = False,
+) -> List[RuntimeConfig]:
+    """
+    Combinations of settings worth benchmarking on this host.
+
+    Inter-op threads are kept from ``base``, because torch cannot change them
+    once the models have run.
+
+    Args:
+        base: Settings that are not varied
+        thread_counts: Intra-op thread counts (powers of two up to the CPU count if None)
+        try_bf16: Also try bf16 autocast (only if the CPU supports it if None)
+        try_compile: Also try torch.compile (slow to warm up)
+
+    Returns:
+        List of configs to benchmark
+    """
+    if thread_counts is None:
+        cpus = os.cpu_count() or 1
+        thread_counts = sorted({1 << i for i in range(cpus.bit_length())} | {cpus})
+    if try_bf16 is None:
+        try_bf16 = bf16_supported()
+
+    configs = []
+    for threads in thread_counts:
+        for inference_mode in (True, False):
+            for bf16 in (False, True) if try_bf16 else (False,):
+                for compile in (False, True) if try_compile else (False,):
+                    configs.append(
+                        base.replace(
+                            intra_op_threads=threads,
+                            inference_mode=inference_mode,
+                            bf16_autocast=bf16,
+                            compile=compile,
+                        )
+                    )
+    return configs
+
+
+def autotune(
+    run: Callable[[RuntimeConfig], Any],
+    configs: List[RuntimeConfig],
+    warmup: int = 1,
+    repeats: int = 3,
+) -> Tuple[RuntimeConfig, List[Tuple[RuntimeConfig, float]]]:
+    """
+    Benchmark a workload under each config and pick the fastest.
+
+    Args:
+        run: Runs the workload with the given config (which has its threads applied)
+        configs: Configs to compare, e.g. from ``candidate_configs``
+        warmup: Untimed runs per config
+        repeats: Timed runs per config; the median is compared
+
+    Returns:
+        The fastest config, and (config, median seconds) for every config
+    """
+    if not configs:
+        raise ValueError("No configs to benchmark")
+
+    results = []
+    for config in configs:
+        config.apply_threads()
+        for _ in range(warmup):
+            run(config)
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run(config)
+            timings.append(time.perf_counter() - start)
+        results.append((config, sorted(timings)[len(timings) // 2]))
+
+    best = min(results, key=lambda result: result[1])[0]
+    return best, results
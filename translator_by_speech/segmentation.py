@@ -0,0 +1,220 @@
+import re
+from typing import Callable, List, Sequence, Tuple
+
+# Sentence-final punctuation, optionally followed by closing quotes/brackets
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*$")
+
+# Clause punctuation used to split sentences that are still too long
+_CLAUSE_END = re.compile(r"[,;:]+[\"'”’)\]]*$")
+
+# Words ending with a period that do not end a sentence (lowercase, English and Vietnamese)
+ABBREVIATIONS = {
+    "mr.",
+    "mrs.",
+    "ms.",
+    "dr.",
+    "prof.",
+    "sr.",
+    "jr.",
+    "st.",
+    "vs.",
+    "etc.",
+    "e.g.",
+    "i.e.",
+    "a.m.",
+    "p.m.",
+    "no.",
+    "tp.",
+    "ths.",
+    "ts.",
+    "pgs.",
+    "gs.",
+    "bs.",
+    "ks.",
+}
+
+_TOKEN = re.compile(r"\S+")
+
+
+def ends_sentence(word: str) -> bool:
+    """
+    Check whether a whitespace-delimited word closes a sentence.
+
+    Args:
+        word: Word including its trailing punctuation
+
+    Returns:
+        True if the word ends with sentence punctuation and is not an abbreviation
+    """
+    if not _SENTENCE_END.search(word):
+        return False
+
+    # Single initials ("J.") and known abbreviations are not sentence ends
+    lowered = word.lower().strip("\"'“”‘’([")
+    if lowered in ABBREVIATIONS or re.fullmatch(r"\w\.", lowered):
+        return False
+
+    return True
+
+
+def split_sentences(text: str, max_words: int = 48) -> Tuple[List[str], List[str]]:
+    """
+    Split Vietnamese or English text into sentences for translation.
+
+    Sentences longer than ``max_words`` are further split at clause punctuation,
+    and at word boundaries as a last resort. The whitespace between pieces is
+    returned separately so the translations can be reassembled with the
+    original spacing.
+
+    Args:
+        text: Text to split
+        max_words: Maximum number of words per piece
+
+    Returns:
+        Tuple of (pieces, separators) where ``separators`` has one more element
+        than ``pieces``: the leading whitespace, the whitespace between pieces
+        and the trailing whitespace
+    """
+    tokens = list(_TOKEN.finditer(text))
+    if not tokens:
+        return [], [text]
+
+    # Indices (into tokens) after which a piece ends
+    boundaries: List[int] = []
+    sentence_start = 0
+    for i, token in enumerate(tokens):
+        is_last = i == len(tokens) - 1
+        newline_follows = (
+            not is_last and "\n" in text[token.end() : tokens[i + 1].start()]
+        )
+
+        if is_last or newline_follows or ends_sentence(token.group()):
+            boundaries.extend(_split_long(tokens, sentence_start, i, max_words))
+            sentence_start = i + 1
+
+    pieces: List[str] = []
+    separators: List[str] = [text[: tokens[0].start()]]
+    start = 0
+    for end in boundaries:
+        pieces.append(text[tokens[start].start() : tokens[end].end()])
+        next_start = tokens[end + 1].start() if end + 1 < len(tokens) else len(text)
+        separators.append(text[tokens[end].end() : next_start])
+        start = end + 1
+
+    return pieces, separators
+
+
+def _split_long(
+    tokens: Sequence[re.Match], start: int, end: int, max_words: int
+) -> List[int]:
+    """Return piece boundaries for tokens[start:end + 1], splitting long sentences."""
+    boundaries: List[int] = []
+    piece_start = start
+    last_clause = None
+
+    for i in range(start, end):
+        if _CLAUSE_END.search(tokens[i].group()):
+            last_clause = i
+
+        if i - piece_start + 1 >= max_words:
+            # Prefer the last clause boundary, otherwise cut at the word limit
+            cut = last_clause if last_clause is not None else i
+            boundaries.append(cut)
+            piece_start = cut + 1
+            last_clause = None
+
+    boundaries.append(end)
+    return boundaries
+
+
+def join_translations(translations: Sequence[str], separators: Sequence[str]) -> str:
+    """
+    Reassemble translated pieces with the whitespace of the original text.
+
+    Args:
+        translations: Translated pieces in original order
+        separators: Separators returned by split_sentences
+
+    Returns:
+        Reassembled translation
+    """
+    parts = [separators[0]]
+    for translation, separator in zip(translations, separators[1:]):
+        parts.append(translation)
+        parts.append(separator)
+    return "".join(parts)
+
+
+def make_batches(pieces: Sequence[str], batch_size: int) -> List[List[int]]:
+    """
+    Group piece indices into batches of similar length to minimize padding.
+
+    Args:
+        pieces: Text pieces to translate
+        batch_size: Maximum number of pieces per batch
+
+    Returns:
+        List of batches, each a list of indices into ``pieces``
+    """
+    order = sorted(range(len(pieces)), key=lambda i: len(pieces[i]))
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def translate_segmented(
+    translate: Callable[[List[str]], List[str]],
+    text: str,
+    batch_size: int = 16,
+    max_words: int = 48,
+) -> str:
+    """
+    Translate long text sentence by sentence through the batched translate path.
+
+    Args:
+        translate: Batched translate callable, e.g. TranslationModel.translate
+        text: Text to translate
+        batch_size: Maximum number of sentences per generate call
+        max_words: Maximum number of words per sentence piece
+
+    Returns:
+        Translated text with the original spacing between sentences
+    """
+    return translate_segmented_batch(
+        translate, [text], batch_size=batch_size, max_words=max_words
+    )[0]
+
+
+def translate_segmented_batch(
+    translate: Callable[[List[str]], List[str]],
+    texts: Sequence[str],
+    batch_size: int = 16,
+    max_words: int = 48,
+) -> List[str]:
+    """
+    Translate several texts, batching sentences across all of them.
+
+    Args:
+        translate: Batched translate callable, e.g. TranslationModel.translate
+        texts: Texts to translate
+        batch_size: Maximum number of sentences per generate call
+        max_words: Maximum number of words per sentence piece
+
+    Returns:
+        One translated text per input, with the original spacing between sentences
+    """
+    # Pool the sentences of all texts so batches are full and similar in length
+    pieces: List[str] = []
+    layouts = []
+    for text in texts:
+        text_pieces, separators = split_sentences(text, max_words=max_words)
+        layouts.append((len(pieces), len(text_pieces), separators))
+        pieces.extend(text_pieces)
+
+    translations: List[str] = [""] * len(pieces)
+    for batch in make_batches(pieces, batch_size):
+        for i, translation in zip(batch, translate([pieces[i] for i in batch])):
+            translations[i] = translation
+
+    return [
+        join_translations(translations[start : start + count], separators)
+        for start, count, separators in layouts
+    ]
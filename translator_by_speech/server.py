@@ -0,0 +1,375 @@
+import os
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from translator_by_speech.client import (
+    DEFAULT_SOCKET_PATH,
+    ModelClient,
+    attach_shared_audio,
+    model_settings,
+    recv_message,
+    send_message,
+)
+from translator_by_speech.coalescing import CoalescingTranslator
+from translator_by_speech.pipeline import SpeechTranslationPipeline
+from translator_by_speech.results import model_version
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.segmentation import translate_segmented
+from translator_by_speech.speech_recognition import ASRModel
+from translator_by_speech.translator import (
+    create_en2vi_translator,
+    create_vi2en_translator,
+)
+
+# Target language code of the pipeline for each supported language pair
+PIPELINE_TARGETS = {("vi", "en"): "en_XX", ("en", "vi"): "vi_VN"}
+
+# Requests answered on the connection thread; all others use the models
+CONTROL_OPS = {"ping", "check_settings", "shutdown"}
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    # Connection threads must not keep the process alive after shutdown
+    daemon_threads = True
+
+
+class ModelServer:
+    """
+    Long-running process that holds the models for many short CLI runs.
+
+    Models are loaded on first use and shared by all clients. Requests are
+    length-prefixed JSON messages on a Unix socket; audio arrays arrive in
+    shared memory blocks owned by the client. Model requests run on a pool
+    of ``max_concurrency`` threads, and translations of concurrent requests
+    are merged into batches by a coalescing translator per direction.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        decoding_profile: str = "balanced",
+        latency_budget: Optional[float] = None,
+        glossaries: Optional[Dict[str, str]] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        draft_models: Optional[Dict[str, str]] = None,
+        assisted_compare_every: int = 0,
+        max_concurrency: int = 1,
+        max_pending: int = 32,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Unix socket to listen on
+            decoding_profile: Decoding profile ("fast", "balanced" or "quality")
+            latency_budget: Seconds a translation call may take (narrows the beam)
+            glossaries: Glossary TSV paths keyed by direction ("vi2en", "en2vi")
+            runtime: Threading and execution settings shared by all models
+            draft_models: Draft models for assisted decoding keyed by model
+                ("asr", "vi2en", "en2vi")
+            assisted_compare_every: Also decode every n-th assisted call
+                without the draft to measure the speedup (0 to disable)
+            max_concurrency: Maximum number of model requests running at once
+            max_pending: Maximum number of model requests waiting for a
+                thread; further requests are rejected as busy
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.socket_path = socket_path
+        self.decoding_profile = decoding_profile
+        self.latency_budget = latency_budget
+        self.glossaries = {
+            direction: os.path.abspath(path)
+            for direction, path in (glossaries or {}).items()
+        }
+        self.runtime = runtime or RuntimeConfig()
+        self.draft_models = draft_models or {}
+        self.assisted_compare_every = assisted_compare_every
+
+        # Models are loaded once, by the first request that needs them
+        self._lock = threading.Lock()
+        self._asr_model: Optional[ASRModel] = None
+        self._translators: Dict[str, CoalescingTranslator] = {}
+        self._pipelines: Dict[Tuple[str, str], SpeechTranslationPipeline] = {}
+
+        # Model requests wait for one of the pool's threads, up to a limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="model-server"
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_pending)
+
+        self._server: Optional[_UnixServer] = None
+        self.stats = {"requests": 0, "errors": 0, "busy": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def asr_model(self) -> ASRModel:
+        """Shared ASR model."""
+        with self._lock:
+            if self._asr_model is None:
+                print("Loading ASR model...")
+                self._asr_model = ASRModel(
+                    decoding_profile=self.decoding_profile,
+                    runtime=self.runtime,
+                    draft_model_id=self.draft_models.get("asr"),
+                    assisted_compare_every=self.assisted_compare_every,
+                )
+            return self._asr_model
+
+    def translator(self, direction: str) -> CoalescingTranslator:
+        """
+        Shared translator of a direction.
+
+        Args:
+            direction: "vi2en" or "en2vi"
+        """
+        factories = {"vi2en": create_vi2en_translator, "en2vi": create_en2vi_translator}
+        if direction not in factories:
+            raise ValueError(f"Unsupported translation direction: {direction}")
+
+        with self._lock:
+            if direction not in self._translators:
+                print(f"Loading {direction} translation model...")
+                translator_model = factories[direction](
+                    decoding_profile=self.decoding_profile,
+                    latency_budget=self.latency_budget,
+                    glossary=self.glossaries.get(direction),
+                    runtime=self.runtime,
+                    draft_model=self.draft_models.get(direction),
+                    assisted_compare_every=self.assisted_compare_every,
+                )
+                self._translators[direction] = CoalescingTranslator(translator_model)
+            return self._translators[direction]
+
+    def pipeline(self, source_lang: str, target_lang: str) -> SpeechTranslationPipeline:
+        """
+        Shared pipeline of a language pair.
+
+        Args:
+            source_lang: "vi", "en" or "auto"
+            target_lang: "en" or "vi" (ignored for "auto")
+        """
+        key = (source_lang, target_lang if source_lang != "auto" else "auto")
+        if key in self._pipelines:
+            return self._pipelines[key]
+
+        if source_lang == "auto":
+            pipeline = SpeechTranslationPipeline(
+                asr_model=self.asr_model,
+                source_lang="auto",
+                translators={
+                    "vi": self.translator("vi2en"),
+                    "en": self.translator("en2vi"),
+                },
+            )
+        elif key in PIPELINE_TARGETS:
+            pipeline = SpeechTranslationPipeline(
+                asr_model=self.asr_model,
+                translator_model=self.translator(f"{source_lang}2{target_lang}"),
+                source_lang=source_lang,
+                target_lang=PIPELINE_TARGETS[key],
+            )
+        else:
+            raise ValueError(
+                f"Unsupported language pair: {source_lang} → {target_lang}"
+            )
+
+        return self._pipelines.setdefault(key, pipeline)
+
+    def preload(self, source_lang: str = "vi", target_lang: str = "en") -> None:
+        """Load the models of a language pair before the first request."""
+        self.pipeline(source_lang, target_lang)
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Model settings in the form clients send them."""
+        return model_settings(
+            decoding_profile=self.decoding_profile,
+            latency_budget=self.latency_budget,
+            glossaries=self.glossaries,
+            runtime=self.runtime.to_dict(),
+            draft_models=self.draft_models,
+            assisted_compare_every=self.assisted_compare_every,
+        )
+
+    def mismatched_settings(self, settings: Dict[str, Any]) -> List[str]:
+        """
+        Model settings of a client that differ from the server's.
+
+        Args:
+            settings: Settings built with ``model_settings``; runtime settings
+                that are left out take their default values
+
+        Returns:
+            One description per differing setting (empty if they all match)
+        """
+        requested = {
+            **settings,
+            "runtime": RuntimeConfig(**(settings.get("runtime") or {})).to_dict(),
+        }
+        return [
+            f"{key}: server {value!r}, this run {requested.get(key)!r}"
+            for key, value in self.settings.items()
+            if requested.get(key) != value
+        ]
+
+    def run(self, request: Dict[str, Any]) -> Any:
+        """
+        Run one request from a connection thread.
+
+        Control requests are answered directly; model requests are queued for
+        the pool, so they never use the models beyond ``max_concurrency``.
+
+        Args:
+            request: Message with an "op" and its arguments
+
+        Returns:
+            Result sent back to the client
+        """
+        if request.get("op") in CONTROL_OPS:
+            return self.handle(request)
+
+        if not self._slots.acquire(blocking=False):
+            self._count("busy")
+            raise RuntimeError("Model server is busy, try again later")
+        try:
+            return self._executor.submit(self.handle, request).result()
+        finally:
+            self._slots.release()
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """
+        Run one request.
+
+        Args:
+            request: Message with an "op" and its arguments
+
+        Returns:
+            Result sent back to the client
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {
+                "pid": os.getpid(),
+                "asr_loaded": self._asr_model is not None,
+                "translators": sorted(self._translators),
+            }
+
+        elif op == "check_settings":
+            return self.mismatched_settings(request["settings"])
+
+        elif op == "process_file":
+            pipeline = self.pipeline(request["source_lang"], request["target_lang"])
+            if request.get("subtitles"):
+                return pipeline.translate_speech_segments_from_file(request["path"])
+            return pipeline.translate_speech_from_file(request["path"])
+
+        elif op == "process_files":
+            pipeline = self.pipeline(request["source_lang"], request["target_lang"])
+            results = list(
+                pipeline.translate_speech_from_files(
+                    request["paths"], batch_size=request.get("batch_size", 8)
+                )
+            )
+            return {"results": results, "prefetch_stats": pipeline.prefetch_stats}
+
+        elif op == "transcribe_file":
+            start = time.perf_counter()
+            result = self.asr_model.transcribe_audio_file(
+                request["path"], language=request["language"]
+            )
+            return {
+                **result,
+                "timings": {"asr_seconds": time.perf_counter() - start},
+                "models": {"asr": model_version(self.asr_model)},
+            }
+
+        elif op == "translate_text":
+            direction = f"{request['source_lang']}2{request['target_lang']}"
+            return translate_segmented(
+                self.translator(direction).translate, request["text"]
+            )
+
+        elif op == "translate_audio":
+            pipeline = self.pipeline(request["source_lang"], request["target_lang"])
+            shm = attach_shared_audio(request["shm"])
+            try:
+                # Read the samples in place; the client keeps the block alive
+                audio_array = np.ndarray(
+                    (request["samples"],), dtype=np.float32, buffer=shm.buf
+                )
+                result = pipeline.translate_speech(
+                    audio_array, request["sampling_rate"]
+                )
+                del audio_array
+            finally:
+                shm.close()
+            return result
+
+        elif op == "shutdown":
+            # shutdown() waits for serve_forever, so it runs on another thread
+            threading.Thread(target=self.stop, daemon=True).start()
+            return None
+
+        raise ValueError(f"Unknown request: {op}")
+
+    def _count(self, key: str) -> None:
+        # Connection threads update the stats concurrently
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until a shutdown request or KeyboardInterrupt."""
+        if ModelClient.connect(self.socket_path) is not None:
+            raise RuntimeError(
+                f"A model server is already running on {self.socket_path}"
+            )
+
+        # A socket file left behind by a server that did not exit cleanly
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    request = recv_message(self.request)
+                    if request is None:
+                        return
+                    server._count("requests")
+                    try:
+                        response = {"ok": True, "result": server.run(request)}
+                    except Exception as e:
+                        server._count("errors")
+                        response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    send_message(self.request, response)
+
+        self._server = _UnixServer(self.socket_path, Handler)
+        os.chmod(self.socket_path, 0o600)
+        print(f"Model server listening on {self.socket_path} (pid {os.getpid()})")
+
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for translator_model in self._translators.values():
+                if isinstance(translator_model, CoalescingTranslator):
+                    translator_model.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Model server stopped")
+
+    def stop(self) -> None:
+        """Stop serve_forever."""
+        if self._server is not None:
+            self._server.shutdown()
@@ -0,0 +1,117 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class SpeculativeTranscriber:
+    """
+    Starts transcribing an utterance while the recorder still waits for silence.
+
+    The recorder calls ``start`` with the audio captured so far when a pause
+    begins and ``cancel`` if speech resumes. When recording ends, ``result``
+    returns the transcription of the last job if no speech followed it, so the
+    silence confirmation window (and often the whole ASR call) is hidden from
+    the user. Jobs run one at a time on a background thread; a job that is
+    already running when speech resumes finishes and its result is discarded.
+    """
+
+    def __init__(self, transcribe: Callable[[np.ndarray], Dict[str, Any]]):
+        """
+        Initialize the transcriber.
+
+        Args:
+            transcribe: Callable transcribing the samples of an utterance
+        """
+        self.transcribe = transcribe
+
+        # Jobs run on one thread so a discarded job never competes with the next
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="speculative-asr"
+        )
+        self._lock = threading.Lock()
+        self._job: Optional[Future] = None
+
+        # Counters for monitoring
+        self.stats = {
+            "started": 0,
+            "cancelled": 0,
+            "used": 0,
+            "hidden_seconds": 0.0,
+        }
+
+    def start(self, samples: np.ndarray) -> None:
+        """
+        Start transcribing the audio captured so far, replacing any earlier job.
+
+        Args:
+            samples: Samples of the utterance up to the start of the pause
+                (copied, so the caller may reuse its buffer)
+        """
+        samples = np.array(samples)
+        with self._lock:
+            self._discard()
+            self._job = self._executor.submit(self._run, samples)
+            self.stats["started"] += 1
+
+    def cancel(self) -> None:
+        """Discard the current job because speech resumed."""
+        with self._lock:
+            self._discard()
+
+    def result(self) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Wait for the job started at the final pause.
+
+        Returns:
+            Transcription result and the seconds ASR took, or None if there is
+            no valid job (the recording ended while speaking) or it failed
+        """
+        with self._lock:
+            job, self._job = self._job, None
+        if job is None:
+            return None
+
+        end_of_recording = time.perf_counter()
+        try:
+            asr_result, started, finished = job.result()
+        except Exception as e:
+            print(f"Early transcription failed: {str(e)}")
+            return None
+
+        # ASR time that overlapped with the silence confirmation window
+        asr_seconds = finished - started
+        self.stats["used"] += 1
+        self.stats["hidden_seconds"] += max(
+            min(end_of_recording, finished) - started, 0.0
+        )
+        return asr_result, asr_seconds
+
+    def close(self) -> None:
+        """Discard the current job and stop the worker thread."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _discard(self) -> None:
+        # Called with the lock held
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+            self.stats["cancelled"] += 1
+
+    def _run(self, samples: np.ndarray) -> Tuple[Dict[str, Any], float, float]:
+        started = time.perf_counter()
+        asr_result = self.transcribe(samples)
+        return asr_result, started, time.perf_counter()
+
+
+def format_speculative_stats(transcriber: SpeculativeTranscriber) -> str:
+    """One-line summary of a speculative transcriber's stats."""
+    stats = transcriber.stats
+    return (
+        f"{stats['used']} utterances transcribed early, "
+        f"{stats['hidden_seconds']:.2f}s of ASR hidden, "
+        f"{stats['cancelled']} of {stats['started']} jobs cancelled by resumed speech"
+    )
@@ -1,8 +1,17 @@
+import asyncio
 import torch
 import numpy as np
 from typing import Optional, Union, Dict, Any, List, Tuple
-from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq
+from transformers import AutoProcessor, AutoModelForCausalLM, AutoModelForSpeechSeq2Seq
 import soundfile as sf
+import soxr
+from translator_by_speech.assisted import AssistedDecoding
+from translator_by_speech.audio_io import iter_audio_blocks, prefetch
+from translator_by_speech.decoding import DecodingPolicy
+from translator_by_speech.executors import AsyncExecutor
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.features import CHUNK_SECONDS, LogMelExtractor
+from translator_by_speech.pcm import PCMConverter, PCMData, peak_amplitude
 from translator_by_speech.translator import (
     create_vi2en_translator,
     create_en2vi_translator,
@@ -10,6 +19,10 @@ from translator_by_speech.translator import (
 )
 
 
+# Language code that lets the model detect the spoken language
+AUTO_LANGUAGE = "auto"
+
+
 class ASRModel:
     """Speech recognition model that transcribes audio to text."""
 
@@ -18,6 +31,13 @@ class ASRModel:
         model_id: str = "suzii/vi-whisper-large-v3-turbo-v1",
         device: Optional[torch.device] = None,
         torch_dtype: torch.dtype = torch.float16,
+        max_concurrency: int = 1,
+        decode_workers: int = 2,
+        decoding_profile: str = "balanced",
+        auto_languages: Tuple[str, ...] = ("vi", "en"),
+        runtime: Optional[RuntimeConfig] = None,
+        draft_model_id: Optional[str] = None,
+        assisted_compare_every: int = 0,
     ):
         """
         Initialize the ASR model.
@@ -26,8 +46,24 @@ class ASRModel:
             model_id: The Hugging Face model ID for the ASR model
             device: The device to run the model on (defaults to CUDA if available)
             torch_dtype: Datatype to use for model parameters
+            max_concurrency: Maximum number of concurrent async transcriptions
+            decode_workers: Number of threads decoding audio files for the async API
+            decoding_profile: Decoding profile ("fast", "balanced" or "quality")
+                that scales the token budget with the audio duration
+            auto_languages: Languages considered when the language is "auto"
+            runtime: Threading and execution settings (torch defaults if None)
+            draft_model_id: Smaller Whisper model with the same tokenizer and
+                encoder (e.g. a distil-whisper checkpoint) whose decoder proposes
+                tokens for assisted decoding of single windows
+            assisted_compare_every: Also decode every n-th assisted call
+                without the draft to measure the speedup (0 to disable)
         """
         self.model_id = model_id
+
+        # Thread counts must be set before the model runs
+        self.runtime = runtime or RuntimeConfig()
+        self.runtime.apply_threads()
+
         self.device = device or (
             torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
         )
@@ -47,6 +83,62 @@ class ASRModel:
             use_safetensors=True,
         )
         self.model.to(self.device)
+        self.runtime.prepare_model(self.model)
+
+        # Only the draft's decoder is loaded; it reads the main encoder's output
+        self.assisted = None
+        if draft_model_id:
+            draft = AutoModelForCausalLM.from_pretrained(
+                draft_model_id, torch_dtype=torch_dtype, low_cpu_mem_usage=True
+            )
+            draft.to(self.device)
+            self.assisted = AssistedDecoding(
+                draft, compare_every=assisted_compare_every
+            )
+
+        # Log-mel features of whole batches, with the filterbank and window built once
+        self.features = LogMelExtractor.from_feature_extractor(
+            self.processor.feature_extractor, device=self.device
+        )
+
+        # Token budgets scale with the audio duration
+        self.decoding = DecodingPolicy(decoding_profile)
+        self.auto_languages = auto_languages
+
+        # Reusable float32 buffers for PCM ingestion
+        self.pcm_converter = PCMConverter()
+
+        # Executors used by the async API
+        self.decode_executor = AsyncExecutor(
+            max_workers=decode_workers, thread_name_prefix="asr-decode"
+        )
+        self.inference_executor = AsyncExecutor(
+            max_workers=max_concurrency, thread_name_prefix="asr-inference"
+        )
+
+    @staticmethod
+    def load_audio_file(file_path: str) -> Tuple[np.ndarray, int]:
+        """
+        Load an audio file as a mono array.
+
+        Args:
+            file_path: Path to the audio file
+
+        Returns:
+            Tuple of (audio samples, sampling rate)
+        """
+        audio_array, sampling_rate = sf.read(file_path, dtype="float32")
+
+        # Convert to mono if stereo
+        if len(audio_array.shape) > 1:
+            audio_array = audio_array.mean(axis=1, dtype=np.float32)
+
+        return audio_array, sampling_rate
+
+    @staticmethod
+    def is_long_audio_file(file_path: str) -> bool:
+        """Whether a file is longer than one 30 s Whisper window."""
+        return sf.info(file_path).duration > CHUNK_SECONDS
 
     def transcribe_audio_file(
         self,
@@ -57,6 +149,10 @@ class ASRModel:
         """
         Transcribe audio from a file.
 
+        Files longer than 30 s are decoded and transcribed block by block
+        (see transcribe_audio_file_streaming) instead of being loaded whole;
+        their segments are timed from the start of the file.
+
         Args:
             file_path: Path to the audio file
             language: Language code (default is Vietnamese)
@@ -65,17 +161,60 @@ class ASRModel:
         Returns:
             Dictionary containing transcription and metadata
         """
-        # Load audio file
-        audio_array, sampling_rate = sf.read(file_path)
+        if self.is_long_audio_file(file_path):
+            return self.transcribe_audio_file_streaming(file_path, language)
 
-        # Convert to mono if stereo
-        if len(audio_array.shape) > 1:
-            audio_array = audio_array.mean(axis=1)
+        # Load audio file
+        audio_array, sampling_rate = self.load_audio_file(file_path)
 
         return self.transcribe_audio(
             audio_array, sampling_rate, language, return_timestamps
         )
 
+    def transcribe_audio_file_streaming(
+        self,
+        file_path: str,
+        language: Optional[str] = "vi",
+        block_seconds: float = 10.0,
+        prefetch_blocks: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe a long audio file without loading it into memory.
+
+        Blocks are read, downmixed and resampled on a background thread while
+        the previous window is being transcribed, and fed to sequential
+        long-form transcription. Peak memory stays flat regardless of the
+        length of the file.
+
+        Args:
+            file_path: Path to the audio file
+            language: Language code (default is Vietnamese)
+            block_seconds: Duration of each block read from the file
+            prefetch_blocks: Number of decoded blocks buffered ahead
+
+        Returns:
+            Dictionary containing transcription and metadata; "segments" lists
+            the text, start and end (seconds) of each segment
+        """
+        # Import here to avoid circular imports
+        from translator_by_speech.streaming import StreamingTranscriber
+
+        model_rate = self.processor.feature_extractor.sampling_rate
+        transcriber = StreamingTranscriber(
+            self, sampling_rate=model_rate, language=language, keep_seconds=0.0
+        )
+
+        blocks = iter_audio_blocks(file_path, model_rate, block_seconds)
+        result = transcriber.transcribe_blocks(prefetch(blocks, prefetch_blocks))
+
+        return {
+            "text": result["committed_text"],
+            "language": result["language"],
+            "language_probability": result["language_probability"],
+            "timestamps": None,
+            "segments": result["segments"],
+        }
+
     def transcribe_audio(
         self,
         audio_array: np.ndarray,
@@ -95,40 +234,406 @@ class ASRModel:
         Returns:
             Dictionary containing transcription and metadata
         """
+        return self._transcribe_normalized(
+            self._normalize_audio(audio_array),
+            sampling_rate,
+            language,
+            return_timestamps,
+        )
+
+    def transcribe_audio_batch(
+        self,
+        audio_arrays: List[np.ndarray],
+        sampling_rates: Union[int, List[int]],
+        language: Optional[str] = "vi",
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcribe several short clips (up to 30 seconds each) in one generate call.
+
+        Args:
+            audio_arrays: Numpy arrays of audio samples
+            sampling_rates: Sampling rate of all clips, or one per clip
+            language: Language code (default is Vietnamese)
+
+        Returns:
+            One transcription dictionary per clip, in input order
+        """
+        if not audio_arrays:
+            return []
+        if isinstance(sampling_rates, int):
+            sampling_rates = [sampling_rates] * len(audio_arrays)
+
+        # Normalize and resample each clip to the rate the feature extractor expects
+        model_rate = self.processor.feature_extractor.sampling_rate
+        clips = []
+        for audio_array, sampling_rate in zip(audio_arrays, sampling_rates):
+            audio_array = self._normalize_audio(audio_array)
+            if sampling_rate != model_rate:
+                audio_array = soxr.resample(audio_array, sampling_rate, model_rate)
+            clips.append(audio_array)
+
+        input_features = self.features(clips).to(dtype=self.torch_dtype)
+
+        with self.runtime.inference_context(self.device):
+            longest = max(len(clip) for clip in clips) / model_rate
+            generation_config = {
+                "max_new_tokens": self.decoding.asr_max_new_tokens(longest)
+            }
+
+            languages = [language] * len(clips)
+            probabilities = [None] * len(clips)
+            model_inputs = {"input_features": input_features}
+            if language == AUTO_LANGUAGE:
+                # Detect each clip's language from the encoder pass used for decoding
+                encoder_outputs = self.model.get_encoder()(input_features)
+                languages, probabilities = self.detect_language(encoder_outputs)
+                model_inputs = {"encoder_outputs": encoder_outputs}
+
+            if language:
+                generation_config["language"] = languages
+            outputs = self._generate(**model_inputs, **generation_config)
+
+        transcriptions = self.processor.batch_decode(outputs, skip_special_tokens=True)
+        return [
+            {
+                "text": transcription,
+                "language": clip_language,
+                "language_probability": probability,
+                "timestamps": None,
+                "segments": None,
+            }
+            for transcription, clip_language, probability in zip(
+                transcriptions, languages, probabilities
+            )
+        ]
+
+    def _generate(self, **generate_kwargs) -> torch.Tensor:
+        """Run generate, with the draft model when decoding one window greedily."""
+        if self.assisted is None:
+            return self.model.generate(**generate_kwargs)
+
+        # Assisted decoding only matches greedy output and takes one window at a time
+        if "input_features" in generate_kwargs:
+            batch_size = generate_kwargs["input_features"].shape[0]
+        else:
+            batch_size = generate_kwargs["encoder_outputs"][0].shape[0]
+        num_beams = generate_kwargs.get(
+            "num_beams", self.model.generation_config.num_beams or 1
+        )
+        if batch_size != 1 or num_beams != 1:
+            return self.model.generate(**generate_kwargs)
+
+        return self.assisted.generate(self.model, **generate_kwargs)
+
+    def detect_language(
+        self, encoder_outputs: Any, candidates: Optional[Tuple[str, ...]] = None
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Detect the spoken language from encoder outputs with one decoder step.
+
+        Args:
+            encoder_outputs: Output of the Whisper encoder for a batch of windows
+            candidates: Language codes to choose from (defaults to auto_languages)
+
+        Returns:
+            Detected language code and its probability among the candidates,
+            for each window of the batch
+        """
+        candidates = candidates or self.auto_languages
+        lang_to_id = self.model.generation_config.lang_to_id
+        token_ids = [lang_to_id[f"<|{code}|>"] for code in candidates]
+
+        hidden_states = encoder_outputs[0]
+        decoder_input_ids = torch.full(
+            (hidden_states.shape[0], 1),
+            self.model.generation_config.decoder_start_token_id,
+            dtype=torch.long,
+            device=hidden_states.device,
+        )
+
+        with self.runtime.inference_context(self.device):
+            logits = self.model(
+                encoder_outputs=encoder_outputs,
+                decoder_input_ids=decoder_input_ids,
+                use_cache=False,
+            ).logits[:, -1]
+
+        probabilities = logits[:, token_ids].float().softmax(dim=-1)
+        best_probabilities, best = probabilities.max(dim=-1)
+        return [candidates[i] for i in best.tolist()], best_probabilities.tolist()
+
+    @staticmethod
+    def _normalize_audio(audio_array: np.ndarray) -> np.ndarray:
+        """Convert audio to float32 and scale it into [-1, 1] if needed."""
         # Ensure proper dtype
-        if audio_array.dtype != np.float32:
+        is_copy = audio_array.dtype != np.float32
+        if is_copy:
             audio_array = audio_array.astype(np.float32)
 
-        # Normalize if not already normalized
-        if np.abs(audio_array).max() > 1.0:
-            audio_array = audio_array / np.abs(audio_array).max()
+        # Normalize if not already normalized (in place when we own the copy)
+        peak = peak_amplitude(audio_array)
+        if peak > 1.0:
+            if is_copy:
+                audio_array /= peak
+            else:
+                audio_array = audio_array / peak
+
+        return audio_array
+
+    def transcribe_pcm(
+        self,
+        pcm: PCMData,
+        sampling_rate: int,
+        language: Optional[str] = "vi",
+        return_timestamps: bool = False,
+        channels: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe raw 16-bit PCM, e.g. from the recorder or a network client.
+
+        The samples are scaled to float32 in a single pass into a reusable
+        buffer; int16 audio is always within [-1, 1] after scaling, so no
+        normalization pass is needed.
+
+        Args:
+            pcm: Little-endian int16 PCM as bytes, memoryview or int16 array
+            sampling_rate: Sampling rate of the audio
+            language: Language code (default is Vietnamese)
+            return_timestamps: Whether to return word timestamps
+            channels: Number of interleaved channels (downmixed to mono)
+
+        Returns:
+            Dictionary containing transcription and metadata
+        """
+        audio_array = self.pcm_converter.convert(pcm, channels=channels)
+        return self._transcribe_normalized(
+            audio_array, sampling_rate, language, return_timestamps
+        )
+
+    def _transcribe_normalized(
+        self,
+        audio_array: np.ndarray,
+        sampling_rate: int,
+        language: Optional[str],
+        return_timestamps: bool,
+    ) -> Dict[str, Any]:
+        """Transcribe float32 audio that is already within [-1, 1]."""
+        # Resample to the rate the feature extractor expects
+        model_rate = self.processor.feature_extractor.sampling_rate
+        if sampling_rate != model_rate:
+            audio_array = soxr.resample(audio_array, sampling_rate, model_rate)
+            sampling_rate = model_rate
+
+        return self.transcribe_features(
+            self.features([audio_array]),
+            language,
+            return_timestamps,
+            duration=len(audio_array) / sampling_rate,
+        )
+
+    def transcribe_features(
+        self,
+        input_features: Union[np.ndarray, torch.Tensor],
+        language: Optional[str] = "vi",
+        return_timestamps: bool = False,
+        prompt: Optional[str] = None,
+        duration: Optional[float] = None,
+        **generate_kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe precomputed log-mel features.
+
+        Args:
+            input_features: Log-mel features of shape (n_mels, n_frames) or
+                (1, n_mels, n_frames)
+            language: Language code (default is Vietnamese), or "auto" to
+                detect it from the encoder pass used for decoding
+            return_timestamps: Whether to return segment timestamps
+            prompt: Previous text to condition decoding on
+            duration: Seconds of audio in the window, used to size the token
+                budget (the full budget if None)
+            **generate_kwargs: Extra arguments for model.generate
 
-        # Process audio with the model's processor
-        inputs = self.processor(
-            audio=audio_array, sampling_rate=sampling_rate, return_tensors="pt"
-        ).to(self.device)
+        Returns:
+            Dictionary containing transcription and metadata; with timestamps,
+            "segments" lists the text, start and end (seconds) of each segment;
+            with "auto", "language_probability" is the detection confidence
+        """
+        input_features = torch.as_tensor(input_features)
+        if input_features.dim() == 2:
+            input_features = input_features.unsqueeze(0)
+        input_features = input_features.to(self.device, dtype=self.torch_dtype)
 
         # Generate transcription
-        with torch.no_grad():
+        with self.runtime.inference_context(self.device):
             generation_config = {
-                "max_new_tokens": 256,
+                "max_new_tokens": self.decoding.asr_max_new_tokens(duration),
                 "return_timestamps": return_timestamps,
             }
 
+            # Detect the language from the encoder pass that decoding reuses
+            language_probability = None
+            model_inputs = {"input_features": input_features}
+            if language == AUTO_LANGUAGE:
+                encoder_outputs = self.model.get_encoder()(input_features)
+                languages, probabilities = self.detect_language(encoder_outputs)
+                language, language_probability = languages[0], probabilities[0]
+                model_inputs = {"encoder_outputs": encoder_outputs}
+
             # Add language forcing if provided
             if language:
                 generation_config["language"] = language
 
-            outputs = self.model.generate(**inputs, **generation_config)
+            # Condition decoding on previous text
+            if prompt:
+                generation_config["prompt_ids"] = self.processor.get_prompt_ids(
+                    prompt, return_tensors="pt"
+                ).to(self.device)
+
+            generation_config.update(generate_kwargs)
+            outputs = self._generate(**model_inputs, **generation_config)
+
+        # Drop the prompt tokens if generate returned them
+        sequence = outputs[0]
+        if prompt:
+            sot_id = self.processor.tokenizer.convert_tokens_to_ids(
+                "<|startoftranscript|>"
+            )
+            sot_positions = (sequence == sot_id).nonzero()
+            if len(sot_positions):
+                sequence = sequence[sot_positions[-1].item() :]
 
         # Decode the output
-        transcription = self.processor.batch_decode(outputs, skip_special_tokens=True)[
-            0
-        ]
+        transcription = self.processor.batch_decode(
+            sequence.unsqueeze(0), skip_special_tokens=True
+        )[0]
 
         # Process timestamps if requested
         timestamps = None
-        if return_timestamps and hasattr(self.processor, "decode_with_timestamps"):
-            timestamps = self.processor.decode_with_timestamps(outputs[0].tolist())
+        segments = None
+        if return_timestamps:
+            if hasattr(self.processor, "decode_with_timestamps"):
+                timestamps = self.processor.decode_with_timestamps(sequence.tolist())
+
+            decoded = self.processor.tokenizer.decode(
+                sequence.tolist(), output_offsets=True
+            )
+            segments = [
+                {
+                    "text": offset["text"].strip(),
+                    "start": offset["timestamp"][0],
+                    "end": offset["timestamp"][1],
+                }
+                for offset in decoded.get("offsets", [])
+            ]
+
+        return {
+            "text": transcription,
+            "language": language,
+            "language_probability": language_probability,
+            "timestamps": timestamps,
+            "segments": segments,
+        }
+
+    async def atranscribe_audio_file(
+        self,
+        file_path: str,
+        language: Optional[str] = "vi",
+        return_timestamps: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously transcribe audio from a file.
+
+        The file is decoded on the decode executor and transcribed on the
+        inference executor, so neither step blocks the event loop.
+
+        Args:
+            file_path: Path to the audio file
+            language: Language code (default is Vietnamese)
+            return_timestamps: Whether to return word timestamps
+            timeout: Seconds to wait for decode and transcription together
+
+        Returns:
+            Dictionary containing transcription and metadata
+        """
+
+        async def _run() -> Dict[str, Any]:
+            is_long = await self.decode_executor.run(self.is_long_audio_file, file_path)
+            if is_long:
+                # Decoding overlaps with inference inside the streaming path
+                return await self.inference_executor.run(
+                    self.transcribe_audio_file_streaming, file_path, language
+                )
+
+            audio_array, sampling_rate = await self.decode_executor.run(
+                self.load_audio_file, file_path
+            )
+            return await self.atranscribe_audio(
+                audio_array, sampling_rate, language, return_timestamps
+            )
+
+        return await asyncio.wait_for(_run(), timeout)
+
+    async def atranscribe_pcm(
+        self,
+        pcm: PCMData,
+        sampling_rate: int,
+        language: Optional[str] = "vi",
+        return_timestamps: bool = False,
+        channels: int = 1,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously transcribe raw 16-bit PCM.
+
+        Args:
+            pcm: Little-endian int16 PCM as bytes, memoryview or int16 array
+            sampling_rate: Sampling rate of the audio
+            language: Language code (default is Vietnamese)
+            return_timestamps: Whether to return word timestamps
+            channels: Number of interleaved channels (downmixed to mono)
+            timeout: Seconds to wait before raising asyncio.TimeoutError
 
-        return {"text": transcription, "language": language, "timestamps": timestamps}
+        Returns:
+            Dictionary containing transcription and metadata
+        """
+        return await self.inference_executor.run(
+            self.transcribe_pcm,
+            pcm,
+            sampling_rate,
+            language,
+            return_timestamps,
+            channels,
+            timeout=timeout,
+        )
+
+    async def atranscribe_audio(
+        self,
+        audio_array: np.ndarray,
+        sampling_rate: int,
+        language: Optional[str] = "vi",
+        return_timestamps: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously transcribe audio from a numpy array.
+
+        Args:
+            audio_array: Numpy array of audio samples
+            sampling_rate: Sampling rate of the audio
+            language: Language code (default is Vietnamese)
+            return_timestamps: Whether to return word timestamps
+            timeout: Seconds to wait before raising asyncio.TimeoutError
+
+        Returns:
+            Dictionary containing transcription and metadata
+        """
+        return await self.inference_executor.run(
+            self.transcribe_audio,
+            audio_array,
+            sampling_rate,
+            language,
+            return_timestamps,
+            timeout=timeout,
+        )
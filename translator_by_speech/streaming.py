@@ -0,0 +1,469 @@
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+import soxr
+
+from translator_by_speech.features import LogMelCache
+from translator_by_speech.pcm import PCMConverter
+from translator_by_speech.segmentation import ends_sentence
+from translator_by_speech.speech_recognition import ASRModel
+from translator_by_speech.translator import TranslationModel
+
+
+class IncrementalTranslator:
+    """
+    Simultaneous speech translation over a live audio stream.
+
+    Audio is transcribed by a StreamingTranscriber as it arrives, so each pass
+    only covers the window since the last committed segment. Words on which
+    the last ``agreement`` hypotheses agree are treated as stable, and every
+    stable sentence is sent to the translator immediately, while the rest of
+    the utterance is still being spoken.
+    """
+
+    def __init__(
+        self,
+        asr_model: ASRModel,
+        translator_model: TranslationModel,
+        sampling_rate: int,
+        source_lang: str = "vi",
+        agreement: int = 2,
+        min_step_seconds: float = 0.5,
+        max_chunk_words: int = 25,
+        keep_seconds: float = 5.0,
+    ):
+        """
+        Initialize the incremental translator.
+
+        Args:
+            asr_model: ASR model used to transcribe the stream
+            translator_model: Translation model for committed chunks
+            sampling_rate: Sampling rate of the incoming audio
+            source_lang: Source language code for ASR
+            agreement: Number of successive hypotheses that must agree on a word
+            min_step_seconds: Minimum amount of new audio between ASR passes
+            max_chunk_words: Commit a stable clause without sentence punctuation
+                once it reaches this many words
+            keep_seconds: Audio at the end of the ASR window that is always
+                re-transcribed (see StreamingTranscriber)
+        """
+        if agreement < 1:
+            raise ValueError("agreement must be at least 1")
+
+        self.asr_model = asr_model
+        self.translator_model = translator_model
+        self.sampling_rate = sampling_rate
+        self.source_lang = source_lang
+        self.agreement = agreement
+        self.min_step_samples = int(min_step_seconds * sampling_rate)
+        self.max_chunk_words = max_chunk_words
+        self.transcriber = StreamingTranscriber(
+            asr_model, sampling_rate, language=source_lang, keep_seconds=keep_seconds
+        )
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the audio and all hypothesis state."""
+        self._chunks: List[np.ndarray] = []
+        self._pending_samples = 0
+        self._history: List[List[str]] = []
+        self._stable_words: List[str] = []
+        self._translated_upto = 0
+        self.transcriber.reset()
+
+    @property
+    def stable_text(self) -> str:
+        """Source text that has been agreed on so far."""
+        return " ".join(self._stable_words)
+
+    def feed(self, audio_chunk: np.ndarray) -> List[Dict[str, str]]:
+        """
+        Append audio and translate any sentences that became stable.
+
+        Args:
+            audio_chunk: Newly captured audio samples
+
+        Returns:
+            List of dictionaries with source and translated text for each
+            newly committed chunk (empty if nothing was committed)
+        """
+        self._chunks.append(np.asarray(audio_chunk))
+        self._pending_samples += len(audio_chunk)
+
+        if self._pending_samples < self.min_step_samples:
+            return []
+
+        self._update_hypothesis()
+        return self._commit(final=False)
+
+    def finish(self) -> List[Dict[str, str]]:
+        """
+        Flush the end of the utterance and reset for the next one.
+
+        Returns:
+            List of dictionaries for the remaining, not yet translated text
+        """
+        if self._pending_samples:
+            self._update_hypothesis()
+
+        # Everything transcribed is final now
+        final = self.transcriber.flush()["text"].split()
+        self._stable_words.extend(final[len(self._stable_words) :])
+
+        results = self._commit(final=True)
+        self.reset()
+        return results
+
+    def stream(self, audio_chunks: Iterable[np.ndarray]) -> Iterator[Dict[str, str]]:
+        """
+        Translate an iterable of audio chunks as a single utterance.
+
+        Args:
+            audio_chunks: Audio chunks in capture order
+
+        Yields:
+            Dictionaries for each committed chunk, as soon as it is stable
+        """
+        for audio_chunk in audio_chunks:
+            yield from self.feed(audio_chunk)
+        yield from self.finish()
+
+    def _update_hypothesis(self) -> None:
+        """Transcribe the new audio and extend the stable prefix."""
+        audio_array = np.concatenate(self._chunks)
+        self._chunks = []
+        self._pending_samples = 0
+
+        asr_result = self.transcriber.push(audio_array)
+        self._history.append(asr_result["text"].split())
+        self._history = self._history[-self.agreement :]
+
+        if len(self._history) < self.agreement:
+            return
+
+        # Stable words never change, so only compare what comes after them
+        start = len(self._stable_words)
+        for words in zip(*(hypothesis[start:] for hypothesis in self._history)):
+            if any(word != words[0] for word in words):
+                break
+            self._stable_words.append(words[0])
+
+    def _commit(self, final: bool) -> List[Dict[str, str]]:
+        """Translate stable words that form complete sentences."""
+        pending = self._stable_words[self._translated_upto :]
+
+        chunks: List[str] = []
+        start = 0
+        for i, word in enumerate(pending):
+            if ends_sentence(word) or i + 1 - start >= self.max_chunk_words:
+                chunks.append(" ".join(pending[start : i + 1]))
+                start = i + 1
+
+        if final and start < len(pending):
+            chunks.append(" ".join(pending[start:]))
+            start = len(pending)
+
+        self._translated_upto += start
+
+        if not chunks:
+            return []
+
+        translations = self.translator_model.translate(chunks)
+        return [
+            {"source_text": source_text, "translated_text": translated_text}
+            for source_text, translated_text in zip(chunks, translations)
+        ]
+
+
+class StreamingTranscriber:
+    """
+    Stateful transcriber for overlapping windows of a live audio stream.
+
+    Each update transcribes the audio since the last committed segment.
+    Segments that end more than ``keep_seconds`` before the end of the window
+    are committed and their audio is dropped, so the window only holds the
+    overlap plus new audio. Log-mel frames of the overlap are reused from a
+    LogMelCache, and decoding is conditioned on the committed text as a
+    Whisper prompt. When no new audio arrived, the previous result is returned
+    without running the model.
+    """
+
+    def __init__(
+        self,
+        asr_model: ASRModel,
+        sampling_rate: int,
+        language: str = "vi",
+        keep_seconds: float = 5.0,
+        prompt_words: int = 40,
+    ):
+        """
+        Initialize the streaming transcriber.
+
+        Args:
+            asr_model: ASR model used for transcription
+            sampling_rate: Sampling rate of the incoming audio
+            language: Language code for ASR; "auto" detects it on the first
+                window and keeps it for the rest of the stream
+            keep_seconds: Audio at the end of the window whose text is never
+                committed, because it may still change
+            prompt_words: Number of committed words passed as prompt
+        """
+        self.asr_model = asr_model
+        self.sampling_rate = sampling_rate
+        self.requested_language = language
+        self.prompt_words = prompt_words
+
+        feature_extractor = asr_model.processor.feature_extractor
+        self.model_rate = feature_extractor.sampling_rate
+        self.keep_samples = int(keep_seconds * self.model_rate)
+        self.feature_cache = LogMelCache(
+            feature_extractor.mel_filters, sampling_rate=self.model_rate
+        )
+
+        # Reusable float32 buffer for int16 PCM chunks
+        self.pcm_converter = PCMConverter()
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the audio window, the feature cache and the committed text."""
+        self.language = self.requested_language
+        self.language_probability = None
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._dirty = False
+        self._committed: List[str] = []
+        self._segments: List[Dict[str, Any]] = []
+        self._partial_segments: List[Dict[str, Any]] = []
+        self._last_result = self._make_result([], "")
+        self.feature_cache.reset()
+
+        # One stateful resampler per stream, so chunk boundaries do not cause
+        # artifacts
+        self._resampler = None
+        if self.sampling_rate != self.model_rate:
+            self._resampler = soxr.ResampleStream(
+                self.sampling_rate, self.model_rate, 1, dtype="float32"
+            )
+
+    @property
+    def committed_text(self) -> str:
+        """Text that will not change anymore."""
+        return " ".join(self._committed)
+
+    def push(self, audio_chunk: np.ndarray) -> Dict[str, Any]:
+        """
+        Add audio and re-transcribe the current window.
+
+        Args:
+            audio_chunk: Newly captured samples (float, or int16 PCM)
+
+        Returns:
+            Dictionary with the full text, the committed text, the text
+            committed by this update and the still changing partial text
+        """
+        forced = self._append(self._prepare(audio_chunk))
+
+        # The window has not changed: reuse the previous result
+        if not self._dirty:
+            return self._last_result
+
+        return self._transcribe(forced)
+
+    def transcribe_blocks(self, audio_blocks: Iterable[np.ndarray]) -> Dict[str, Any]:
+        """
+        Transcribe a finite stream, such as a long file, window by window.
+
+        Each window is filled up to 30 s before it is transcribed. Finished
+        segments are committed and the next window starts where they end, as
+        in Whisper's sequential long-form decoding, so only one window of
+        audio is held in memory at a time.
+
+        Args:
+            audio_blocks: Audio blocks in order (float, or int16 PCM)
+
+        Returns:
+            Final result dictionary, where all text is committed
+        """
+        n_samples = self.feature_cache.n_samples
+
+        for block in audio_blocks:
+            block = self._prepare(block)
+            while len(block):
+                # A full window that had no segment boundary is committed
+                # whole by _append
+                room = n_samples - len(self._buffer)
+                take = room if room > 0 else n_samples
+                forced = self._append(block[:take])
+                block = block[take:]
+
+                if len(self._buffer) == n_samples:
+                    self._transcribe(forced)
+
+        return self.flush()
+
+    def flush(self) -> Dict[str, Any]:
+        """
+        Commit all remaining text and reset for the next stream.
+
+        Returns:
+            Final result dictionary, where all text is committed and
+            "segments" lists the text, start and end (seconds from the start
+            of the stream) of every committed segment
+        """
+        # Audio still held back by the resampler
+        forced: List[str] = []
+        if self._resampler is not None:
+            forced = self._append(
+                self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            )
+
+        result = self._transcribe(forced) if self._dirty else self._last_result
+
+        newly_committed = [result["partial_text"]] if result["partial_text"] else []
+        self._committed.extend(newly_committed)
+        self._segments.extend(self._partial_segments)
+        final = self._make_result(newly_committed, "")
+        final["segments"] = self._segments
+
+        self.reset()
+        return final
+
+    def _append(self, new_audio: np.ndarray) -> List[str]:
+        """
+        Add audio to the window.
+
+        Returns:
+            Text committed because the window was full without a segment
+            boundary to cut at
+        """
+        if not len(new_audio):
+            return []
+
+        # The window is full: commit the previous hypothesis and restart the
+        # window at the new audio
+        forced: List[str] = []
+        n_samples = self.feature_cache.n_samples
+        if len(self._buffer) + len(new_audio) > n_samples:
+            if self._last_result["partial_text"]:
+                forced.append(self._last_result["partial_text"])
+                self._committed.append(self._last_result["partial_text"])
+                self._segments.extend(self._partial_segments)
+            self._partial_segments = []
+
+            # Skip the oldest new audio if it alone is too long, staying
+            # aligned to feature frames
+            skip = max(len(new_audio) - n_samples, 0)
+            skip += -(self._buffer_start + len(self._buffer) + skip) % (
+                self.feature_cache.hop_length
+            )
+            self._buffer_start += len(self._buffer) + skip
+            self._buffer = self._buffer[:0]
+            new_audio = new_audio[skip:]
+
+        self._buffer = np.concatenate([self._buffer, new_audio])
+        self._dirty = True
+        return forced
+
+    def _prepare(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """
+        Convert a chunk to float32 at the model's sampling rate.
+
+        int16 chunks are converted into the PCM converter's buffer, so the
+        result is only valid until the next call.
+        """
+        chunk = np.asarray(audio_chunk)
+        if np.issubdtype(chunk.dtype, np.integer):
+            chunk = self.pcm_converter.convert(chunk)
+        chunk = chunk.astype(np.float32, copy=False).reshape(-1)
+
+        if self._resampler is not None:
+            chunk = self._resampler.resample_chunk(chunk)
+        return chunk
+
+    def _prompt(self) -> str:
+        """Tail of the committed text used to condition the next window."""
+        return " ".join(self.committed_text.split()[-self.prompt_words :])
+
+    def _transcribe(self, newly_committed: List[str]) -> Dict[str, Any]:
+        """Transcribe the window and commit segments that are safely finished."""
+        self._dirty = False
+        features = self.feature_cache.window_features(self._buffer, self._buffer_start)
+        asr_result = self.asr_model.transcribe_features(
+            features,
+            language=self.language,
+            return_timestamps=True,
+            prompt=self._prompt() or None,
+            duration=len(self._buffer) / self.model_rate,
+        )
+
+        # Keep the language detected on the first window
+        if asr_result.get("language_probability") is not None:
+            self.language = asr_result["language"]
+            self.language_probability = asr_result["language_probability"]
+
+        segments = asr_result["segments"] or []
+        window_seconds = len(self._buffer) / self.model_rate
+        commit_before = window_seconds - self.keep_samples / self.model_rate
+
+        # The last segment may still grow, so it is never committed here
+        finished: List[str] = []
+        commit_until = 0.0
+        for segment in segments[:-1]:
+            if segment["end"] is None or segment["end"] > commit_before:
+                break
+            finished.append(segment["text"])
+            commit_until = segment["end"]
+
+        if segments:
+            partial_text = " ".join(s["text"] for s in segments[len(finished) :])
+        else:
+            partial_text = asr_result["text"].strip()
+
+        # Segment times relative to the start of the stream; a segment that
+        # has not ended yet runs to the end of the window
+        offset = self._buffer_start / self.model_rate
+        timed = [
+            {
+                "text": segment["text"],
+                "start": offset + (segment["start"] or 0.0),
+                "end": offset + (segment["end"] or window_seconds),
+            }
+            for segment in segments
+        ]
+        if not segments and partial_text:
+            timed = [
+                {"text": partial_text, "start": offset, "end": offset + window_seconds}
+            ]
+        self._partial_segments = [t for t in timed[len(finished) :] if t["text"]]
+
+        if finished:
+            self._segments.extend(t for t in timed[: len(finished)] if t["text"])
+            self._committed.extend(t for t in finished if t)
+            newly_committed = newly_committed + finished
+            self._advance(int(commit_until * self.model_rate))
+
+        self._last_result = self._make_result(newly_committed, partial_text)
+        return self._last_result
+
+    def _advance(self, num_samples: int) -> None:
+        """Drop committed audio from the front of the window."""
+        # Keep the window aligned to feature frames so cached frames stay valid
+        num_samples -= num_samples % self.feature_cache.hop_length
+        self._buffer = self._buffer[num_samples:]
+        self._buffer_start += num_samples
+
+    def _make_result(
+        self, newly_committed: List[str], partial_text: str
+    ) -> Dict[str, Any]:
+        """Build the result dictionary returned by push and flush."""
+        committed_text = self.committed_text
+        return {
+            "text": " ".join(t for t in (committed_text, partial_text) if t),
+            "committed_text": committed_text,
+            "new_text": " ".join(t for t in newly_committed if t),
+            "partial_text": partial_text,
+            "language": self.language,
+            "language_probability": self.language_probability,
+        }
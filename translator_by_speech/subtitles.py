@@ -0,0 +1,113 @@
+import os
+from typing import Any, Dict, List, Optional
+
+# Subtitle formats that can be written
+SUBTITLE_FORMATS = ("srt", "vtt")
+
+
+def format_timestamp(seconds: float, decimal_marker: str = ",") -> str:
+    """
+    Format seconds as a subtitle timestamp.
+
+    Args:
+        seconds: Time from the start of the audio
+        decimal_marker: "," for SRT, "." for WebVTT
+
+    Returns:
+        Timestamp as HH:MM:SS,mmm
+    """
+    milliseconds = max(round(seconds * 1000), 0)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def _cue_text(segment: Dict[str, Any]) -> str:
+    """Source line followed by the translation, if there is one."""
+    lines = [segment["source_text"].strip()]
+    if segment.get("translated_text"):
+        lines.append(segment["translated_text"].strip())
+    return "\n".join(line for line in lines if line)
+
+
+def to_srt(segments: List[Dict[str, Any]]) -> str:
+    """
+    Render segments as SubRip subtitles.
+
+    Args:
+        segments: Dictionaries with "start", "end", "source_text" and
+            optionally "translated_text", shown as a second line
+
+    Returns:
+        SRT document
+    """
+    cues = []
+    for segment in segments:
+        text = _cue_text(segment)
+        if not text:
+            continue
+        cues.append(
+            f"{len(cues) + 1}\n"
+            f"{format_timestamp(segment['start'])} --> "
+            f"{format_timestamp(segment['end'])}\n"
+            f"{text}\n"
+        )
+    return "\n".join(cues)
+
+
+def to_vtt(segments: List[Dict[str, Any]]) -> str:
+    """
+    Render segments as WebVTT subtitles.
+
+    Args:
+        segments: Dictionaries with "start", "end", "source_text" and
+            optionally "translated_text", shown as a second line
+
+    Returns:
+        WebVTT document
+    """
+    cues = ["WEBVTT\n"]
+    for segment in segments:
+        text = _cue_text(segment)
+        if not text:
+            continue
+        cues.append(
+            f"{format_timestamp(segment['start'], '.')} --> "
+            f"{format_timestamp(segment['end'], '.')}\n"
+            f"{text}\n"
+        )
+    return "\n".join(cues)
+
+
+def render_subtitles(
+    segments: List[Dict[str, Any]], subtitle_format: str = "srt"
+) -> str:
+    """
+    Render segments in the given subtitle format.
+
+    Args:
+        segments: Timed segments with source and translated text
+        subtitle_format: "srt" or "vtt"
+
+    Returns:
+        Subtitle document
+    """
+    if subtitle_format == "srt":
+        return to_srt(segments)
+    elif subtitle_format == "vtt":
+        return to_vtt(segments)
+
+    raise ValueError(
+        f"Unknown subtitle format '{subtitle_format}', "
+        f"expected one of: {', '.join(SUBTITLE_FORMATS)}"
+    )
+
+
+def subtitle_path(
+    file_path: str, subtitle_format: str, directory: Optional[str] = None
+) -> str:
+    """Path of the subtitle file for an audio file, e.g. talk.wav -> talk.srt."""
+    basename = os.path.splitext(os.path.basename(file_path))[0]
+    directory = directory if directory is not None else os.path.dirname(file_path)
+    return os.path.join(directory, f"{basename}.{subtitle_format}")
@@ -1,7 +1,16 @@
+import functools
+import time
+
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from typing import List, Optional, Union
 
+from translator_by_speech.assisted import AssistedDecoding
+from translator_by_speech.decoding import DecodingPolicy
+from translator_by_speech.executors import AsyncExecutor
+from translator_by_speech.runtime import RuntimeConfig
+from translator_by_speech.glossary import Glossary
+
 
 class TranslationModel:
     """A class to handle translation models between English and Vietnamese."""
@@ -12,6 +21,13 @@ class TranslationModel:
         src_lang: str,
         tgt_lang: str,
         device: Optional[torch.device] = None,
+        max_concurrency: int = 1,
+        decoding_profile: str = "balanced",
+        latency_budget: Optional[float] = None,
+        glossary: Optional[Union[str, Glossary]] = None,
+        runtime: Optional[RuntimeConfig] = None,
+        draft_model: Optional[str] = None,
+        assisted_compare_every: int = 0,
     ):
         """
         Initialize the translation model.
@@ -21,10 +37,23 @@ class TranslationModel:
             src_lang: Source language code
             tgt_lang: Target language code
             device: The device to run the model on (defaults to CUDA if available)
+            max_concurrency: Maximum number of concurrent async translate calls
+            decoding_profile: Decoding profile ("fast", "balanced" or "quality")
+            latency_budget: Default seconds a translate call may take
+            glossary: Glossary or path to a glossary TSV with approved translations
+            runtime: Threading and execution settings (torch defaults if None)
+            draft_model: Name of a smaller model with the same tokenizer that
+                proposes tokens for assisted decoding of greedy single-text calls
+            assisted_compare_every: Also decode every n-th assisted call
+                without the draft to measure the speedup (0 to disable)
         """
         self.model_name = model_name
         self.src_lang = src_lang
         self.tgt_lang = tgt_lang
+
+        # Thread counts must be set before the model runs
+        self.runtime = runtime or RuntimeConfig()
+        self.runtime.apply_threads()
         self.device = device or (
             torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
         )
@@ -33,20 +62,58 @@ class TranslationModel:
         self.tokenizer = AutoTokenizer.from_pretrained(model_name, src_lang=src_lang)
         self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
         self.model.to(self.device)
+        self.runtime.prepare_model(self.model)
+
+        # Optional draft model for assisted decoding
+        self.assisted = None
+        if draft_model:
+            draft = AutoModelForSeq2SeqLM.from_pretrained(draft_model)
+            draft.to(self.device)
+            self.assisted = AssistedDecoding(
+                draft, compare_every=assisted_compare_every
+            )
+
+        # Beam width and token budget are chosen per request
+        self.decoding = DecodingPolicy(decoding_profile)
+        self.latency_budget = latency_budget
+
+        # Approved translations applied before and after the model
+        if isinstance(glossary, str):
+            glossary = Glossary.from_tsv(glossary)
+        self.glossary = glossary
+        self.glossary_stats = {
+            "texts": 0,
+            "exact_matches": 0,
+            "protected_terms": 0,
+            "fallbacks": 0,
+            "model_calls_saved": 0,
+        }
+
+        # Executor used by the async API
+        self.inference_executor = AsyncExecutor(
+            max_workers=max_concurrency, thread_name_prefix="translation"
+        )
 
     def translate(
         self,
         text: Union[str, List[str]],
-        num_beams: int = 5,
+        num_beams: Optional[int] = None,
         early_stopping: bool = True,
+        latency_budget: Optional[float] = None,
     ) -> Union[str, List[str]]:
         """
         Translate text from source to target language.
 
+        Sentences and terms in the glossary get their approved translations;
+        sentences fully covered by it need no model call.
+
         Args:
             text: Input text or list of texts to translate
-            num_beams: Number of beams for beam search
+            num_beams: Number of beams for beam search (chosen from the input
+                length and decoding profile if None; short inputs are greedy)
             early_stopping: Whether to stop beam search when first complete candidate is found
+            latency_budget: Seconds the call may take, used to narrow the beam
+                (defaults to the model's latency_budget)
 
         Returns:
             Translated text or list of translated texts
@@ -54,38 +121,166 @@ class TranslationModel:
         is_single_text = isinstance(text, str)
         texts = [text] if is_single_text else text
 
+        if self.glossary is None:
+            translated_texts = self._generate(
+                texts, num_beams, early_stopping, latency_budget
+            )
+        else:
+            translated_texts = self._translate_with_glossary(
+                texts, num_beams, early_stopping, latency_budget
+            )
+
+        return translated_texts[0] if is_single_text else translated_texts
+
+    def _translate_with_glossary(
+        self,
+        texts: List[str],
+        num_beams: Optional[int],
+        early_stopping: bool,
+        latency_budget: Optional[float],
+    ) -> List[str]:
+        """Answer glossary sentences directly and protect glossary terms in the rest."""
+        stats = self.glossary_stats
+        stats["texts"] += len(texts)
+
+        translated_texts: List[Optional[str]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            match = self.glossary.lookup(text)
+            if match is not None:
+                translated_texts[i] = match
+                stats["exact_matches"] += 1
+                continue
+
+            protected_text, targets = self.glossary.protect(text)
+            stats["protected_terms"] += len(targets)
+            pending.append((i, protected_text, targets))
+
+        if not pending:
+            # Only a call whose texts all came from the glossary saved one
+            if texts:
+                stats["model_calls_saved"] += 1
+            return translated_texts
+
+        outputs = self._generate(
+            [protected_text for _, protected_text, _ in pending],
+            num_beams,
+            early_stopping,
+            latency_budget,
+        )
+
+        # Translate texts whose placeholders the model mangled without protection
+        fallbacks = []
+        for (i, _, targets), output in zip(pending, outputs):
+            translated_texts[i] = self.glossary.restore(output, targets)
+            if translated_texts[i] is None:
+                fallbacks.append(i)
+
+        if fallbacks:
+            stats["fallbacks"] += len(fallbacks)
+            outputs = self._generate(
+                [texts[i] for i in fallbacks], num_beams, early_stopping, latency_budget
+            )
+            for i, output in zip(fallbacks, outputs):
+                translated_texts[i] = output
+
+        return translated_texts
+
+    def _generate(
+        self,
+        texts: List[str],
+        num_beams: Optional[int],
+        early_stopping: bool,
+        latency_budget: Optional[float],
+    ) -> List[str]:
+        """Translate a batch of texts with the model."""
         # Tokenize input text
         inputs = self.tokenizer(texts, padding=True, return_tensors="pt").to(
             self.device
         )
 
-        # Generate translation
-        outputs = self.model.generate(
-            **inputs,
-            decoder_start_token_id=self.tokenizer.lang_code_to_id[self.tgt_lang],
-            num_return_sequences=1,
+        # Pick the beam width and token budget from the input length
+        if latency_budget is None:
+            latency_budget = self.latency_budget
+        settings = self.decoding.translation_settings(
+            inputs["input_ids"].shape[1],
+            batch_size=len(texts),
             num_beams=num_beams,
-            early_stopping=early_stopping,
+            latency_budget=latency_budget,
         )
+        if settings["num_beams"] > 1:
+            settings["early_stopping"] = early_stopping
 
-        # Decode output tokens
-        translated_texts = self.tokenizer.batch_decode(
-            outputs, skip_special_tokens=True
+        # Assisted decoding only matches greedy output and takes one text at a time
+        generate = self.model.generate
+        if self.assisted is not None and settings["num_beams"] == 1 and len(texts) == 1:
+            generate = functools.partial(self.assisted.generate, self.model)
+
+        # Generate translation
+        start = time.perf_counter()
+        with self.runtime.inference_context(self.device):
+            outputs = generate(
+                **inputs,
+                decoder_start_token_id=self.tokenizer.lang_code_to_id[self.tgt_lang],
+                num_return_sequences=1,
+                **settings,
+            )
+        self.decoding.record(
+            outputs.shape[1],
+            settings["num_beams"] * len(texts),
+            time.perf_counter() - start,
         )
 
-        return translated_texts[0] if is_single_text else translated_texts
+        # Decode output tokens
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    async def atranslate(
+        self,
+        text: Union[str, List[str]],
+        num_beams: Optional[int] = None,
+        early_stopping: bool = True,
+        timeout: Optional[float] = None,
+        latency_budget: Optional[float] = None,
+    ) -> Union[str, List[str]]:
+        """
+        Asynchronously translate text on the model's inference executor.
+
+        Args:
+            text: Input text or list of texts to translate
+            num_beams: Number of beams for beam search (chosen if None)
+            early_stopping: Whether to stop beam search when first complete candidate is found
+            timeout: Seconds to wait before raising asyncio.TimeoutError
+            latency_budget: Seconds the generate call may take, used to narrow the beam
+
+        Returns:
+            Translated text or list of translated texts
+        """
+        return await self.inference_executor.run(
+            self.translate,
+            text,
+            num_beams=num_beams,
+            early_stopping=early_stopping,
+            latency_budget=latency_budget,
+            timeout=timeout,
+        )
 
 
 # Factory functions for convenience
-def create_en2vi_translator() -> TranslationModel:
+def create_en2vi_translator(**kwargs) -> TranslationModel:
     """Create an English to Vietnamese translator."""
     return TranslationModel(
-        model_name="vinai/vinai-translate-en2vi-v2", src_lang="en_XX", tgt_lang="vi_VN"
+        model_name="vinai/vinai-translate-en2vi-v2",
+        src_lang="en_XX",
+        tgt_lang="vi_VN",
+        **kwargs,
     )
 
 
-def create_vi2en_translator() -> TranslationModel:
+def create_vi2en_translator(**kwargs) -> TranslationModel:
     """Create a Vietnamese to English translator."""
     return TranslationModel(
-        model_name="vinai/vinai-translate-vi2en-v2", src_lang="vi_VN", tgt_lang="en_XX"
+        model_name="vinai/vinai-translate-vi2en-v2",
+        src_lang="vi_VN",
+        tgt_lang="en_XX",
+        **kwargs,
     )